@@ -7,7 +7,11 @@ using System.Linq;
 using System.Runtime.ConstrainedExecution;
 using System.Text;
 using System.Threading.Tasks;
+using UAssetAPI.ExportTypes;
+using UAssetAPI.FieldTypes;
+using UAssetAPI.Kismet;
 using UAssetAPI.UnrealTypes;
+using UAssetAPI.Unversioned;
 
 namespace UAssetAPI.Benchmark
 {
@@ -25,6 +29,186 @@ namespace UAssetAPI.Benchmark
         }
 
 
+        private static double Percentile(double[] sortedValues, double percentile)
+        {
+            // Nearest-rank method
+            int rank = (int)Math.Ceiling(percentile / 100 * sortedValues.Length);
+            return sortedValues[Math.Max(rank, 1) - 1];
+        }
+
+        private static long GetAssetSize(string path)
+        {
+            long size = new FileInfo(path).Length;
+            string uexpPath = Path.ChangeExtension(path, "uexp");
+            if (File.Exists(uexpPath)) size += new FileInfo(uexpPath).Length;
+            return size;
+        }
+
+        private static void BenchmarkCorpusParallel(string[] assetPaths, EngineVersion ver, int parallelism, int numSlowest, string outputPath)
+        {
+            var latencies = new double[assetPaths.Length];
+            var errors = new string[assetPaths.Length];
+            long totalBytes = assetPaths.Sum(GetAssetSize);
+
+            int[] gcCountsBefore = { GC.CollectionCount(0), GC.CollectionCount(1), GC.CollectionCount(2) };
+            long allocatedBefore = GC.GetTotalAllocatedBytes(true);
+
+            var timer = Stopwatch.StartNew();
+            Parallel.For(0, assetPaths.Length, new ParallelOptions { MaxDegreeOfParallelism = parallelism }, i =>
+            {
+                var fileTimer = Stopwatch.StartNew();
+                try
+                {
+                    new UAsset(assetPaths[i], ver);
+                }
+                catch (Exception ex)
+                {
+                    errors[i] = ex.GetType().Name + ": " + ex.Message;
+                }
+                fileTimer.Stop();
+                latencies[i] = fileTimer.Elapsed.TotalMilliseconds;
+            });
+            timer.Stop();
+
+            long allocatedBytes = GC.GetTotalAllocatedBytes(true) - allocatedBefore;
+            int[] gcCounts = { GC.CollectionCount(0) - gcCountsBefore[0], GC.CollectionCount(1) - gcCountsBefore[1], GC.CollectionCount(2) - gcCountsBefore[2] };
+
+            double wallSeconds = timer.Elapsed.TotalSeconds;
+            double[] sortedLatencies = latencies.OrderBy(x => x).ToArray();
+            var slowest = Enumerable.Range(0, assetPaths.Length)
+                .OrderByDescending(i => latencies[i])
+                .Take(numSlowest)
+                .Select(i => new { path = assetPaths[i], bytes = GetAssetSize(assetPaths[i]), ms = latencies[i] })
+                .ToArray();
+            var failures = Enumerable.Range(0, assetPaths.Length)
+                .Where(i => errors[i] != null)
+                .Select(i => new { path = assetPaths[i], error = errors[i] })
+                .ToArray();
+
+            Console.WriteLine(assetPaths.Length + " assets (" + (totalBytes / 1048576.0).ToString("0.00") + " MB) parsed in " + timer.Elapsed.TotalMilliseconds + " ms with parallelism " + parallelism);
+            Console.WriteLine((assetPaths.Length / wallSeconds).ToString("0.00") + " assets/sec, " + (totalBytes / 1048576.0 / wallSeconds).ToString("0.00") + " MB/sec");
+            if (sortedLatencies.Length > 0)
+            {
+                Console.WriteLine("Per-asset latency (ms): p50 " + Percentile(sortedLatencies, 50).ToString("0.00") + ", p90 " + Percentile(sortedLatencies, 90).ToString("0.00") + ", p95 " + Percentile(sortedLatencies, 95).ToString("0.00") + ", p99 " + Percentile(sortedLatencies, 99).ToString("0.00") + ", max " + sortedLatencies[sortedLatencies.Length - 1].ToString("0.00"));
+            }
+            Console.WriteLine("GC collections: gen0 " + gcCounts[0] + ", gen1 " + gcCounts[1] + ", gen2 " + gcCounts[2] + "; " + (allocatedBytes / 1048576.0).ToString("0.00") + " MB allocated");
+            Console.WriteLine("\nSlowest " + slowest.Length + " assets:");
+            foreach (var entry in slowest) Console.WriteLine("  " + entry.ms.ToString("0.00") + " ms: " + entry.path);
+            if (failures.Length > 0)
+            {
+                Console.WriteLine("\n" + failures.Length + " assets failed to parse:");
+                foreach (var failure in failures) Console.WriteLine("  " + failure.path + ": " + failure.error);
+            }
+
+            var results = new
+            {
+                engineVersion = ver.ToString(),
+                parallelism,
+                assets = assetPaths.Length,
+                failed = failures.Length,
+                totalBytes,
+                wallMs = timer.Elapsed.TotalMilliseconds,
+                assetsPerSecond = assetPaths.Length / wallSeconds,
+                megabytesPerSecond = totalBytes / 1048576.0 / wallSeconds,
+                latencyMs = sortedLatencies.Length == 0 ? null : new
+                {
+                    min = sortedLatencies[0],
+                    p50 = Percentile(sortedLatencies, 50),
+                    p90 = Percentile(sortedLatencies, 90),
+                    p95 = Percentile(sortedLatencies, 95),
+                    p99 = Percentile(sortedLatencies, 99),
+                    max = sortedLatencies[sortedLatencies.Length - 1],
+                    mean = sortedLatencies.Average()
+                },
+                gc = new
+                {
+                    gen0 = gcCounts[0],
+                    gen1 = gcCounts[1],
+                    gen2 = gcCounts[2],
+                    allocatedBytes
+                },
+                slowest,
+                failures
+            };
+            File.WriteAllText(outputPath, JsonConvert.SerializeObject(results, Formatting.Indented));
+            Console.WriteLine("\nResults written to " + outputPath);
+        }
+
+        private static void VerifyCorpusParallel(string[] assetPaths, EngineVersion ver, int parallelism, string outputPath)
+        {
+            var results = new BinaryEqualityResult[assetPaths.Length];
+            var errors = new string[assetPaths.Length];
+            long totalBytes = assetPaths.Sum(GetAssetSize);
+
+            var timer = Stopwatch.StartNew();
+            Parallel.For(0, assetPaths.Length, new ParallelOptions { MaxDegreeOfParallelism = parallelism }, i =>
+            {
+                try
+                {
+                    results[i] = new UAsset(assetPaths[i], ver).VerifyBinaryEqualityDetailed();
+                }
+                catch (Exception ex)
+                {
+                    errors[i] = ex.GetType().Name + ": " + ex.Message;
+                }
+            });
+            timer.Stop();
+
+            double wallSeconds = timer.Elapsed.TotalSeconds;
+            var mismatches = Enumerable.Range(0, assetPaths.Length)
+                .Where(i => results[i] != null && !results[i].Equal)
+                .Select(i => new
+                {
+                    path = assetPaths[i],
+                    offset = results[i].MismatchOffset,
+                    export = results[i].MismatchExport >= 0 ? (int?)(results[i].MismatchExport + 1) : null,
+                    exportName = results[i].MismatchExportName,
+                    exportOffset = results[i].MismatchExport >= 0 ? (long?)results[i].MismatchExportOffset : null,
+                    section = results[i].MismatchSection,
+                    originalBytes = results[i].OriginalLength,
+                    serializedBytes = results[i].SerializedLength,
+                    description = results[i].ToString()
+                })
+                .ToArray();
+            var failures = Enumerable.Range(0, assetPaths.Length)
+                .Where(i => errors[i] != null)
+                .Select(i => new { path = assetPaths[i], error = errors[i] })
+                .ToArray();
+            int numEqual = assetPaths.Length - mismatches.Length - failures.Length;
+
+            Console.WriteLine(assetPaths.Length + " assets (" + (totalBytes / 1048576.0).ToString("0.00") + " MB) verified in " + timer.Elapsed.TotalMilliseconds + " ms with parallelism " + parallelism);
+            Console.WriteLine((assetPaths.Length / wallSeconds).ToString("0.00") + " assets/sec, " + (totalBytes / 1048576.0 / wallSeconds).ToString("0.00") + " MB/sec");
+            Console.WriteLine(numEqual + " maintained binary equality, " + mismatches.Length + " did not, " + failures.Length + " failed to parse");
+            if (mismatches.Length > 0)
+            {
+                Console.WriteLine("\n" + mismatches.Length + " assets failed to maintain binary equality:");
+                foreach (var mismatch in mismatches) Console.WriteLine("  " + mismatch.path + ": " + mismatch.description);
+            }
+            if (failures.Length > 0)
+            {
+                Console.WriteLine("\n" + failures.Length + " assets failed to parse:");
+                foreach (var failure in failures) Console.WriteLine("  " + failure.path + ": " + failure.error);
+            }
+
+            var summary = new
+            {
+                engineVersion = ver.ToString(),
+                parallelism,
+                assets = assetPaths.Length,
+                equal = numEqual,
+                mismatched = mismatches.Length,
+                failed = failures.Length,
+                totalBytes,
+                wallMs = timer.Elapsed.TotalMilliseconds,
+                assetsPerSecond = assetPaths.Length / wallSeconds,
+                megabytesPerSecond = totalBytes / 1048576.0 / wallSeconds,
+                mismatches,
+                failures
+            };
+            File.WriteAllText(outputPath, JsonConvert.SerializeObject(summary, Formatting.Indented));
+            Console.WriteLine("\nResults written to " + outputPath);
+        }
+
         private static HashSet<string> allowedExtensions = new HashSet<string>()
         {
             ".umap",
@@ -76,6 +260,27 @@ namespace UAssetAPI.Benchmark
                     timer.Stop();
                     Console.WriteLine(num + " assets parsed in " + timer.Elapsed.TotalMilliseconds + " ms");
                     break;
+                case "testparallel":
+                    // testparallel <directory> <engine version> [parallelism] [number of slowest assets to list] [JSON output path]
+                    string[] allParallelAssets = Directory.GetFiles(args[1], "*.*", SearchOption.AllDirectories)
+                        .Where(assetPath => allowedExtensions.Contains(Path.GetExtension(assetPath)))
+                        .ToArray();
+                    EngineVersion parallelVer = (EngineVersion)Enum.Parse(typeof(EngineVersion), args[2]);
+                    int parallelism = args.Length > 3 ? int.Parse(args[3]) : Environment.ProcessorCount;
+                    int numSlowest = args.Length > 4 ? int.Parse(args[4]) : 10;
+                    string parallelOutputPath = args.Length > 5 ? args[5] : "testparallel.json";
+                    BenchmarkCorpusParallel(allParallelAssets, parallelVer, parallelism, numSlowest, parallelOutputPath);
+                    break;
+                case "verifyparallel":
+                    // verifyparallel <directory> <engine version> [parallelism] [JSON output path]
+                    string[] allVerifyAssets = Directory.GetFiles(args[1], "*.*", SearchOption.AllDirectories)
+                        .Where(assetPath => allowedExtensions.Contains(Path.GetExtension(assetPath)))
+                        .ToArray();
+                    EngineVersion verifyVer = (EngineVersion)Enum.Parse(typeof(EngineVersion), args[2]);
+                    int verifyParallelism = args.Length > 3 ? int.Parse(args[3]) : Environment.ProcessorCount;
+                    string verifyOutputPath = args.Length > 4 ? args[4] : "verifyparallel.json";
+                    VerifyCorpusParallel(allVerifyAssets, verifyVer, verifyParallelism, verifyOutputPath);
+                    break;
                 case "testcpu":
                     int numCpuTrials = 5;
                     double trialSum = 0;
@@ -96,6 +301,104 @@ namespace UAssetAPI.Benchmark
                     }
                     Console.WriteLine("\n" + numCpuTrials + " CPU trials completed in " + trialSum + " ms (" + (trialSum / numCpuTrials) + " ms/trial)");
                     break;
+                case "findproperty":
+                    string propertyAssetPath = args.Length > 2 ? args[1] : Path.Combine("TestAssets", "WPN_LockOnRifle.uasset");
+                    EngineVersion propertyAssetVer = args.Length > 2 ? (EngineVersion)Enum.Parse(typeof(EngineVersion), args[2]) : EngineVersion.VER_UE4_25;
+                    UAsset propertyAsset = new UAsset(propertyAssetPath, propertyAssetVer);
+                    KismetSerializerContext context = new KismetSerializerContext(propertyAsset);
+
+                    // Look up every property of every struct, as the property pointers in bytecode would
+                    var lookups = new List<Tuple<int, FName>>();
+                    for (int i = 0; i < propertyAsset.Exports.Count; i++)
+                    {
+                        if (!(propertyAsset.Exports[i] is StructExport structExport) || structExport.LoadedProperties == null) continue;
+                        foreach (FProperty prop in structExport.LoadedProperties) lookups.Add(Tuple.Create(i + 1, prop.Name));
+                    }
+
+                    // The old linear scan, for comparison
+                    Func<int> linearPass = () =>
+                    {
+                        int found = 0;
+                        foreach (var lookup in lookups)
+                        {
+                            foreach (FProperty prop in ((StructExport)propertyAsset.Exports[lookup.Item1 - 1]).LoadedProperties)
+                            {
+                                if (prop.Name == lookup.Item2)
+                                {
+                                    found++;
+                                    break;
+                                }
+                            }
+                        }
+                        return found;
+                    };
+                    Func<int> indexedPass = () =>
+                    {
+                        int found = 0;
+                        foreach (var lookup in lookups)
+                        {
+                            if (context.FindProperty(lookup.Item1, lookup.Item2, out _)) found++;
+                        }
+                        return found;
+                    };
+
+                    // One untimed pass of each first, so that neither pays for JIT or for building the index
+                    linearPass();
+                    indexedPass();
+
+                    int numPropertyTrials = 1000;
+                    int numLinearFound = 0;
+                    timer.Restart();
+                    for (int trial = 0; trial < numPropertyTrials; trial++) numLinearFound += linearPass();
+                    timer.Stop();
+                    double linearTime = timer.Elapsed.TotalMilliseconds;
+
+                    int numIndexedFound = 0;
+                    timer.Restart();
+                    for (int trial = 0; trial < numPropertyTrials; trial++) numIndexedFound += indexedPass();
+                    timer.Stop();
+                    double indexedTime = timer.Elapsed.TotalMilliseconds;
+
+                    Console.WriteLine(lookups.Count + " properties looked up " + numPropertyTrials + " times each");
+                    Console.WriteLine("Linear scan: " + numLinearFound + " found in " + linearTime + " ms");
+                    Console.WriteLine("Indexed lookup: " + numIndexedFound + " found in " + indexedTime + " ms (" + (linearTime / indexedTime).ToString("0.0") + "x speedup)");
+                    break;
+                case "usmapsnapshot":
+                    // usmapsnapshot <.usmap path> [snapshot path] [number of schemas to look up]
+                    string usmapPath = args[1];
+                    string snapshotPath = args.Length > 2 ? args[2] : usmapPath + ".usnp";
+                    int numSchemaLookups = args.Length > 3 ? int.Parse(args[3]) : 50;
+
+                    timer.Restart();
+                    UsmapSnapshot.Create(usmapPath, snapshotPath);
+                    timer.Stop();
+                    Console.WriteLine("Snapshot written to " + snapshotPath + " in " + timer.Elapsed.TotalMilliseconds + " ms (" + new FileInfo(usmapPath).Length + " bytes -> " + new FileInfo(snapshotPath).Length + " bytes)");
+
+                    timer.Restart();
+                    Usmap fullUsmap = new Usmap(usmapPath);
+                    timer.Stop();
+                    double fullReadTime = timer.Elapsed.TotalMilliseconds;
+
+                    // Spread the lookups out over the whole file
+                    string[] allSchemaNames = fullUsmap.Schemas.Keys.ToArray();
+                    string[] schemaNames = Enumerable.Range(0, Math.Min(numSchemaLookups, allSchemaNames.Length))
+                        .Select(i => allSchemaNames[(int)((long)i * allSchemaNames.Length / Math.Min(numSchemaLookups, allSchemaNames.Length))])
+                        .ToArray();
+
+                    timer.Restart();
+                    Usmap snapshotUsmap = new Usmap(snapshotPath);
+                    int numSchemasFound = 0;
+                    foreach (string schemaName in schemaNames)
+                    {
+                        if (snapshotUsmap.TryGetSchema(schemaName, out _)) numSchemasFound++;
+                    }
+                    timer.Stop();
+                    double snapshotTime = timer.Elapsed.TotalMilliseconds;
+                    snapshotUsmap.Snapshot.Dispose();
+
+                    Console.WriteLine("Full .usmap read (" + allSchemaNames.Length + " schemas): " + fullReadTime + " ms");
+                    Console.WriteLine("Snapshot opened and " + numSchemasFound + " schemas looked up: " + snapshotTime + " ms (" + (fullReadTime / snapshotTime).ToString("0.0") + "x speedup)");
+                    break;
                 case "test":
                     BenchmarkAsset(args[1], (EngineVersion)Enum.Parse(typeof(EngineVersion), args[2]));
                     break;
@@ -106,6 +409,11 @@ namespace UAssetAPI.Benchmark
                     timer.Stop();
                     Console.WriteLine("Custom version first retrieved in " + timer.Elapsed.TotalMilliseconds + " ms");
 
+                    timer.Restart();
+                    UAsset.GuessCustomVersionFromIntroducedAttributes(EngineVersion.VER_UE4_AUTOMATIC_VERSION, typeof(FReleaseObjectVersion));
+                    timer.Stop();
+                    Console.WriteLine("Custom version first retrieved by reflection in " + timer.Elapsed.TotalMilliseconds + " ms");
+
                     int numCustomVersionTrials = 20000;
                     EngineVersion testingEngineVersion = EngineVersion.VER_UE4_16;
                     timer.Restart();
@@ -4,11 +4,15 @@ using System.Collections.Generic;
 using System.Diagnostics;
 using System.IO;
 using System.Linq;
+using System.Threading.Tasks;
 using UAssetAPI.PropertyTypes.Objects;
 using UAssetAPI.PropertyTypes.Structs;
 using UAssetAPI.UnrealTypes;
 using UAssetAPI.Unversioned;
 using UAssetAPI.ExportTypes;
+using UAssetAPI.Kismet;
+using UAssetAPI.Kismet.Bytecode;
+using UAssetAPI.Kismet.Bytecode.Expressions;
 
 namespace UAssetAPI.Tests
 {
@@ -311,6 +315,70 @@ namespace UAssetAPI.Tests
             Assert.IsTrue(test.ToByteArray().SequenceEqual(UAPUtils.ConvertHexStringToByteArray("05 3D 87 CF 7A 59 77 49 9F 7F 20 F1 09 ED B1 90")));
         }
 
+        /// <summary>
+        /// Makes sure that the precomputed custom version table agrees with reflecting over the custom version enums, for every engine version. If this fails, the table is out of date and needs to be regenerated with scripts/generate-tables.py.
+        /// </summary>
+        [TestMethod]
+        public void TestCustomVersionTable()
+        {
+            foreach (EngineVersion version in Enum.GetValues(typeof(EngineVersion)))
+            {
+                var expected = new List<CustomVersion>();
+                foreach (KeyValuePair<Guid, string> entry in CustomVersion.GuidToCustomVersionStringMap)
+                {
+                    Type customVersionType = typeof(UAsset).Assembly.GetType("UAssetAPI." + entry.Value);
+                    if (customVersionType == null) continue;
+
+                    int guessed = UAsset.GuessCustomVersionFromIntroducedAttributes(version, customVersionType);
+                    Assert.AreEqual(guessed, UAsset.GuessCustomVersionFromTypeAndEngineVersion(version, customVersionType), entry.Value + " at " + version);
+                    if (guessed >= 0) expected.Add(new CustomVersion(entry.Key, guessed));
+                }
+
+                List<CustomVersion> actual = UAsset.GetDefaultCustomVersionContainer(version);
+                Assert.AreEqual(expected.Count, actual.Count, version.ToString());
+                for (int i = 0; i < expected.Count; i++)
+                {
+                    Assert.AreEqual(expected[i].Key, actual[i].Key);
+                    Assert.AreEqual(expected[i].Version, actual[i].Version, expected[i].FriendlyName + " at " + version);
+                }
+            }
+
+            // Enums which aren't in the table still work, by way of reflection
+            Assert.AreEqual(UAsset.GuessCustomVersionFromIntroducedAttributes(EngineVersion.VER_UE4_23, typeof(ObjectVersion)), UAsset.GuessCustomVersionFromTypeAndEngineVersion(EngineVersion.VER_UE4_23, typeof(ObjectVersion)));
+        }
+
+        /// <summary>
+        /// Makes sure that the generated table of built-in property types registers the same types that scanning UAssetAPI by reflection would. If this fails, the table is out of date and needs to be regenerated with scripts/generate-tables.py.
+        /// </summary>
+        [TestMethod]
+        public void TestPropertyTypeTable()
+        {
+            var expected = new Dictionary<string, PropertyData>();
+            foreach (Type type in typeof(PropertyData).Assembly.GetTypes().Where(t => t.IsSubclassOf(typeof(PropertyData)) && !t.ContainsGenericParameters))
+            {
+                var instance = (PropertyData)Activator.CreateInstance(type);
+                if (instance.PropertyType == null || !instance.ShouldBeRegistered) continue;
+                expected[instance.PropertyType.Value] = instance;
+            }
+            Assert.IsTrue(expected.Count > 0);
+
+            var registry = new Dictionary<string, RegistryEntry>();
+            PropertyTypeTable.Register(registry);
+            Assert.AreEqual(expected.Count, registry.Count);
+
+            var asset = new UAsset(EngineVersion.VER_UE4_23);
+            foreach (KeyValuePair<string, PropertyData> entry in expected)
+            {
+                Assert.IsTrue(registry.ContainsKey(entry.Key), entry.Key);
+                Assert.AreEqual(entry.Value.GetType(), registry[entry.Key].PropertyType, entry.Key);
+                Assert.AreEqual(entry.Value.HasCustomStructSerialization, registry[entry.Key].HasCustomStructSerialization, entry.Key);
+                Assert.AreEqual(entry.Value.GetType(), registry[entry.Key].Creator(FName.DefineDummy(asset, "Test")).GetType(), entry.Key);
+
+                // And the full registry, which may also have types from other assemblies, agrees
+                Assert.AreEqual(entry.Value.GetType(), MainSerializer.TypeToClass(FName.DefineDummy(asset, entry.Key), FName.DefineDummy(asset, "Test"), null, asset).GetType(), entry.Key);
+            }
+        }
+
         /// <summary>
         /// 
         /// </summary>
@@ -348,6 +416,62 @@ namespace UAssetAPI.Tests
             }*/
         }
 
+        /// <summary>
+        /// In this test, we convert a .usmap file into a snapshot and ensure that looking up each schema and enum in the snapshot gives the same result as reading the .usmap file directly.
+        /// </summary>
+        [TestMethod]
+        [DeploymentItem(@"TestAssets/TestUnversionedProperties/Grounded.usmap", "TestUsmapSnapshot")]
+        public void TestUsmapSnapshot()
+        {
+            string usmapPath = Path.Combine("TestUsmapSnapshot", "Grounded.usmap");
+            string snapshotPath = Path.Combine("TestUsmapSnapshot", "Grounded.usnp");
+            UsmapSnapshot.Create(usmapPath, snapshotPath);
+
+            var original = new Usmap(usmapPath);
+            Assert.IsNull(original.Snapshot);
+            Assert.IsFalse(UsmapSnapshot.IsSnapshot(usmapPath));
+            Assert.IsTrue(UsmapSnapshot.IsSnapshot(snapshotPath));
+
+            var snapshot = new Usmap(snapshotPath);
+            try
+            {
+                Assert.IsNotNull(snapshot.Snapshot);
+                Assert.AreEqual(original.Schemas.Count, snapshot.Snapshot.SchemaCount);
+                Assert.AreEqual(original.EnumMap.Count, snapshot.Snapshot.EnumCount);
+
+                foreach (var entry in original.Schemas)
+                {
+                    Assert.IsTrue(snapshot.TryGetSchema(entry.Key, out UsmapSchema schema), entry.Key);
+                    Assert.AreEqual(entry.Value.Name, schema.Name);
+                    Assert.AreEqual(entry.Value.SuperType, schema.SuperType, entry.Key);
+                    Assert.AreEqual(entry.Value.PropCount, schema.PropCount, entry.Key);
+                    Assert.AreEqual(entry.Value.Properties.Count, schema.Properties.Count, entry.Key);
+                    for (int i = 0; i < entry.Value.Properties.Count; i++)
+                    {
+                        Assert.AreEqual(entry.Value.Properties[i].ToString(), schema.Properties[i].ToString(), entry.Key);
+                    }
+                }
+
+                foreach (var entry in original.EnumMap)
+                {
+                    Assert.IsTrue(snapshot.TryGetEnum(entry.Key, out List<string> values), entry.Key);
+                    Assert.IsTrue(entry.Value.SequenceEqual(values), entry.Key);
+                }
+
+                Assert.IsFalse(snapshot.TryGetSchema("ThisSchemaDoesNotExist", out _));
+                Assert.IsFalse(snapshot.TryGetEnum("ThisEnumDoesNotExist", out _));
+
+                // Reading everything in at once gives the same result
+                Assert.IsTrue(original.NameMap.SequenceEqual(snapshot.NameMap));
+                Assert.AreEqual(original.Schemas.Count, snapshot.Schemas.Count);
+                Assert.AreEqual(original.EnumMap.Count, snapshot.EnumMap.Count);
+            }
+            finally
+            {
+                snapshot.Snapshot.Dispose();
+            }
+        }
+
         /// <summary>
         /// In this test, we examine a variety of assets from different games and ensure that they parse correctly and maintain binary equality.
         /// </summary>
@@ -506,6 +630,444 @@ namespace UAssetAPI.Tests
             Assert.IsTrue(hasCoolProperty);
         }
 
+        /// <summary>
+        /// In this test, we read a blueprint with an export filter that only accepts Function and Class exports, and make sure that the rest are left unloaded until they are requested.
+        /// Binary equality is expected.
+        /// </summary>
+        [TestMethod]
+        [DeploymentItem(@"TestAssets/TestManyAssets/Astroneer/DebugMenu.uasset", "TestLazyExports")]
+        public void TestLazyExports()
+        {
+            string path = Path.Combine("TestLazyExports", "DebugMenu.uasset");
+            var eager = new UAsset(path, EngineVersion.VER_UE4_23);
+
+            var tester = new UAsset(EngineVersion.VER_UE4_23);
+            tester.FilePath = path;
+            tester.ExportLoadFilter = classType => classType.Value.Value == "Function" || classType.Value.Value.EndsWith("BlueprintGeneratedClass");
+            tester.Read(tester.PathToReader(path));
+            Assert.IsTrue(tester.Exports.Count == eager.Exports.Count);
+
+            int numUnloaded = 0;
+            int firstUnloaded = -1;
+            for (int i = 0; i < tester.Exports.Count; i++)
+            {
+                if (tester.IsExportLoaded(i))
+                {
+                    Assert.IsTrue(tester.Exports[i].GetType() == eager.Exports[i].GetType());
+                    if (tester.Exports[i] is StructExport structExport) Assert.IsTrue(structExport.ScriptBytecodeSize == ((StructExport)eager.Exports[i]).ScriptBytecodeSize);
+                }
+                else
+                {
+                    Assert.IsTrue(tester.Exports[i].GetType() == typeof(Export));
+                    if (firstUnloaded < 0) firstUnloaded = i;
+                    numUnloaded++;
+                }
+            }
+            Assert.IsTrue(numUnloaded > 0);
+
+            // Load a single export on demand
+            tester.LoadExport(firstUnloaded);
+            Assert.IsTrue(tester.IsExportLoaded(firstUnloaded));
+            Assert.IsTrue(tester.Exports[firstUnloaded].GetType() == eager.Exports[firstUnloaded].GetType());
+
+            // Writing the asset out loads everything else
+            Assert.IsTrue(tester.VerifyBinaryEquality());
+            Assert.IsTrue(CheckAllExportsParsedCorrectly(tester));
+            for (int i = 0; i < tester.Exports.Count; i++)
+            {
+                Assert.IsTrue(tester.IsExportLoaded(i));
+                Assert.IsTrue(tester.Exports[i].GetType() == eager.Exports[i].GetType());
+            }
+        }
+
+        /// <summary>
+        /// In this test, we read assets with memory-mapped input, both with and without a separate .uexp file, and make sure they parse identically to the regular path.
+        /// Binary equality is expected.
+        /// </summary>
+        [TestMethod]
+        [DeploymentItem(@"TestAssets/TestManyAssets/Astroneer/Staging_T2.umap", "TestMemoryMappedInput")]
+        [DeploymentItem(@"TestAssets/TestJson/Items.uasset", "TestMemoryMappedInput")]
+        [DeploymentItem(@"TestAssets/TestJson/Items.uexp", "TestMemoryMappedInput")]
+        public void TestMemoryMappedInput()
+        {
+            TestMemoryMappedInputOnFile("Staging_T2.umap", EngineVersion.VER_UE4_23);
+            TestMemoryMappedInputOnFile("Items.uasset", EngineVersion.VER_UE4_23);
+
+            // A read which fails partway through should still release the mapping
+            string truncatedPath = Path.Combine("TestMemoryMappedInput", "Truncated.umap");
+            File.WriteAllBytes(truncatedPath, File.ReadAllBytes(Path.Combine("TestMemoryMappedInput", "Staging_T2.umap")).Take(1024).ToArray());
+            var truncated = new UAsset(EngineVersion.VER_UE4_23);
+            truncated.FilePath = truncatedPath;
+            truncated.UseMemoryMappedInput = true;
+            AssetBinaryReader truncatedReader = truncated.PathToReader(truncatedPath);
+            bool threw = false;
+            try
+            {
+                truncated.Read(truncatedReader);
+            }
+            catch (Exception)
+            {
+                threw = true;
+            }
+            Assert.IsTrue(threw);
+            Assert.IsFalse(truncatedReader.BaseStream.CanRead);
+        }
+
+        private void TestMemoryMappedInputOnFile(string file, EngineVersion version)
+        {
+            string path = Path.Combine("TestMemoryMappedInput", file);
+            var eager = new UAsset(path, version);
+
+            var tester = new UAsset(version);
+            tester.FilePath = path;
+            tester.UseMemoryMappedInput = true;
+            tester.Read(tester.PathToReader(path));
+            Assert.IsTrue(tester.UseSeparateBulkDataFiles == eager.UseSeparateBulkDataFiles);
+            Assert.IsTrue(tester.Exports.Count == eager.Exports.Count);
+            for (int i = 0; i < tester.Exports.Count; i++) Assert.IsTrue(tester.Exports[i].GetType() == eager.Exports[i].GetType());
+            Assert.IsTrue(tester.VerifyBinaryEquality());
+            Assert.IsTrue(CheckAllExportsParsedCorrectly(tester));
+
+            // The files should no longer be mapped, so we can write over them
+            tester.Write(path);
+            Assert.IsTrue(new UAsset(path, version).VerifyBinaryEquality());
+        }
+
+        /// <summary>
+        /// In this test, we read assets with an <see cref="AssetReadProfile"/> attached, and make sure every export is accounted for, including those which are loaded later on.
+        /// Binary equality is expected.
+        /// </summary>
+        [TestMethod]
+        [DeploymentItem(@"TestAssets/TestManyAssets/Astroneer/DebugMenu.uasset", "TestAssetReadProfile")]
+        [DeploymentItem(@"TestAssets/TestJson/Items.uasset", "TestAssetReadProfile")]
+        [DeploymentItem(@"TestAssets/TestJson/Items.uexp", "TestAssetReadProfile")]
+        public void TestAssetReadProfile()
+        {
+            var tester = new UAsset(EngineVersion.VER_UE4_23);
+            tester.FilePath = Path.Combine("TestAssetReadProfile", "DebugMenu.uasset");
+            tester.Profile = new AssetReadProfile();
+            tester.ExportLoadFilter = classType => classType.Value.Value == "Function";
+            tester.Read(tester.PathToReader(tester.FilePath));
+
+            Assert.IsTrue(tester.Profile.Phases[0].Name == "Header");
+            Assert.IsTrue(tester.Profile.Phases.Single(x => x.Name == "NameMap").Bytes > 0);
+            Assert.IsTrue(tester.Profile.Phases.Single(x => x.Name == "ExportData").Count == 1);
+            Assert.IsTrue(tester.Profile.Total > TimeSpan.Zero);
+            int numLoaded = Enumerable.Range(0, tester.Exports.Count).Count(tester.IsExportLoaded);
+            Assert.IsTrue(numLoaded < tester.Exports.Count);
+            Assert.IsTrue(tester.Profile.ExportTypes.Values.Sum(x => x.Count) == numLoaded);
+            Assert.IsTrue(tester.Profile.ExportTypes["FunctionExport"].Count == numLoaded);
+
+            // Exports loaded on demand are added in as they're loaded
+            tester.LoadAllExports();
+            Assert.IsTrue(tester.Profile.ExportTypes.Values.Sum(x => x.Count) == tester.Exports.Count);
+            Assert.IsTrue(tester.Profile.ExportTypes.Values.Sum(x => x.Failed) == 0);
+            Assert.IsTrue(tester.VerifyBinaryEquality());
+
+            // Separate .uexp files with preload dependencies
+            var tester2 = new UAsset(EngineVersion.VER_UE4_23);
+            tester2.FilePath = Path.Combine("TestAssetReadProfile", "Items.uasset");
+            tester2.Profile = new AssetReadProfile();
+            tester2.Read(tester2.PathToReader(tester2.FilePath));
+            Assert.IsTrue(tester2.Profile.Phases.Any(x => x.Name == "PreloadDependencies"));
+            Assert.IsTrue(tester2.Profile.ExportTypes.Values.Sum(x => x.Count) == tester2.Exports.Count);
+            Assert.IsTrue(tester2.Profile.Phases.Single(x => x.Name == "ExportData").Bytes == tester2.Exports.Sum(x => x.SerialSize));
+            Assert.IsTrue(tester2.VerifyBinaryEquality());
+        }
+
+        /// <summary>
+        /// In this test, we read several assets with a shared <see cref="NameInternPool"/>, and make sure that names common to all of them are only kept once, without changing what gets written back out.
+        /// Binary equality is expected.
+        /// </summary>
+        [TestMethod]
+        [DeploymentItem(@"TestAssets/TestManyAssets/Astroneer/DebugMenu.uasset", "TestNameInternPool")]
+        [DeploymentItem(@"TestAssets/TestManyAssets/Astroneer/Staging_T2.umap", "TestNameInternPool")]
+        [DeploymentItem(@"TestAssets/TestManyAssets/Astroneer/Augment_BroadBrush.uasset", "TestNameInternPool")]
+        public void TestNameInternPool()
+        {
+            string[] files = { "DebugMenu.uasset", "Staging_T2.umap", "Augment_BroadBrush.uasset" };
+            var pool = new NameInternPool();
+
+            var assets = new List<UAsset>();
+            int totalNames = 0;
+            foreach (string file in files)
+            {
+                var tester = new UAsset(EngineVersion.VER_UE4_23);
+                tester.FilePath = Path.Combine("TestNameInternPool", file);
+                tester.NamePool = pool;
+                tester.Read(tester.PathToReader(tester.FilePath));
+                Assert.IsTrue(tester.VerifyBinaryEquality());
+                Assert.IsTrue(CheckAllExportsParsedCorrectly(tester));
+                assets.Add(tester);
+                totalNames += tester.GetNameMapIndexList().Count;
+            }
+
+            Assert.IsTrue(pool.Lookups == totalNames);
+            Assert.IsTrue(pool.Hits > 0);
+            Assert.IsTrue(pool.Count == pool.Lookups - pool.Hits);
+            Assert.IsTrue(pool.BytesSaved > 0);
+
+            // The same name in different assets is the same object, and FNames resolve to it
+            FString none0 = assets[0].GetNameReference(assets[0].SearchNameReference(FString.FromString("None")));
+            FString none1 = assets[1].GetNameReference(assets[1].SearchNameReference(FString.FromString("None")));
+            Assert.AreSame(none0, none1);
+            Assert.AreSame(none0, FName.FromString(assets[2], "None").Value);
+
+            pool.Clear();
+            Assert.IsTrue(pool.Count == 0 && pool.Lookups == 0 && pool.BytesSaved == 0);
+        }
+
+        /// <summary>
+        /// In this test, we make sure that <see cref="UAsset.VerifyBinaryEqualityDetailed"/> finds the first difference after an asset is modified, and works out which export or section of the package it falls in.
+        /// </summary>
+        [TestMethod]
+        [DeploymentItem(@"TestAssets/TestManyAssets/Astroneer/DebugMenu.uasset", "TestVerifyBinaryEqualityDetailed")]
+        public void TestVerifyBinaryEqualityDetailed()
+        {
+            string path = Path.Combine("TestVerifyBinaryEqualityDetailed", "DebugMenu.uasset");
+            var tester = new UAsset(path, EngineVersion.VER_UE4_23);
+            var result = tester.VerifyBinaryEqualityDetailed();
+            Assert.IsTrue(result.Equal);
+            Assert.AreEqual(-1, result.MismatchOffset);
+            Assert.AreEqual(new FileInfo(path).Length, result.OriginalLength);
+            Assert.AreEqual(result.OriginalLength, result.SerializedLength);
+
+            // Change a float property somewhere in the export data
+            tester = new UAsset(path, EngineVersion.VER_UE4_23);
+            int exportIndex = tester.Exports.FindIndex(e => e is NormalExport normalExport && normalExport.Data.Any(p => p is FloatPropertyData));
+            Assert.IsTrue(exportIndex >= 0);
+            long serialOffset = tester.Exports[exportIndex].SerialOffset;
+            ((FloatPropertyData)((NormalExport)tester.Exports[exportIndex]).Data.First(p => p is FloatPropertyData)).Value += 1;
+            result = tester.VerifyBinaryEqualityDetailed();
+            Assert.IsFalse(result.Equal);
+            Assert.IsFalse(tester.VerifyBinaryEquality());
+            Assert.AreEqual(exportIndex, result.MismatchExport);
+            Assert.AreEqual(tester.Exports[exportIndex].ObjectName.ToString(), result.MismatchExportName);
+            Assert.AreEqual(serialOffset + result.MismatchExportOffset, result.MismatchOffset);
+            Assert.IsNull(result.MismatchSection);
+
+            // Change an import, which is outside of any export
+            tester = new UAsset(path, EngineVersion.VER_UE4_23);
+            tester.Imports[0].ObjectName = tester.Imports[1].ObjectName;
+            result = tester.VerifyBinaryEqualityDetailed();
+            Assert.IsFalse(result.Equal);
+            Assert.AreEqual(-1, result.MismatchExport);
+            Assert.AreEqual("Imports", result.MismatchSection);
+            Assert.AreEqual(result.OriginalLength, result.SerializedLength);
+        }
+
+        /// <summary>
+        /// In this test, we serialize the bytecode of several assets on separate threads at once, each with its own <see cref="KismetSerializerContext"/>, and make sure the results match the static <see cref="KismetSerializer"/> API run one asset at a time.
+        /// </summary>
+        [TestMethod]
+        [DeploymentItem(@"TestAssets/TestManyAssets/Astroneer/DebugMenu.uasset", "TestKismetSerializerContext")]
+        [DeploymentItem(@"TestAssets/TestManyAssets/Astroneer/Staging_T2.umap", "TestKismetSerializerContext")]
+        [DeploymentItem(@"TestAssets/TestManyAssets/Astroneer/Augment_BroadBrush.uasset", "TestKismetSerializerContext")]
+        [DeploymentItem(@"TestAssets/TestManyAssets/Astroneer/LargeResourceCanister_IT.uasset", "TestKismetSerializerContext")]
+        public void TestKismetSerializerContext()
+        {
+            string[] files = { "DebugMenu.uasset", "Staging_T2.umap", "Augment_BroadBrush.uasset", "LargeResourceCanister_IT.uasset" };
+
+            string[] expected = new string[files.Length];
+            for (int i = 0; i < files.Length; i++)
+            {
+                KismetSerializer.asset = new UAsset(Path.Combine("TestKismetSerializerContext", files[i]), EngineVersion.VER_UE4_23);
+                expected[i] = SerializeAllBytecode(KismetSerializer.asset, code => KismetSerializer.SerializeScript(code).ToString());
+                Assert.IsTrue(expected[i].Length > 0);
+            }
+
+            // Several rounds, so that the threads get a chance to overlap
+            string[] actual = new string[files.Length * 4];
+            Parallel.For(0, actual.Length, i =>
+            {
+                var context = new KismetSerializerContext(new UAsset(Path.Combine("TestKismetSerializerContext", files[i % files.Length]), EngineVersion.VER_UE4_23));
+                actual[i] = SerializeAllBytecode(context.Asset, code => context.SerializeScript(code).ToString());
+            });
+            for (int i = 0; i < actual.Length; i++) Assert.AreEqual(expected[i % files.Length], actual[i]);
+        }
+
+        private static string SerializeAllBytecode(UAsset asset, Func<KismetExpression[], string> serialize)
+        {
+            var result = new System.Text.StringBuilder();
+            foreach (Export export in asset.Exports)
+            {
+                if (export is StructExport structExport && structExport.ScriptBytecode != null) result.AppendLine(serialize(structExport.ScriptBytecode));
+            }
+            return result.ToString();
+        }
+
+        /// <summary>
+        /// In this test, we make sure that <see cref="KismetPathTable"/> matches a plain walk of the outer chain, that it notices when imports and exports are added, and that it picks up renames once invalidated.
+        /// </summary>
+        [TestMethod]
+        [DeploymentItem(@"TestAssets/TestManyAssets/Astroneer/DebugMenu.uasset", "TestKismetPathTable")]
+        public void TestKismetPathTable()
+        {
+            var tester = new UAsset(Path.Combine("TestKismetPathTable", "DebugMenu.uasset"), EngineVersion.VER_UE4_23);
+            var paths = new KismetPathTable(tester);
+
+            Func<int, string> walk = null;
+            walk = index =>
+            {
+                FObjectResource resource = index > 0 ? (FObjectResource)tester.Exports[index - 1] : tester.Imports[-index - 1];
+                if (resource.OuterIndex.Index == 0) return resource.ObjectName.ToString();
+                return walk(resource.OuterIndex.Index) + "." + resource.ObjectName.ToString();
+            };
+            for (int i = -tester.Imports.Count; i <= tester.Exports.Count; i++)
+            {
+                if (i == 0) continue;
+                Assert.AreEqual(walk(i), paths.GetFullName(i));
+            }
+            Assert.IsTrue(tester.Exports[paths.GetClassIndex() - 1] is ClassExport);
+            Assert.AreEqual(1, paths.BuildCount);
+
+            // Find an export whose outer is another export
+            int child = tester.Exports.FindIndex(e => e.OuterIndex.Index > 0) + 1;
+            int outer = tester.Exports[child - 1].OuterIndex.Index;
+            Assert.IsTrue(child > 0);
+
+            // Renaming an outer in place isn't noticed until the table is invalidated, after which the paths beneath it change
+            string oldPath = paths.GetFullName(child);
+            tester.Exports[outer - 1].ObjectName = new FName(tester, "RenamedOuter");
+            Assert.AreEqual(oldPath, paths.GetFullName(child));
+            Assert.AreEqual(1, paths.BuildCount);
+            paths.Invalidate();
+            Assert.AreEqual(walk(child), paths.GetFullName(child));
+            Assert.IsTrue(paths.GetParentName(child).EndsWith("RenamedOuter"));
+
+            // So does re-parenting
+            tester.Exports[child - 1].OuterIndex = new FPackageIndex(0);
+            paths.Invalidate();
+            Assert.AreEqual(tester.Exports[child - 1].ObjectName.ToString(), paths.GetFullName(child));
+            Assert.AreEqual("", paths.GetParentName(child));
+
+            // Adding an import is picked up too
+            tester.Imports.Add(new Import("/Script/CoreUObject", "Package", new FPackageIndex(0), "/Game/NewPackage", tester));
+            Assert.AreEqual("/Game/NewPackage", paths.GetFullName(-tester.Imports.Count));
+            Assert.AreEqual(4, paths.BuildCount);
+        }
+
+        /// <summary>
+        /// In this test, we make sure that <see cref="KismetSerializerContext.FindProperty(int, FName, out FieldTypes.FProperty)"/> finds the same properties as a linear scan of each struct's properties.
+        /// </summary>
+        [TestMethod]
+        [DeploymentItem(@"TestAssets/TestJson/WPN_LockOnRifle.uasset", "TestKismetFindProperty")]
+        [DeploymentItem(@"TestAssets/TestJson/WPN_LockOnRifle.uexp", "TestKismetFindProperty")]
+        public void TestKismetFindProperty()
+        {
+            var tester = new UAsset(Path.Combine("TestKismetFindProperty", "WPN_LockOnRifle.uasset"), EngineVersion.VER_UE4_25);
+            var context = new KismetSerializerContext(tester);
+
+            int numFound = 0;
+            for (int i = 0; i < tester.Exports.Count; i++)
+            {
+                if (!(tester.Exports[i] is StructExport structExport) || structExport.LoadedProperties == null) continue;
+                foreach (var prop in structExport.LoadedProperties)
+                {
+                    Assert.IsTrue(context.FindProperty(i + 1, prop.Name, out var found));
+                    Assert.AreSame(structExport.LoadedProperties.First(p => p.Name == prop.Name), found);
+                    numFound++;
+                }
+                Assert.IsFalse(context.FindProperty(i + 1, new FName(tester, "NotARealProperty"), out _));
+            }
+            Assert.IsTrue(numFound > 0);
+        }
+
+        /// <summary>
+        /// In this test, we make sure that <see cref="KismetScriptBatch"/> gathers up the same serializations and raw bytecode as visiting each export one at a time, whether the asset comes from a path or a stream or has had its exports filtered, and whether the serializations are returned or written to files.
+        /// </summary>
+        [TestMethod]
+        [DeploymentItem(@"TestAssets/TestManyAssets/Astroneer/DebugMenu.uasset", "TestKismetScriptBatch")]
+        public void TestKismetScriptBatch()
+        {
+            string path = Path.Combine("TestKismetScriptBatch", "DebugMenu.uasset");
+            var context = new KismetSerializerContext(new UAsset(path, EngineVersion.VER_UE4_23));
+            var exports = new List<Tuple<int, StructExport>>();
+            for (int i = 0; i < context.Asset.Exports.Count; i++)
+            {
+                if (context.Asset.Exports[i] is StructExport structExport && structExport.ScriptBytecode != null && structExport.ScriptBytecode.Length > 0) exports.Add(Tuple.Create(i + 1, structExport));
+            }
+            Assert.IsTrue(exports.Count > 1);
+
+            var batch = KismetScriptBatch.Read(path, EngineVersion.VER_UE4_23);
+            var manifest = Newtonsoft.Json.Linq.JArray.Parse(batch.Manifest);
+            string[] scripts = batch.Scripts.Split(KismetScriptBatch.Separator);
+            Assert.AreEqual(exports.Count, batch.Count);
+            Assert.AreEqual(exports.Count, manifest.Count);
+            Assert.AreEqual(exports.Count, scripts.Length);
+            for (int i = 0; i < exports.Count; i++)
+            {
+                StructExport export = exports[i].Item2;
+                Assert.AreEqual(exports[i].Item1, (int)manifest[i]["index"]);
+                Assert.AreEqual(export.ObjectName.ToString(), (string)manifest[i]["name"]);
+                Assert.AreEqual(context.SerializeScript(export.ScriptBytecode).ToString(), scripts[i]);
+                Assert.IsTrue(export.ScriptBytecodeRaw.SequenceEqual(batch.Raw.Skip((int)manifest[i]["offset"]).Take((int)manifest[i]["length"])));
+            }
+            Assert.AreEqual(exports.Sum(e => e.Item2.ScriptBytecodeRaw.Length), batch.Raw.Length);
+
+            using (var stream = context.Asset.PathToStream(path))
+            {
+                var fromStream = KismetScriptBatch.Read(stream, EngineVersion.VER_UE4_23);
+                Assert.AreEqual(batch.Manifest, fromStream.Manifest);
+                Assert.AreEqual(batch.Scripts, fromStream.Scripts);
+                Assert.IsTrue(batch.Raw.SequenceEqual(fromStream.Raw));
+            }
+
+            // Bytecode exports skipped by ExportLoadFilter are loaded, rather than left out, but nothing else is
+            var filtered = new UAsset(EngineVersion.VER_UE4_23);
+            filtered.FilePath = path;
+            filtered.ExportLoadFilter = classType => false;
+            filtered.Read(filtered.PathToReader(path));
+            var fromFiltered = KismetScriptBatch.Serialize(new KismetSerializerContext(filtered));
+            Assert.AreEqual(batch.Manifest, fromFiltered.Manifest);
+            Assert.AreEqual(batch.Scripts, fromFiltered.Scripts);
+            Assert.IsTrue(batch.Raw.SequenceEqual(fromFiltered.Raw));
+            Assert.IsTrue(Enumerable.Range(0, filtered.Exports.Count).Any(i => !filtered.IsExportLoaded(i)));
+
+            var toFiles = KismetScriptBatch.SerializeToFiles(context, Path.Combine("TestKismetScriptBatch", "DebugMenu-{0:D3}-{1}.json"), false, Path.Combine("TestKismetScriptBatch", "DebugMenu-{0:D3}-{1}.raw"));
+            manifest = Newtonsoft.Json.Linq.JArray.Parse(toFiles.Manifest);
+            Assert.AreEqual(string.Empty, toFiles.Scripts);
+            Assert.IsTrue(batch.Raw.SequenceEqual(toFiles.Raw));
+            for (int i = 0; i < exports.Count; i++)
+            {
+                string written = Path.Combine("TestKismetScriptBatch", $"DebugMenu-{exports[i].Item1:D3}-{exports[i].Item2.ObjectName}.json");
+                Assert.AreEqual(written, (string)manifest[i]["path"]);
+                Assert.AreEqual(scripts[i], File.ReadAllText(written));
+                Assert.AreEqual(Path.ChangeExtension(written, "raw"), (string)manifest[i]["rawPath"]);
+                Assert.IsTrue(exports[i].Item2.ScriptBytecodeRaw.SequenceEqual(File.ReadAllBytes(Path.ChangeExtension(written, "raw"))));
+            }
+        }
+
+        /// <summary>
+        /// In this test, we make sure that when serializing a script to a file fails partway through, no file (truncated or otherwise) is left behind, and any existing file is left alone.
+        /// </summary>
+        [TestMethod]
+        [DeploymentItem(@"TestAssets/TestManyAssets/Astroneer/DebugMenu.uasset", "TestKismetSerializeToFileFailure")]
+        public void TestKismetSerializeToFileFailure()
+        {
+            var context = new KismetSerializerContext(new UAsset(Path.Combine("TestKismetSerializeToFileFailure", "DebugMenu.uasset"), EngineVersion.VER_UE4_23));
+            StructExport export = context.Asset.Exports.OfType<StructExport>().First(e => e.ScriptBytecode != null && e.ScriptBytecode.Length > 0);
+
+            // A local variable pointing past the end of the export map can't be serialized, so this fails after the rest of the script has been written
+            KismetExpression[] broken = export.ScriptBytecode.Concat(new KismetExpression[] { new EX_LocalVariable() { Variable = new KismetPropertyPointer(new FPackageIndex(int.MaxValue)) } }).ToArray();
+
+            string jsonPath = Path.Combine("TestKismetSerializeToFileFailure", "broken.json");
+            string binaryPath = Path.Combine("TestKismetSerializeToFileFailure", "broken.bin");
+            Assert.ThrowsException<ArgumentOutOfRangeException>(() => context.SerializeScriptToFile(broken, jsonPath));
+            Assert.ThrowsException<ArgumentOutOfRangeException>(() => context.SerializeScriptToBinaryFile(broken, binaryPath));
+            Assert.IsFalse(File.Exists(jsonPath));
+            Assert.IsFalse(File.Exists(binaryPath));
+
+            // A successful serialization replaces the file, and a failed one leaves it as it was
+            context.SerializeScriptToFile(export.ScriptBytecode, jsonPath);
+            string expected = File.ReadAllText(jsonPath);
+            Assert.AreEqual(context.SerializeScript(export.ScriptBytecode).ToString(), expected);
+            Assert.ThrowsException<ArgumentOutOfRangeException>(() => context.SerializeScriptToFile(broken, jsonPath));
+            Assert.AreEqual(expected, File.ReadAllText(jsonPath));
+
+            Assert.AreEqual(1, Directory.GetFiles("TestKismetSerializeToFileFailure", "broken.*").Length);
+        }
+
         /// <summary>
         /// In this test, we verify that Ace Combat 7 decryption works.
         /// Binary equality is expected.
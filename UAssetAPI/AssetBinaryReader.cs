@@ -110,6 +110,8 @@ namespace UAssetAPI
             {
                 hashes = this.ReadUInt32();
             }
+
+            if (Asset.NamePool != null) str = Asset.NamePool.Intern(str);
             return str;
         }
 
@@ -0,0 +1,110 @@
+﻿using System;
+using System.Collections.Generic;
+using System.Diagnostics;
+using System.Linq;
+using System.Text;
+
+namespace UAssetAPI
+{
+    /// <summary>
+    /// A breakdown of where the time went while reading an asset, filled in by <see cref="UAsset.Read(AssetBinaryReader, int[], int[])"/> when one is assigned to <see cref="UAsset.Profile"/>.
+    /// </summary>
+    public class AssetReadProfile
+    {
+        /// <summary>
+        /// The time spent on, and bytes read by, one phase of reading the asset or one type of export.
+        /// </summary>
+        public class Timing
+        {
+            public string Name;
+            /// <summary>The number of times this phase ran, or the number of exports of this type that were read.</summary>
+            public int Count;
+            /// <summary>The number of bytes read from the asset.</summary>
+            public long Bytes;
+            public TimeSpan Elapsed;
+            /// <summary>For export types, the number of exports which failed to parse and fell back to a <see cref="ExportTypes.RawExport"/>.</summary>
+            public int Failed;
+
+            public Timing(string name)
+            {
+                Name = name;
+            }
+        }
+
+        /// <summary>
+        /// The phases of <see cref="UAsset.Read(AssetBinaryReader, int[], int[])"/>, in the order they ran: the header, name map, import and export tables, and so on, up to the export data as a whole.
+        /// </summary>
+        public List<Timing> Phases = new List<Timing>();
+
+        /// <summary>
+        /// The exports that were read, grouped by the type of <see cref="ExportTypes.Export"/> they were read as. Exports which are loaded later on (see <see cref="UAsset.LoadExport(int)"/>) are added here as they are loaded.
+        /// </summary>
+        public Dictionary<string, Timing> ExportTypes = new Dictionary<string, Timing>();
+
+        /// <summary>
+        /// The total time taken by <see cref="UAsset.Read(AssetBinaryReader, int[], int[])"/>.
+        /// </summary>
+        public TimeSpan Total;
+
+        /// <summary>
+        /// Discards everything recorded so far.
+        /// </summary>
+        public void Clear()
+        {
+            Phases.Clear();
+            ExportTypes.Clear();
+            Total = TimeSpan.Zero;
+        }
+
+        internal static TimeSpan TicksToTimeSpan(long stopwatchTicks)
+        {
+            return TimeSpan.FromTicks((long)(stopwatchTicks * ((double)TimeSpan.TicksPerSecond / Stopwatch.Frequency)));
+        }
+
+        internal void AddPhase(string name, long stopwatchTicks, long bytes)
+        {
+            Timing timing = Phases.FirstOrDefault(x => x.Name == name);
+            if (timing == null)
+            {
+                timing = new Timing(name);
+                Phases.Add(timing);
+            }
+            timing.Count++;
+            timing.Bytes += bytes;
+            timing.Elapsed += TicksToTimeSpan(stopwatchTicks);
+        }
+
+        internal void AddExport(string typeName, long stopwatchTicks, long bytes, bool failed)
+        {
+            if (!ExportTypes.TryGetValue(typeName, out Timing timing))
+            {
+                timing = new Timing(typeName);
+                ExportTypes[typeName] = timing;
+            }
+            timing.Count++;
+            timing.Bytes += bytes;
+            timing.Elapsed += TicksToTimeSpan(stopwatchTicks);
+            if (failed) timing.Failed++;
+        }
+
+        /// <summary>
+        /// Formats the profile as a human-readable table.
+        /// </summary>
+        public override string ToString()
+        {
+            var res = new StringBuilder();
+            res.AppendLine("Read in " + Total.TotalMilliseconds.ToString("0.000") + " ms");
+            res.AppendLine(string.Format("  {0,-24} {1,12} {2,12}", "Phase", "Time (ms)", "Bytes"));
+            foreach (Timing timing in Phases)
+            {
+                res.AppendLine(string.Format("  {0,-24} {1,12:0.000} {2,12}", timing.Name, timing.Elapsed.TotalMilliseconds, timing.Bytes));
+            }
+            res.AppendLine(string.Format("  {0,-24} {1,6} {2,12} {3,12} {4,6}", "Export type", "Count", "Time (ms)", "Bytes", "Failed"));
+            foreach (Timing timing in ExportTypes.Values.OrderByDescending(x => x.Elapsed))
+            {
+                res.AppendLine(string.Format("  {0,-24} {1,6} {2,12:0.000} {3,12} {4,6}", timing.Name, timing.Count, timing.Elapsed.TotalMilliseconds, timing.Bytes, timing.Failed));
+            }
+            return res.ToString();
+        }
+    }
+}
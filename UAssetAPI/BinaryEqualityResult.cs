@@ -0,0 +1,64 @@
+﻿namespace UAssetAPI
+{
+    /// <summary>
+    /// The result of <see cref="UAsset.VerifyBinaryEqualityDetailed"/>: whether an asset maintained binary equality when serialized, and if not, where the first difference was.
+    /// </summary>
+    public class BinaryEqualityResult
+    {
+        /// <summary>
+        /// Whether the serialized asset matched the original byte for byte.
+        /// </summary>
+        public bool Equal => MismatchOffset < 0;
+
+        /// <summary>
+        /// The length of the original asset, including its .uexp if it has one.
+        /// </summary>
+        public long OriginalLength;
+
+        /// <summary>
+        /// The length of the asset once serialized.
+        /// </summary>
+        public long SerializedLength;
+
+        /// <summary>
+        /// The offset of the first byte which differs, counting the .uexp as following straight on from the .uasset, or -1 if the two are equal. If one is the start of the other, this is the length of the shorter one.
+        /// </summary>
+        public long MismatchOffset = -1;
+
+        /// <summary>
+        /// The index within <see cref="UAsset.Exports"/> of the export whose original serialized data holds <see cref="MismatchOffset"/>, or -1 if it isn't within any export's data.
+        /// </summary>
+        public int MismatchExport = -1;
+
+        /// <summary>
+        /// The name of the export at <see cref="MismatchExport"/>, if any.
+        /// </summary>
+        public string MismatchExportName;
+
+        /// <summary>
+        /// How far <see cref="MismatchOffset"/> is into the data of the export at <see cref="MismatchExport"/>, or -1 if it isn't within any export's data.
+        /// </summary>
+        public long MismatchExportOffset = -1;
+
+        /// <summary>
+        /// If <see cref="MismatchOffset"/> isn't within any export's data, the part of the package it falls in (such as "NameMap" or "ExportMap", named as in <see cref="AssetReadProfile"/>), or "Trailer" for anything after the last export.
+        /// </summary>
+        public string MismatchSection;
+
+        public override string ToString()
+        {
+            if (Equal) return "Binary equality maintained (" + OriginalLength + " bytes)";
+
+            string where;
+            if (MismatchExport >= 0)
+            {
+                where = "in export " + (MismatchExport + 1) + " (" + MismatchExportName + ") at offset " + MismatchExportOffset + " into its data";
+            }
+            else
+            {
+                where = "in " + (MismatchSection ?? "unknown section");
+            }
+            return "First difference at offset " + MismatchOffset + ", " + where + " (original " + OriginalLength + " bytes, serialized " + SerializedLength + " bytes)";
+        }
+    }
+}
@@ -0,0 +1,86 @@
+﻿//------------------------------------------------------------------------------
+// <auto-generated>
+//     This code was generated by scripts/generate-tables.py.
+//
+//     Changes to this file will be lost if the code is regenerated. Regenerate
+//     it after changing any custom version enum, EngineVersion, or
+//     CustomVersion.GuidToCustomVersionStringMap.
+// </auto-generated>
+//------------------------------------------------------------------------------
+using System.Collections.Generic;
+using UAssetAPI.UnrealTypes;
+
+namespace UAssetAPI
+{
+    /// <summary>
+    /// The results of <see cref="UAsset.GuessCustomVersionFromIntroducedAttributes(EngineVersion, System.Type)"/> for every custom version in <see cref="CustomVersion.GuidToCustomVersionStringMap"/> and every <see cref="EngineVersion"/>, worked out ahead of time so that setting up an asset's default custom versions doesn't need any reflection.
+    /// </summary>
+    internal static class CustomVersionTable
+    {
+        /// <summary>
+        /// Guessed custom versions, indexed by <see cref="EngineVersion"/>. Null for names which don't have an enum.
+        /// </summary>
+        private static readonly Dictionary<string, int[]> GuessedVersions = new Dictionary<string, int[]>()
+        {
+            { "UnusedCustomVersionKey", null },
+            { "FBlueprintsObjectVersion", null },
+            { "FBuildObjectVersion", null },
+            { "FCoreObjectVersion", new int[] { -1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 2, 2, 2, 2, 2, 2, 2, 3, 3, 3, 4, 4, 4, 5, 6 } },
+            { "FEditorObjectVersion", new int[] { -1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 2, 6, 8, 14, 17, 20, 20, 23, 24, 26, 30, 34, 37, 38, 40, 40, 41, 42 } },
+            { "FFrameworkObjectVersion", new int[] { -1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 6, 12, 17, 22, 23, 28, 30, 33, 34, 34, 35, 35, 36, 37, 37, 37, 38, 39 } },
+            { "FMobileObjectVersion", null },
+            { "FNetworkingObjectVersion", null },
+            { "FOnlineObjectVersion", null },
+            { "FPhysicsObjectVersion", null },
+            { "FPlatformObjectVersion", null },
+            { "FRenderingObjectVersion", null },
+            { "FSequencerObjectVersion", new int[] { -1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 3, 4, 4, 4, 6, 9, 9, 11, 11, 11, 12, 12, 13, 14, 15 } },
+            { "FVRObjectVersion", null },
+            { "FLoadTimesObjectVersion", null },
+            { "FGeometryObjectVersion", null },
+            { "FAnimPhysObjectVersion", new int[] { -1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 3, 7, 12, 16, 17, 17, 17, 17, 17, 17, 17, 17, 18, 19 } },
+            { "FAnimObjectVersion", null },
+            { "FReflectionCaptureObjectVersion", null },
+            { "FAutomationObjectVersion", null },
+            { "FFortniteMainBranchObjectVersion", new int[] { -1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 12, 17, 25, 27, 31, 31, 43, 47, 60, 61 } },
+            { "FEnterpriseObjectVersion", null },
+            { "FNiagaraObjectVersion", null },
+            { "FDestructionObjectVersion", null },
+            { "FExternalPhysicsCustomObjectVersion", null },
+            { "FExternalPhysicsMaterialCustomObjectVersion", null },
+            { "FCineCameraObjectVersion", null },
+            { "FVirtualProductionObjectVersion", null },
+            { "FMediaFrameworkObjectVersion", null },
+            { "FPoseDriverCustomVersion", null },
+            { "FTempCustomVersion", null },
+            { "FAnimationCustomVersion", null },
+            { "FAssetRegistryVersion", new int[] { -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, 13, 14 } },
+            { "FClothingAssetCustomVersion", null },
+            { "FReleaseObjectVersion", new int[] { -1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 3, 4, 7, 9, 10, 10, 13, 17, 20, 20, 23, 28, 30, 38, 43, 44, 45 } },
+            { "FParticleSystemCustomVersion", null },
+            { "FSkeletalMeshCustomVersion", null },
+            { "FRecomputeTangentCustomVersion", null },
+            { "FOverlappingVerticesCustomVersion", null },
+            { "FFoliageCustomVersion", null },
+            { "FProceduralFoliageCustomVersion", null },
+            { "FLiveLinkCustomVersion", null },
+        };
+
+        /// <summary>
+        /// Looks up the guessed value of a custom version for a specific Unreal version.
+        /// </summary>
+        /// <param name="name">The name of the custom version, as in <see cref="CustomVersion.GuidToCustomVersionStringMap"/>.</param>
+        /// <param name="chosenVersion">The version of the engine to check against.</param>
+        /// <param name="guessed">The guessed custom version, or -1 if there isn't one.</param>
+        /// <returns>Whether the table has an answer for this custom version and engine version.</returns>
+        internal static bool TryGetGuessedVersion(string name, EngineVersion chosenVersion, out int guessed)
+        {
+            guessed = -1;
+            if (!GuessedVersions.TryGetValue(name, out int[] versions)) return false;
+            if (versions == null) return true;
+            if (chosenVersion < 0 || (int)chosenVersion >= versions.Length) return false;
+            guessed = versions[(int)chosenVersion];
+            return true;
+        }
+    }
+}
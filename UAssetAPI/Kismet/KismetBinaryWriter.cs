@@ -0,0 +1,204 @@
+using Newtonsoft.Json.Linq;
+using System;
+using System.Collections.Generic;
+using System.Globalization;
+using System.IO;
+using System.Text;
+
+namespace UAssetAPI.Kismet
+{
+    /// <summary>
+    /// Writes serialized Kismet bytecode in a compact binary format, as an alternative to JSON for tools which need to read large scripts quickly.
+    /// The format is the four bytes "UBC1" followed by a single value, where each value starts with one of the tags below. Every string (object keys and opcode names included) is written out in full the first time it appears, and by its index in the order of first appearance after that.
+    /// </summary>
+    public class KismetBinaryWriter : IDisposable
+    {
+        public static readonly byte[] Magic = { (byte)'U', (byte)'B', (byte)'C', (byte)'1' };
+
+        public const byte TagNull = 0x00;
+        public const byte TagFalse = 0x01;
+        public const byte TagTrue = 0x02;
+        /// <summary>Followed by a zigzag-encoded variable-length integer.</summary>
+        public const byte TagInteger = 0x03;
+        /// <summary>Followed by a little-endian 64-bit float.</summary>
+        public const byte TagFloat = 0x04;
+        /// <summary>Followed by a variable-length byte count and that many bytes of UTF-8. Adds the string to the string table.</summary>
+        public const byte TagString = 0x05;
+        /// <summary>Followed by a variable-length index into the string table.</summary>
+        public const byte TagStringReference = 0x06;
+        /// <summary>Followed by values until <see cref="TagEnd"/>.</summary>
+        public const byte TagArray = 0x07;
+        /// <summary>Followed by alternating string keys and values until <see cref="TagEnd"/>.</summary>
+        public const byte TagObject = 0x08;
+        public const byte TagEnd = 0x09;
+
+        private readonly Stream stream;
+        private readonly bool leaveOpen;
+        private readonly Dictionary<string, int> strings = new Dictionary<string, int>();
+        private readonly byte[] buffer = new byte[10];
+
+        /// <summary>
+        /// Creates a writer which writes to the given stream, starting with the format's magic bytes.
+        /// </summary>
+        /// <param name="stream">The stream to write to.</param>
+        /// <param name="leaveOpen">Whether to leave the stream open when this writer is disposed.</param>
+        public KismetBinaryWriter(Stream stream, bool leaveOpen = false)
+        {
+            this.stream = stream;
+            this.leaveOpen = leaveOpen;
+            stream.Write(Magic, 0, Magic.Length);
+        }
+
+        public void WriteStartArray()
+        {
+            stream.WriteByte(TagArray);
+        }
+
+        public void WriteStartObject()
+        {
+            stream.WriteByte(TagObject);
+        }
+
+        public void WriteEnd()
+        {
+            stream.WriteByte(TagEnd);
+        }
+
+        public void WriteNull()
+        {
+            stream.WriteByte(TagNull);
+        }
+
+        public void WriteValue(bool value)
+        {
+            stream.WriteByte(value ? TagTrue : TagFalse);
+        }
+
+        public void WriteValue(long value)
+        {
+            stream.WriteByte(TagInteger);
+            WriteVarInt((ulong)((value << 1) ^ (value >> 63)));
+        }
+
+        public void WriteValue(double value)
+        {
+            if (double.IsNaN(value) || double.IsInfinity(value))
+            {
+                // JSON has no way to write these as numbers, so Json.NET writes them as strings
+                WriteValue(value.ToString(CultureInfo.InvariantCulture));
+                return;
+            }
+
+            stream.WriteByte(TagFloat);
+            byte[] bytes = BitConverter.GetBytes(value);
+            if (!BitConverter.IsLittleEndian) Array.Reverse(bytes);
+            stream.Write(bytes, 0, bytes.Length);
+        }
+
+        public void WriteValue(string value)
+        {
+            if (value == null)
+            {
+                WriteNull();
+                return;
+            }
+
+            if (strings.TryGetValue(value, out int index))
+            {
+                stream.WriteByte(TagStringReference);
+                WriteVarInt((ulong)index);
+                return;
+            }
+
+            strings.Add(value, strings.Count);
+            byte[] bytes = Encoding.UTF8.GetBytes(value);
+            stream.WriteByte(TagString);
+            WriteVarInt((ulong)bytes.Length);
+            stream.Write(bytes, 0, bytes.Length);
+        }
+
+        /// <summary>
+        /// Writes out a JSON token and everything within it. Values which JSON would write as strings (such as GUIDs) are written as strings, and floats are converted just as they would be when round-tripped through JSON.
+        /// </summary>
+        /// <param name="token">The token to write.</param>
+        public void WriteToken(JToken token)
+        {
+            switch (token.Type)
+            {
+                case JTokenType.Object:
+                    WriteStartObject();
+                    foreach (JProperty property in ((JObject)token).Properties())
+                    {
+                        WriteValue(property.Name);
+                        WriteToken(property.Value);
+                    }
+                    WriteEnd();
+                    break;
+                case JTokenType.Array:
+                    WriteStartArray();
+                    foreach (JToken child in (JArray)token) WriteToken(child);
+                    WriteEnd();
+                    break;
+                case JTokenType.Property:
+                    WriteToken(((JProperty)token).Value);
+                    break;
+                case JTokenType.Null:
+                case JTokenType.Undefined:
+                    WriteNull();
+                    break;
+                case JTokenType.Boolean:
+                    WriteValue((bool)token);
+                    break;
+                case JTokenType.Integer:
+                    object intValue = ((JValue)token).Value;
+                    if (intValue is ulong ulongValue && ulongValue > long.MaxValue)
+                    {
+                        WriteValue((double)ulongValue);
+                    }
+                    else
+                    {
+                        WriteValue((long)token);
+                    }
+                    break;
+                case JTokenType.Float:
+                    object floatValue = ((JValue)token).Value;
+                    if (floatValue is float singleValue)
+                    {
+                        // JSON writes out the shortest string which round-trips the float, so match what a reader of that would see
+                        WriteValue(double.Parse(singleValue.ToString("R", CultureInfo.InvariantCulture), CultureInfo.InvariantCulture));
+                    }
+                    else
+                    {
+                        WriteValue((double)token);
+                    }
+                    break;
+                default:
+                    WriteValue(token.ToObject<string>());
+                    break;
+            }
+        }
+
+        private void WriteVarInt(ulong value)
+        {
+            int length = 0;
+            while (value >= 0x80)
+            {
+                buffer[length++] = (byte)(value | 0x80);
+                value >>= 7;
+            }
+            buffer[length++] = (byte)value;
+            stream.Write(buffer, 0, length);
+        }
+
+        public void Flush()
+        {
+            stream.Flush();
+        }
+
+        public void Dispose()
+        {
+            stream.Flush();
+            if (!leaveOpen) stream.Dispose();
+        }
+    }
+}
@@ -0,0 +1,159 @@
+using System;
+using System.Collections.Generic;
+using UAssetAPI.ExportTypes;
+using UAssetAPI.UnrealTypes;
+
+namespace UAssetAPI.Kismet
+{
+    /// <summary>
+    /// Resolved names and dotted paths for every import and export in an asset, so that <see cref="KismetSerializerContext"/> doesn't have to rebuild them by walking <see cref="FObjectResource.OuterIndex"/> for every reference in the bytecode.
+    /// Each lookup only checks that the import and export lists haven't been replaced, and haven't had entries added or removed, since the table was built, and rebuilds the table if they have, so lookups take constant time. Renaming or re-parenting an import or export in place isn't detected; call <see cref="Invalidate"/> after doing so.
+    /// </summary>
+    public class KismetPathTable
+    {
+        private struct Entry
+        {
+            public int OuterIndex;
+            public string ObjectName;
+            public string FullName;
+        }
+
+        private readonly UAsset asset;
+        private List<Import> boundImports;
+        private List<Export> boundExports;
+        private int boundImportCount;
+        private int boundExportCount;
+        private Entry[] imports;
+        private Entry[] exports;
+        private int classIndex;
+
+        /// <summary>
+        /// The number of times this table has been (re)built.
+        /// </summary>
+        public int BuildCount { get; private set; }
+
+        /// <summary>
+        /// Builds the path table for the given asset.
+        /// </summary>
+        /// <param name="asset">The asset to build the table for.</param>
+        public KismetPathTable(UAsset asset)
+        {
+            this.asset = asset;
+            Build();
+        }
+
+        /// <summary>
+        /// Discards everything in the table and rebuilds it from the asset's current imports and exports. This must be called after renaming or re-parenting any of the asset's imports or exports.
+        /// </summary>
+        public void Invalidate()
+        {
+            Build();
+        }
+
+        private void Build()
+        {
+            boundImports = asset.Imports;
+            boundExports = asset.Exports;
+            boundImportCount = boundImports?.Count ?? 0;
+            boundExportCount = boundExports?.Count ?? 0;
+
+            imports = new Entry[boundImportCount];
+            for (int i = 0; i < imports.Length; i++) imports[i] = NewEntry(boundImports[i]);
+            exports = new Entry[boundExportCount];
+            for (int i = 0; i < exports.Length; i++) exports[i] = NewEntry(boundExports[i]);
+
+            classIndex = 0;
+            for (int i = 1; i <= boundExportCount; i++)
+            {
+                // Only blueprint class exports are read as ClassExport, so there's no need to load anything else
+                if (!asset.IsExportLoaded(i - 1) && boundExports[i - 1].GetExportClassType().Value.Value.EndsWith("BlueprintGeneratedClass")) asset.LoadExport(i - 1);
+                if (boundExports[i - 1] is ClassExport)
+                {
+                    classIndex = i;
+                    break;
+                }
+            }
+
+            BuildCount++;
+        }
+
+        private static Entry NewEntry(FObjectResource resource)
+        {
+            return new Entry
+            {
+                OuterIndex = resource.OuterIndex?.Index ?? 0,
+                ObjectName = resource.ObjectName?.ToString(),
+            };
+        }
+
+        private ref Entry GetEntry(int index)
+        {
+            // Out-of-range indices throw just like the lists would
+            if (index > exports.Length || -index > imports.Length) throw new ArgumentOutOfRangeException(nameof(index));
+            if (index > 0) return ref exports[index - 1];
+            return ref imports[-index - 1];
+        }
+
+        private string ResolveFullName(int index)
+        {
+            // Full names are resolved on first use, and then kept until the table is rebuilt
+            ref Entry entry = ref GetEntry(index);
+            if (entry.FullName == null)
+            {
+                entry.FullName = entry.OuterIndex == 0 ? entry.ObjectName : ResolveFullName(entry.OuterIndex) + "." + entry.ObjectName;
+            }
+            return entry.FullName;
+        }
+
+        /// <summary>
+        /// Rebuilds the table if the asset's import or export lists have been replaced, or had entries added or removed, since it was built.
+        /// </summary>
+        private void Validate()
+        {
+            if (asset.Imports != boundImports || asset.Exports != boundExports || asset.Imports.Count != boundImportCount || asset.Exports.Count != boundExportCount) Build();
+        }
+
+        /// <summary>
+        /// Returns the name of the import or export at the given package index, or an empty string for index 0.
+        /// </summary>
+        /// <param name="index">The package index to look up.</param>
+        public string GetName(int index)
+        {
+            if (index == 0) return "";
+            Validate();
+            return GetEntry(index).ObjectName;
+        }
+
+        /// <summary>
+        /// Returns the full dotted path of the import or export at the given package index, or an empty string for index 0.
+        /// </summary>
+        /// <param name="index">The package index to look up.</param>
+        public string GetFullName(int index)
+        {
+            if (index == 0) return "";
+            Validate();
+            return ResolveFullName(index);
+        }
+
+        /// <summary>
+        /// Returns the full dotted path of the outer of the import or export at the given package index, or an empty string if it has none.
+        /// </summary>
+        /// <param name="index">The package index to look up.</param>
+        public string GetParentName(int index)
+        {
+            if (index == 0) return "";
+            Validate();
+            int outerIndex = GetEntry(index).OuterIndex;
+            return outerIndex == 0 ? "" : ResolveFullName(outerIndex);
+        }
+
+        /// <summary>
+        /// Returns the package index of the asset's blueprint class export, or 0 if it has none.
+        /// </summary>
+        public int GetClassIndex()
+        {
+            if (asset.Exports != boundExports || asset.Exports.Count != boundExportCount || (classIndex != 0 && !(asset.Exports[classIndex - 1] is ClassExport))) Build();
+            return classIndex;
+        }
+    }
+}
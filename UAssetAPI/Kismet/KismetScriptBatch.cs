@@ -0,0 +1,173 @@
+using Newtonsoft.Json;
+using System;
+using System.Globalization;
+using System.IO;
+using System.Text;
+using UAssetAPI.ExportTypes;
+using UAssetAPI.UnrealTypes;
+
+namespace UAssetAPI.Kismet
+{
+    /// <summary>
+    /// The serialized bytecode of every export in an asset which has any, gathered up in a single call.
+    /// This is meant for callers on the far side of an interop boundary (such as Python, through pythonnet), for whom visiting each export and reading its members one at a time is expensive: everything comes back as a few flat values which can each be carried across at once, no matter how many exports the asset has.
+    /// </summary>
+    public class KismetScriptBatch
+    {
+        /// <summary>
+        /// The character which separates the scripts within <see cref="Scripts"/>. It can never appear within a script, since JSON escapes control characters inside strings.
+        /// </summary>
+        public const char Separator = '\0';
+
+        /// <summary>
+        /// A JSON array with one object per export with bytecode, in export order. Each object has the export's "index" (1-based), its "name", the "offset" and "length" of its raw bytecode within <see cref="Raw"/>, and, if anything was written to files, the "path" its serialization was written to and the "rawPath" its raw bytecode was written to.
+        /// </summary>
+        public string Manifest;
+
+        /// <summary>
+        /// Each export's serialized script, formatted just as <see cref="KismetSerializerContext.SerializeScript(Bytecode.KismetExpression[])"/> would be once converted to a string, in the same order as <see cref="Manifest"/> and separated by <see cref="Separator"/>. Empty if the serializations were written to files instead.
+        /// </summary>
+        public string Scripts;
+
+        /// <summary>
+        /// The raw on-disk bytecode of each export, back to back. Each export's slice is given by its "offset" and "length" in <see cref="Manifest"/>. This will not match the in-memory bytecode.
+        /// </summary>
+        public byte[] Raw;
+
+        /// <summary>
+        /// The number of exports with bytecode.
+        /// </summary>
+        public int Count;
+
+        /// <summary>
+        /// Reads the asset at the given path and serializes the bytecode of all of its exports.
+        /// </summary>
+        /// <param name="path">The path of the asset file on disk.</param>
+        /// <param name="engineVersion">The version of the Unreal Engine that will be used to parse the asset.</param>
+        /// <returns>The serialized bytecode of every export which has any.</returns>
+        public static KismetScriptBatch Read(string path, EngineVersion engineVersion)
+        {
+            return Serialize(new KismetSerializerContext(new UAsset(path, engineVersion)));
+        }
+
+        /// <summary>
+        /// Reads an asset from the given stream and serializes the bytecode of all of its exports.
+        /// </summary>
+        /// <param name="stream">A stream containing the asset, with its .uexp (if any) appended.</param>
+        /// <param name="engineVersion">The version of the Unreal Engine that will be used to parse the asset.</param>
+        /// <returns>The serialized bytecode of every export which has any.</returns>
+        public static KismetScriptBatch Read(Stream stream, EngineVersion engineVersion)
+        {
+            UAsset asset = new UAsset(engineVersion);
+            asset.Read(new AssetBinaryReader(stream, asset));
+            return Serialize(new KismetSerializerContext(asset));
+        }
+
+        /// <summary>
+        /// Serializes the bytecode of every export in the context's asset which has any. Any Function or blueprint class exports skipped by <see cref="UAsset.ExportLoadFilter"/> are loaded first.
+        /// </summary>
+        /// <param name="context">The serializer context for an asset which has already been read.</param>
+        /// <returns>The serialized bytecode of every export which has any.</returns>
+        public static KismetScriptBatch Serialize(KismetSerializerContext context)
+        {
+            StringBuilder scripts = new StringBuilder();
+            KismetScriptBatch batch = Build(context, (export, index, name, manifest) =>
+            {
+                if (scripts.Length > 0) scripts.Append(Separator);
+                using (StringWriter writer = new StringWriter(scripts, CultureInfo.InvariantCulture))
+                {
+                    context.SerializeScript(export.ScriptBytecode, writer);
+                }
+            });
+            batch.Scripts = scripts.ToString();
+            return batch;
+        }
+
+        /// <summary>
+        /// Serializes the bytecode of every export in the context's asset which has any, streaming each serialization to its own file rather than returning it. Any Function or blueprint class exports skipped by <see cref="UAsset.ExportLoadFilter"/> are loaded first.
+        /// </summary>
+        /// <param name="context">The serializer context for an asset which has already been read.</param>
+        /// <param name="pathFormat">A composite format string giving the path to write each serialization to, where {0} is the export's 1-based index and {1} is its name.</param>
+        /// <param name="binary">Whether to write the compact binary format of <see cref="KismetBinaryWriter"/> rather than JSON.</param>
+        /// <param name="rawPathFormat">If not null, each export's raw bytecode is also written out as-is, to a path given by this composite format string in the same way as <paramref name="pathFormat"/>.</param>
+        /// <returns>The manifest and raw bytecode of every export which has any, with the paths everything was written to.</returns>
+        public static KismetScriptBatch SerializeToFiles(KismetSerializerContext context, string pathFormat, bool binary = false, string rawPathFormat = null)
+        {
+            KismetScriptBatch batch = Build(context, (export, index, name, manifest) =>
+            {
+                string path = string.Format(CultureInfo.InvariantCulture, pathFormat, index, name);
+                if (binary)
+                {
+                    context.SerializeScriptToBinaryFile(export.ScriptBytecode, path);
+                }
+                else
+                {
+                    context.SerializeScriptToFile(export.ScriptBytecode, path);
+                }
+                manifest.WritePropertyName("path");
+                manifest.WriteValue(path);
+
+                if (rawPathFormat != null)
+                {
+                    string rawPath = string.Format(CultureInfo.InvariantCulture, rawPathFormat, index, name);
+                    File.WriteAllBytes(rawPath, export.ScriptBytecodeRaw ?? new byte[0]);
+                    manifest.WritePropertyName("rawPath");
+                    manifest.WriteValue(rawPath);
+                }
+            });
+            batch.Scripts = string.Empty;
+            return batch;
+        }
+
+        private static KismetScriptBatch Build(KismetSerializerContext context, Action<StructExport, int, string, JsonWriter> serialize)
+        {
+            if (context == null) throw new ArgumentNullException(nameof(context));
+
+            KismetScriptBatch batch = new KismetScriptBatch();
+            StringWriter manifest = new StringWriter(CultureInfo.InvariantCulture);
+            using (MemoryStream raw = new MemoryStream())
+            using (JsonTextWriter writer = new JsonTextWriter(manifest))
+            {
+                writer.WriteStartArray();
+                for (int i = 0; i < context.Asset.Exports.Count; i++)
+                {
+                    // Exports skipped by ExportLoadFilter haven't been read as StructExports yet, so load any which could hold bytecode
+                    if (!context.Asset.IsExportLoaded(i) && CanHaveBytecode(context.Asset.Exports[i])) context.Asset.LoadExport(i);
+                    if (!(context.Asset.Exports[i] is StructExport export) || export.ScriptBytecode == null || export.ScriptBytecode.Length == 0) continue;
+
+                    int index = i + 1;
+                    string name = export.ObjectName.ToString();
+
+                    writer.WriteStartObject();
+                    writer.WritePropertyName("index");
+                    writer.WriteValue(index);
+                    writer.WritePropertyName("name");
+                    writer.WriteValue(name);
+                    writer.WritePropertyName("offset");
+                    writer.WriteValue(raw.Length);
+                    writer.WritePropertyName("length");
+                    writer.WriteValue(export.ScriptBytecodeRaw?.Length ?? 0);
+                    serialize(export, index, name, writer);
+                    writer.WriteEndObject();
+
+                    if (export.ScriptBytecodeRaw != null) raw.Write(export.ScriptBytecodeRaw, 0, export.ScriptBytecodeRaw.Length);
+                    batch.Count++;
+                }
+                writer.WriteEndArray();
+                writer.Flush();
+                batch.Raw = raw.ToArray();
+            }
+            batch.Manifest = manifest.ToString();
+            return batch;
+        }
+
+        /// <summary>
+        /// Whether the given export is of a class which is read as a <see cref="StructExport"/>: a Function or a blueprint class.
+        /// </summary>
+        private static bool CanHaveBytecode(Export export)
+        {
+            string exportClassType = export.GetExportClassType().Value.Value;
+            return exportClassType == "Function" || exportClassType.EndsWith("BlueprintGeneratedClass");
+        }
+    }
+}
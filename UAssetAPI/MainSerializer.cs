@@ -39,6 +39,7 @@ namespace UAssetAPI
 #endif
 
         private static IDictionary<string, RegistryEntry> _propertyTypeRegistry;
+        private static readonly object _propertyTypeRegistryLock = new object();
 
         /// <summary>
         /// The property type registry. Maps serialized property names to their types.
@@ -66,21 +67,30 @@ namespace UAssetAPI
         private static Type registryParentDataType = typeof(PropertyData);
 
         /// <summary>
-        /// Initializes the property type registry.
+        /// Initializes the property type registry. This happens automatically the first time the registry is needed, but it may be called ahead of time by long-running hosts to avoid paying the setup cost on the first asset read. Property types built into UAssetAPI are registered from a generated list; only assemblies which reference UAssetAPI are scanned by reflection, for any property types they define. Subsequent calls do nothing. This is safe to call from multiple threads at once; the registry is only published once it has been fully built.
         /// </summary>
-        private static void InitializePropertyTypeRegistry()
+        public static void InitializePropertyTypeRegistry()
         {
             if (_propertyTypeRegistry != null) return;
-            _propertyTypeRegistry = new Dictionary<string, RegistryEntry>();
+            lock (_propertyTypeRegistryLock)
+            {
+                if (_propertyTypeRegistry != null) return;
+                BuildPropertyTypeRegistry();
+            }
+        }
 
-            Assembly[] allDependentAssemblies = GetDependentAssemblies(registryParentDataType.Assembly).ToArray();
-            Assembly[] allAssemblies = new Assembly[allDependentAssemblies.Length + 1];
-            allAssemblies[0] = registryParentDataType.Assembly;
-            Array.Copy(allDependentAssemblies, 0, allAssemblies, 1, allDependentAssemblies.Length);
+        private static void BuildPropertyTypeRegistry()
+        {
+            IDictionary<string, RegistryEntry> registry = new Dictionary<string, RegistryEntry>();
+
+            // Built-in property types come from a generated table, so they can be registered without any reflection
+            PropertyTypeTable.Register(registry);
 
-            for (int i = 0; i < allAssemblies.Length; i++)
+            // Property types defined in other assemblies still have to be found by reflection
+            Assembly[] allDependentAssemblies = GetDependentAssemblies(registryParentDataType.Assembly).ToArray();
+            for (int i = 0; i < allDependentAssemblies.Length; i++)
             {
-                Type[] allPropertyDataTypes = allAssemblies[i].GetTypes().Where(t => t.IsSubclassOf(registryParentDataType)).ToArray();
+                Type[] allPropertyDataTypes = allDependentAssemblies[i].GetTypes().Where(t => t.IsSubclassOf(registryParentDataType)).ToArray();
                 for (int j = 0; j < allPropertyDataTypes.Length; j++)
                 {
                     Type currentPropertyDataType = allPropertyDataTypes[j];
@@ -107,23 +117,13 @@ namespace UAssetAPI
                            nameParam
                         ).Compile();
 
-                        _propertyTypeRegistry[returnedPropType.Value] = res;
+                        registry[returnedPropType.Value] = res;
                     }
                 }
             }
 
-            // Fetch the current git commit while we're here
-            UAPUtils.CurrentCommit = string.Empty;
-            using (Stream stream = registryParentDataType.Assembly.GetManifestResourceStream("UAssetAPI.git_commit.txt"))
-            {
-                if (stream != null)
-                {
-                    using (StreamReader reader = new StreamReader(stream))
-                    {
-                        if (reader != null) UAPUtils.CurrentCommit = reader.ReadToEnd().Trim();
-                    }
-                }
-            }
+            // Only publish the registry once it's complete, so other threads never see it half-built
+            _propertyTypeRegistry = registry;
         }
 
         /// <summary>
@@ -0,0 +1,164 @@
+﻿using System;
+using System.Collections.Generic;
+using System.IO;
+using System.IO.MemoryMappedFiles;
+
+namespace UAssetAPI
+{
+    /// <summary>
+    /// A read-only stream which presents one or more memory-mapped files (e.g. a .uasset and its .uexp) as a single contiguous stream, without copying their contents into memory.
+    /// </summary>
+    public class MemoryMappedAssetStream : Stream
+    {
+        private class Segment
+        {
+            public MemoryMappedFile File;
+            public MemoryMappedViewStream View;
+            public long Start;
+            public long Length;
+        }
+
+        private readonly List<Segment> segments = new List<Segment>();
+        private readonly long length;
+        private long position;
+        private int currentSegment;
+        private bool disposed;
+
+        public override bool CanRead => !disposed;
+        public override bool CanSeek => !disposed;
+        public override bool CanWrite => false;
+        public override long Length => length;
+
+        public override long Position
+        {
+            get => position;
+            set => Seek(value, SeekOrigin.Begin);
+        }
+
+        /// <summary>
+        /// Maps the given files, in order, into a single stream. Empty files are skipped.
+        /// </summary>
+        /// <param name="paths">The paths of the files to map.</param>
+        public MemoryMappedAssetStream(params string[] paths)
+        {
+            try
+            {
+                foreach (string path in paths)
+                {
+                    var fileStream = new FileStream(path, FileMode.Open, FileAccess.Read, FileShare.Read);
+                    if (fileStream.Length == 0)
+                    {
+                        fileStream.Dispose();
+                        continue;
+                    }
+
+                    var segment = new Segment();
+                    segment.Start = length;
+                    segment.Length = fileStream.Length;
+                    segment.File = MemoryMappedFile.CreateFromFile(fileStream, null, 0, MemoryMappedFileAccess.Read, HandleInheritability.None, false);
+                    // The view may be rounded up to a whole page, so we track the real length ourselves
+                    segment.View = segment.File.CreateViewStream(0, 0, MemoryMappedFileAccess.Read);
+                    segments.Add(segment);
+                    length += segment.Length;
+                }
+            }
+            catch
+            {
+                Dispose(true);
+                throw;
+            }
+        }
+
+        public override int Read(byte[] buffer, int offset, int count)
+        {
+            int totalRead = 0;
+            while (count > 0 && position < length)
+            {
+                Segment segment = segments[currentSegment];
+                long segmentOffset = position - segment.Start;
+                if (segmentOffset >= segment.Length)
+                {
+                    currentSegment++;
+                    continue;
+                }
+
+                int toRead = (int)Math.Min(count, segment.Length - segmentOffset);
+                segment.View.Position = segmentOffset;
+                int numRead = segment.View.Read(buffer, offset, toRead);
+                if (numRead <= 0) break;
+
+                position += numRead;
+                offset += numRead;
+                count -= numRead;
+                totalRead += numRead;
+            }
+            return totalRead;
+        }
+
+        public override int ReadByte()
+        {
+            if (position >= length) return -1;
+            Segment segment = segments[currentSegment];
+            if (position - segment.Start >= segment.Length) segment = segments[++currentSegment];
+
+            segment.View.Position = position - segment.Start;
+            position++;
+            return segment.View.ReadByte();
+        }
+
+        public override long Seek(long offset, SeekOrigin origin)
+        {
+            long newPosition;
+            switch (origin)
+            {
+                case SeekOrigin.Begin:
+                    newPosition = offset;
+                    break;
+                case SeekOrigin.Current:
+                    newPosition = position + offset;
+                    break;
+                case SeekOrigin.End:
+                    newPosition = length + offset;
+                    break;
+                default:
+                    throw new ArgumentException("Invalid seek origin", nameof(origin));
+            }
+            if (newPosition < 0) throw new IOException("Attempted to seek before the beginning of the stream");
+
+            position = newPosition;
+            currentSegment = 0;
+            while (currentSegment < segments.Count - 1 && position >= segments[currentSegment].Start + segments[currentSegment].Length) currentSegment++;
+            return position;
+        }
+
+        public override void Flush()
+        {
+
+        }
+
+        public override void SetLength(long value)
+        {
+            throw new NotSupportedException("MemoryMappedAssetStream is read-only");
+        }
+
+        public override void Write(byte[] buffer, int offset, int count)
+        {
+            throw new NotSupportedException("MemoryMappedAssetStream is read-only");
+        }
+
+        protected override void Dispose(bool disposing)
+        {
+            if (disposing)
+            {
+                foreach (Segment segment in segments)
+                {
+                    segment.View?.Dispose();
+                    segment.File?.Dispose();
+                }
+                segments.Clear();
+            }
+            disposed = true;
+            base.Dispose(disposing);
+        }
+    }
+}
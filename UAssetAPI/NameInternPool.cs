@@ -0,0 +1,92 @@
+﻿using System;
+using System.Collections.Concurrent;
+using System.Linq;
+using System.Text;
+using System.Threading;
+using UAssetAPI.UnrealTypes;
+
+namespace UAssetAPI
+{
+    /// <summary>
+    /// A pool of name map strings which can be shared between any number of assets, so that names which turn up in nearly every asset (such as "None" or "/Script/Engine") are only kept in memory once. Assign the same pool to <see cref="UAsset.NamePool"/> on each asset before it is read.
+    /// <para />
+    /// Every <see cref="FName"/> in an asset gets its value from the asset's name map, so they share the pooled strings as well. Pools are safe to share between threads. Pooled strings are shared between assets, so they must not be modified in place.
+    /// </summary>
+    public class NameInternPool
+    {
+        private readonly ConcurrentDictionary<FString, FString> strings = new ConcurrentDictionary<FString, FString>();
+        private long lookups;
+        private long hits;
+        private long bytesSaved;
+
+        /// <summary>The number of distinct strings in the pool.</summary>
+        public int Count => strings.Count;
+
+        /// <summary>The number of strings which have been passed to <see cref="Intern(FString)"/>.</summary>
+        public long Lookups => Interlocked.Read(ref lookups);
+
+        /// <summary>The number of strings which were already in the pool, and so were replaced by the pooled copy.</summary>
+        public long Hits => Interlocked.Read(ref hits);
+
+        /// <summary>An estimate of the memory which would have been taken up by the duplicate strings, in bytes.</summary>
+        public long BytesSaved => Interlocked.Read(ref bytesSaved);
+
+        /// <summary>An estimate of the memory taken up by the strings in the pool, in bytes.</summary>
+        public long BytesRetained => strings.Keys.Sum(x => EstimateSize(x));
+
+        /// <summary>
+        /// Returns the pooled copy of the given string, adding it to the pool if it isn't there yet.
+        /// </summary>
+        /// <param name="value">The string to look up.</param>
+        /// <returns>An equal string from the pool, which may be <paramref name="value"/> itself.</returns>
+        public FString Intern(FString value)
+        {
+            if (value?.Value == null) return value;
+
+            Interlocked.Increment(ref lookups);
+            FString pooled = strings.GetOrAdd(value, value);
+            if (!ReferenceEquals(pooled, value))
+            {
+                Interlocked.Increment(ref hits);
+                Interlocked.Add(ref bytesSaved, EstimateSize(value));
+            }
+            return pooled;
+        }
+
+        /// <summary>
+        /// Empties the pool and resets its statistics. Assets which have already been read keep the strings they were given.
+        /// </summary>
+        public void Clear()
+        {
+            strings.Clear();
+            Interlocked.Exchange(ref lookups, 0);
+            Interlocked.Exchange(ref hits, 0);
+            Interlocked.Exchange(ref bytesSaved, 0);
+        }
+
+        /// <summary>
+        /// Estimates the memory taken up by an <see cref="FString"/> and its string on a 64-bit runtime, in bytes.
+        /// </summary>
+        /// <param name="value">The string to estimate the size of.</param>
+        /// <returns>The estimated size in bytes.</returns>
+        public static long EstimateSize(FString value)
+        {
+            // An object header and method table pointer for each object, plus FString's two fields, and the string's length and UTF-16 data (with a terminator), padded to 8 bytes
+            return 32 + ((20 + 2L * (value.Value.Length + 1) + 7) & ~7L);
+        }
+
+        /// <summary>
+        /// Formats a summary of how much the pool has saved.
+        /// </summary>
+        public override string ToString()
+        {
+            long lookups = Lookups;
+            long hits = Hits;
+            var res = new StringBuilder();
+            res.AppendLine(string.Format("{0} of {1} name map strings were duplicates ({2:0.0}%)", hits, lookups, lookups == 0 ? 0 : hits * 100.0 / lookups));
+            res.AppendLine(string.Format("{0} distinct strings kept, using about {1:0.00} MB", Count, BytesRetained / 1048576.0));
+            res.AppendLine(string.Format("Saved about {0:0.00} MB", BytesSaved / 1048576.0));
+            return res.ToString();
+        }
+    }
+}
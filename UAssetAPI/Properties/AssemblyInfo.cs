@@ -9,3 +9,6 @@ using System.Runtime.InteropServices;
 
 // The following GUID is for the ID of the typelib if this project is exposed to COM
 [assembly: Guid("178417ec-1177-413e-be85-c83aecd64279")]
+
+// Lets the unit tests check internal state, such as the property type registry
+[assembly: InternalsVisibleTo("UAssetAPI.Tests")]
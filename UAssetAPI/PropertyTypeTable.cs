@@ -0,0 +1,117 @@
+﻿//------------------------------------------------------------------------------
+// <auto-generated>
+//     This code was generated by scripts/generate-tables.py.
+//
+//     Changes to this file will be lost if the code is regenerated. Regenerate
+//     it after adding or removing a property type, or changing the
+//     PropertyType, HasCustomStructSerialization, or ShouldBeRegistered of one.
+// </auto-generated>
+//------------------------------------------------------------------------------
+using System.Collections.Generic;
+using UAssetAPI.PropertyTypes.Objects;
+using UAssetAPI.PropertyTypes.Structs;
+using UAssetAPI.UnrealTypes;
+
+namespace UAssetAPI
+{
+    /// <summary>
+    /// The registry entries for every property type built into UAssetAPI, just as <see cref="MainSerializer"/> would find them by scanning the assembly, so that the property type registry can be built without any reflection or creating any instances.
+    /// </summary>
+    internal static class PropertyTypeTable
+    {
+        /// <summary>
+        /// Adds an entry for each built-in property type to the given registry.
+        /// </summary>
+        /// <param name="registry">The registry to add to.</param>
+        internal static void Register(IDictionary<string, RegistryEntry> registry)
+        {
+            registry["FontCharacter"] = new RegistryEntry() { PropertyType = typeof(FontCharacterPropertyData), HasCustomStructSerialization = true, Creator = name => new FontCharacterPropertyData(name) };
+            registry["UniqueNetIdRepl"] = new RegistryEntry() { PropertyType = typeof(UniqueNetIdReplPropertyData), HasCustomStructSerialization = true, Creator = name => new UniqueNetIdReplPropertyData(name) };
+            registry["NiagaraVariable"] = new RegistryEntry() { PropertyType = typeof(NiagaraVariablePropertyData), HasCustomStructSerialization = true, Creator = name => new NiagaraVariablePropertyData(name) };
+            registry["NiagaraVariableWithOffset"] = new RegistryEntry() { PropertyType = typeof(NiagaraVariableWithOffsetPropertyData), HasCustomStructSerialization = true, Creator = name => new NiagaraVariableWithOffsetPropertyData(name) };
+            registry["FontData"] = new RegistryEntry() { PropertyType = typeof(FontDataPropertyData), HasCustomStructSerialization = true, Creator = name => new FontDataPropertyData(name) };
+            registry["Box2D"] = new RegistryEntry() { PropertyType = typeof(Box2DPropertyData), HasCustomStructSerialization = true, Creator = name => new Box2DPropertyData(name) };
+            registry["Box"] = new RegistryEntry() { PropertyType = typeof(BoxPropertyData), HasCustomStructSerialization = true, Creator = name => new BoxPropertyData(name) };
+            registry["ClothLODData"] = new RegistryEntry() { PropertyType = typeof(ClothLODDataPropertyData), HasCustomStructSerialization = true, Creator = name => new ClothLODDataPropertyData(name) };
+            registry["Color"] = new RegistryEntry() { PropertyType = typeof(ColorPropertyData), HasCustomStructSerialization = true, Creator = name => new ColorPropertyData(name) };
+            registry["DateTime"] = new RegistryEntry() { PropertyType = typeof(DateTimePropertyData), HasCustomStructSerialization = true, Creator = name => new DateTimePropertyData(name) };
+            registry["GameplayTagContainer"] = new RegistryEntry() { PropertyType = typeof(GameplayTagContainerPropertyData), HasCustomStructSerialization = true, Creator = name => new GameplayTagContainerPropertyData(name) };
+            registry["Guid"] = new RegistryEntry() { PropertyType = typeof(GuidPropertyData), HasCustomStructSerialization = true, Creator = name => new GuidPropertyData(name) };
+            registry["IntPoint"] = new RegistryEntry() { PropertyType = typeof(IntPointPropertyData), HasCustomStructSerialization = true, Creator = name => new IntPointPropertyData(name) };
+            registry["LinearColor"] = new RegistryEntry() { PropertyType = typeof(LinearColorPropertyData), HasCustomStructSerialization = true, Creator = name => new LinearColorPropertyData(name) };
+            registry["ExpressionInput"] = new RegistryEntry() { PropertyType = typeof(ExpressionInputPropertyData), HasCustomStructSerialization = true, Creator = name => new ExpressionInputPropertyData(name) };
+            registry["MaterialAttributesInput"] = new RegistryEntry() { PropertyType = typeof(MaterialAttributesInputPropertyData), HasCustomStructSerialization = true, Creator = name => new MaterialAttributesInputPropertyData(name) };
+            registry["ColorMaterialInput"] = new RegistryEntry() { PropertyType = typeof(ColorMaterialInputPropertyData), HasCustomStructSerialization = true, Creator = name => new ColorMaterialInputPropertyData(name) };
+            registry["ScalarMaterialInput"] = new RegistryEntry() { PropertyType = typeof(ScalarMaterialInputPropertyData), HasCustomStructSerialization = true, Creator = name => new ScalarMaterialInputPropertyData(name) };
+            registry["ShadingModelMaterialInput"] = new RegistryEntry() { PropertyType = typeof(ShadingModelMaterialInputPropertyData), HasCustomStructSerialization = true, Creator = name => new ShadingModelMaterialInputPropertyData(name) };
+            registry["VectorMaterialInput"] = new RegistryEntry() { PropertyType = typeof(VectorMaterialInputPropertyData), HasCustomStructSerialization = true, Creator = name => new VectorMaterialInputPropertyData(name) };
+            registry["Vector2MaterialInput"] = new RegistryEntry() { PropertyType = typeof(Vector2MaterialInputPropertyData), HasCustomStructSerialization = true, Creator = name => new Vector2MaterialInputPropertyData(name) };
+            registry["FrameNumber"] = new RegistryEntry() { PropertyType = typeof(FrameNumberPropertyData), HasCustomStructSerialization = true, Creator = name => new FrameNumberPropertyData(name) };
+            registry["MovieSceneEvalTemplatePtr"] = new RegistryEntry() { PropertyType = typeof(MovieSceneEvalTemplatePtrPropertyData), HasCustomStructSerialization = true, Creator = name => new MovieSceneEvalTemplatePtrPropertyData(name) };
+            registry["MovieSceneTrackImplementationPtr"] = new RegistryEntry() { PropertyType = typeof(MovieSceneTrackImplementationPtrPropertyData), HasCustomStructSerialization = true, Creator = name => new MovieSceneTrackImplementationPtrPropertyData(name) };
+            registry["MovieSceneEvaluationFieldEntityTree"] = new RegistryEntry() { PropertyType = typeof(MovieSceneEvaluationFieldEntityTreePropertyData), HasCustomStructSerialization = true, Creator = name => new MovieSceneEvaluationFieldEntityTreePropertyData(name) };
+            registry["MovieSceneSubSequenceTree"] = new RegistryEntry() { PropertyType = typeof(MovieSceneSubSequenceTreePropertyData), HasCustomStructSerialization = true, Creator = name => new MovieSceneSubSequenceTreePropertyData(name) };
+            registry["MovieSceneSequenceInstanceDataPtr"] = new RegistryEntry() { PropertyType = typeof(MovieSceneSequenceInstanceDataPtrPropertyData), HasCustomStructSerialization = true, Creator = name => new MovieSceneSequenceInstanceDataPtrPropertyData(name) };
+            registry["SectionEvaluationDataTree"] = new RegistryEntry() { PropertyType = typeof(SectionEvaluationDataTreePropertyData), HasCustomStructSerialization = true, Creator = name => new SectionEvaluationDataTreePropertyData(name) };
+            registry["MovieSceneTrackFieldData"] = new RegistryEntry() { PropertyType = typeof(MovieSceneTrackFieldDataPropertyData), HasCustomStructSerialization = true, Creator = name => new MovieSceneTrackFieldDataPropertyData(name) };
+            registry["MovieSceneEventParameters"] = new RegistryEntry() { PropertyType = typeof(MovieSceneEventParametersPropertyData), HasCustomStructSerialization = true, Creator = name => new MovieSceneEventParametersPropertyData(name) };
+            registry["MovieSceneFloatChannel"] = new RegistryEntry() { PropertyType = typeof(MovieSceneFloatChannelPropertyData), HasCustomStructSerialization = true, Creator = name => new MovieSceneFloatChannelPropertyData(name) };
+            registry["MovieSceneFloatValue"] = new RegistryEntry() { PropertyType = typeof(MovieSceneFloatValuePropertyData), HasCustomStructSerialization = true, Creator = name => new MovieSceneFloatValuePropertyData(name) };
+            registry["MovieSceneFrameRange"] = new RegistryEntry() { PropertyType = typeof(MovieSceneFrameRangePropertyData), HasCustomStructSerialization = true, Creator = name => new MovieSceneFrameRangePropertyData(name) };
+            registry["MovieSceneSegment"] = new RegistryEntry() { PropertyType = typeof(MovieSceneSegmentPropertyData), HasCustomStructSerialization = true, Creator = name => new MovieSceneSegmentPropertyData(name) };
+            registry["MovieSceneSegmentIdentifier"] = new RegistryEntry() { PropertyType = typeof(MovieSceneSegmentIdentifierPropertyData), HasCustomStructSerialization = true, Creator = name => new MovieSceneSegmentIdentifierPropertyData(name) };
+            registry["MovieSceneTrackIdentifier"] = new RegistryEntry() { PropertyType = typeof(MovieSceneTrackIdentifierPropertyData), HasCustomStructSerialization = true, Creator = name => new MovieSceneTrackIdentifierPropertyData(name) };
+            registry["MovieSceneSequenceID"] = new RegistryEntry() { PropertyType = typeof(MovieSceneSequenceIDPropertyData), HasCustomStructSerialization = true, Creator = name => new MovieSceneSequenceIDPropertyData(name) };
+            registry["MovieSceneEvaluationKey"] = new RegistryEntry() { PropertyType = typeof(MovieSceneEvaluationKeyPropertyData), HasCustomStructSerialization = true, Creator = name => new MovieSceneEvaluationKeyPropertyData(name) };
+            registry["PerPlatformBool"] = new RegistryEntry() { PropertyType = typeof(PerPlatformBoolPropertyData), HasCustomStructSerialization = true, Creator = name => new PerPlatformBoolPropertyData(name) };
+            registry["PerPlatformFloat"] = new RegistryEntry() { PropertyType = typeof(PerPlatformFloatPropertyData), HasCustomStructSerialization = true, Creator = name => new PerPlatformFloatPropertyData(name) };
+            registry["PerPlatformInt"] = new RegistryEntry() { PropertyType = typeof(PerPlatformIntPropertyData), HasCustomStructSerialization = true, Creator = name => new PerPlatformIntPropertyData(name) };
+            registry["Quat"] = new RegistryEntry() { PropertyType = typeof(QuatPropertyData), HasCustomStructSerialization = true, Creator = name => new QuatPropertyData(name) };
+            registry["FloatRange"] = new RegistryEntry() { PropertyType = typeof(FloatRangePropertyData), HasCustomStructSerialization = true, Creator = name => new FloatRangePropertyData(name) };
+            registry["RawStructProperty"] = new RegistryEntry() { PropertyType = typeof(RawStructPropertyData), HasCustomStructSerialization = true, Creator = name => new RawStructPropertyData(name) };
+            registry["RichCurveKey"] = new RegistryEntry() { PropertyType = typeof(RichCurveKeyPropertyData), HasCustomStructSerialization = true, Creator = name => new RichCurveKeyPropertyData(name) };
+            registry["Rotator"] = new RegistryEntry() { PropertyType = typeof(RotatorPropertyData), HasCustomStructSerialization = true, Creator = name => new RotatorPropertyData(name) };
+            registry["SkeletalMeshAreaWeightedTriangleSampler"] = new RegistryEntry() { PropertyType = typeof(SkeletalMeshAreaWeightedTriangleSamplerPropertyData), HasCustomStructSerialization = true, Creator = name => new SkeletalMeshAreaWeightedTriangleSamplerPropertyData(name) };
+            registry["SkeletalMeshSamplingLODBuiltData"] = new RegistryEntry() { PropertyType = typeof(SkeletalMeshSamplingLODBuiltDataPropertyData), HasCustomStructSerialization = true, Creator = name => new SkeletalMeshSamplingLODBuiltDataPropertyData(name) };
+            registry["SmartName"] = new RegistryEntry() { PropertyType = typeof(SmartNamePropertyData), HasCustomStructSerialization = true, Creator = name => new SmartNamePropertyData(name) };
+            registry["SoftAssetPath"] = new RegistryEntry() { PropertyType = typeof(SoftAssetPathPropertyData), HasCustomStructSerialization = true, Creator = name => new SoftAssetPathPropertyData(name) };
+            registry["SoftClassPath"] = new RegistryEntry() { PropertyType = typeof(SoftClassPathPropertyData), HasCustomStructSerialization = true, Creator = name => new SoftClassPathPropertyData(name) };
+            registry["SoftObjectPath"] = new RegistryEntry() { PropertyType = typeof(SoftObjectPathPropertyData), HasCustomStructSerialization = true, Creator = name => new SoftObjectPathPropertyData(name) };
+            registry["StringAssetReference"] = new RegistryEntry() { PropertyType = typeof(StringAssetReferencePropertyData), HasCustomStructSerialization = true, Creator = name => new StringAssetReferencePropertyData(name) };
+            registry["StructProperty"] = new RegistryEntry() { PropertyType = typeof(StructPropertyData), HasCustomStructSerialization = false, Creator = name => new StructPropertyData(name) };
+            registry["Timespan"] = new RegistryEntry() { PropertyType = typeof(TimespanPropertyData), HasCustomStructSerialization = true, Creator = name => new TimespanPropertyData(name) };
+            registry["Vector2D"] = new RegistryEntry() { PropertyType = typeof(Vector2DPropertyData), HasCustomStructSerialization = true, Creator = name => new Vector2DPropertyData(name) };
+            registry["Vector4"] = new RegistryEntry() { PropertyType = typeof(Vector4PropertyData), HasCustomStructSerialization = true, Creator = name => new Vector4PropertyData(name) };
+            registry["Vector"] = new RegistryEntry() { PropertyType = typeof(VectorPropertyData), HasCustomStructSerialization = true, Creator = name => new VectorPropertyData(name) };
+            registry["ViewTargetBlendParams"] = new RegistryEntry() { PropertyType = typeof(ViewTargetBlendParamsPropertyData), HasCustomStructSerialization = true, Creator = name => new ViewTargetBlendParamsPropertyData(name) };
+            registry["WeightedRandomSampler"] = new RegistryEntry() { PropertyType = typeof(WeightedRandomSamplerPropertyData), HasCustomStructSerialization = true, Creator = name => new WeightedRandomSamplerPropertyData(name) };
+            registry["ArrayProperty"] = new RegistryEntry() { PropertyType = typeof(ArrayPropertyData), HasCustomStructSerialization = false, Creator = name => new ArrayPropertyData(name) };
+            registry["BoolProperty"] = new RegistryEntry() { PropertyType = typeof(BoolPropertyData), HasCustomStructSerialization = false, Creator = name => new BoolPropertyData(name) };
+            registry["ByteProperty"] = new RegistryEntry() { PropertyType = typeof(BytePropertyData), HasCustomStructSerialization = false, Creator = name => new BytePropertyData(name) };
+            registry["DelegateProperty"] = new RegistryEntry() { PropertyType = typeof(DelegatePropertyData), HasCustomStructSerialization = false, Creator = name => new DelegatePropertyData(name) };
+            registry["DoubleProperty"] = new RegistryEntry() { PropertyType = typeof(DoublePropertyData), HasCustomStructSerialization = false, Creator = name => new DoublePropertyData(name) };
+            registry["EnumProperty"] = new RegistryEntry() { PropertyType = typeof(EnumPropertyData), HasCustomStructSerialization = false, Creator = name => new EnumPropertyData(name) };
+            registry["FloatProperty"] = new RegistryEntry() { PropertyType = typeof(FloatPropertyData), HasCustomStructSerialization = false, Creator = name => new FloatPropertyData(name) };
+            registry["Int16Property"] = new RegistryEntry() { PropertyType = typeof(Int16PropertyData), HasCustomStructSerialization = false, Creator = name => new Int16PropertyData(name) };
+            registry["Int64Property"] = new RegistryEntry() { PropertyType = typeof(Int64PropertyData), HasCustomStructSerialization = false, Creator = name => new Int64PropertyData(name) };
+            registry["Int8Property"] = new RegistryEntry() { PropertyType = typeof(Int8PropertyData), HasCustomStructSerialization = false, Creator = name => new Int8PropertyData(name) };
+            registry["InterfaceProperty"] = new RegistryEntry() { PropertyType = typeof(InterfacePropertyData), HasCustomStructSerialization = false, Creator = name => new InterfacePropertyData(name) };
+            registry["IntProperty"] = new RegistryEntry() { PropertyType = typeof(IntPropertyData), HasCustomStructSerialization = false, Creator = name => new IntPropertyData(name) };
+            registry["MapProperty"] = new RegistryEntry() { PropertyType = typeof(MapPropertyData), HasCustomStructSerialization = false, Creator = name => new MapPropertyData(name) };
+            registry["MulticastDelegateProperty"] = new RegistryEntry() { PropertyType = typeof(MulticastDelegatePropertyData), HasCustomStructSerialization = false, Creator = name => new MulticastDelegatePropertyData(name) };
+            registry["MulticastSparseDelegateProperty"] = new RegistryEntry() { PropertyType = typeof(MulticastSparseDelegatePropertyData), HasCustomStructSerialization = false, Creator = name => new MulticastSparseDelegatePropertyData(name) };
+            registry["MulticastInlineDelegateProperty"] = new RegistryEntry() { PropertyType = typeof(MulticastInlineDelegatePropertyData), HasCustomStructSerialization = false, Creator = name => new MulticastInlineDelegatePropertyData(name) };
+            registry["NameProperty"] = new RegistryEntry() { PropertyType = typeof(NamePropertyData), HasCustomStructSerialization = false, Creator = name => new NamePropertyData(name) };
+            registry["ObjectProperty"] = new RegistryEntry() { PropertyType = typeof(ObjectPropertyData), HasCustomStructSerialization = false, Creator = name => new ObjectPropertyData(name) };
+            registry["SetProperty"] = new RegistryEntry() { PropertyType = typeof(SetPropertyData), HasCustomStructSerialization = false, Creator = name => new SetPropertyData(name) };
+            registry["AssetObjectProperty"] = new RegistryEntry() { PropertyType = typeof(AssetObjectPropertyData), HasCustomStructSerialization = false, Creator = name => new AssetObjectPropertyData(name) };
+            registry["SoftObjectProperty"] = new RegistryEntry() { PropertyType = typeof(SoftObjectPropertyData), HasCustomStructSerialization = false, Creator = name => new SoftObjectPropertyData(name) };
+            registry["StrProperty"] = new RegistryEntry() { PropertyType = typeof(StrPropertyData), HasCustomStructSerialization = false, Creator = name => new StrPropertyData(name) };
+            registry["TextProperty"] = new RegistryEntry() { PropertyType = typeof(TextPropertyData), HasCustomStructSerialization = false, Creator = name => new TextPropertyData(name) };
+            registry["UInt16Property"] = new RegistryEntry() { PropertyType = typeof(UInt16PropertyData), HasCustomStructSerialization = false, Creator = name => new UInt16PropertyData(name) };
+            registry["UInt32Property"] = new RegistryEntry() { PropertyType = typeof(UInt32PropertyData), HasCustomStructSerialization = false, Creator = name => new UInt32PropertyData(name) };
+            registry["UInt64Property"] = new RegistryEntry() { PropertyType = typeof(UInt64PropertyData), HasCustomStructSerialization = false, Creator = name => new UInt64PropertyData(name) };
+            registry["UnknownProperty"] = new RegistryEntry() { PropertyType = typeof(UnknownPropertyData), HasCustomStructSerialization = false, Creator = name => new UnknownPropertyData(name) };
+        }
+    }
+}
@@ -64,9 +64,8 @@ namespace UAssetAPI.PropertyTypes.Objects
                 case "StructProperty":
                     FName strucType = null;
 
-                    if (reader.Asset.Mappings != null && reader.Asset.Mappings.Schemas.ContainsKey(parentName.Value.Value))
+                    if (reader.Asset.Mappings != null && reader.Asset.Mappings.TryGetSchema(parentName.Value.Value, out UsmapSchema relevantSchema))
                     {
-                        var relevantSchema = reader.Asset.Mappings.Schemas[parentName.Value.Value];
                         foreach (UsmapProperty prop in relevantSchema.Properties)
                         {
                             if (prop.Name == name.Value.Value && prop.PropertyData is UsmapMapData mapDat)
@@ -3,6 +3,7 @@ using System;
 using System.Collections;
 using System.Collections.Generic;
 using System.Globalization;
+using System.IO;
 using System.Linq;
 using System.Reflection;
 using UAssetAPI.PropertyTypes.Objects;
@@ -13,7 +14,33 @@ namespace UAssetAPI
 {
     public static class UAPUtils
     {
-        public static string CurrentCommit = string.Empty;
+        private static string currentCommit;
+
+        /// <summary>
+        /// The git commit that UAssetAPI was built from, or an empty string if that isn't known. This is read from the assembly's resources the first time it's needed.
+        /// </summary>
+        public static string CurrentCommit
+        {
+            get
+            {
+                if (currentCommit == null)
+                {
+                    using (Stream stream = typeof(UAPUtils).Assembly.GetManifestResourceStream("UAssetAPI.git_commit.txt"))
+                    {
+                        if (stream == null)
+                        {
+                            currentCommit = string.Empty;
+                        }
+                        else
+                        {
+                            using (StreamReader reader = new StreamReader(stream)) currentCommit = reader.ReadToEnd().Trim();
+                        }
+                    }
+                }
+                return currentCommit;
+            }
+            set => currentCommit = value;
+        }
         
         public static string SerializeJson(object obj, Formatting jsonFormatting = Formatting.None)
         {
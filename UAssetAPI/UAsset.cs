@@ -117,6 +117,32 @@ namespace UAssetAPI
         [JsonIgnore]
         public Usmap Mappings;
 
+        /// <summary>
+        /// An optional predicate which is given the class type of each export (see <see cref="Export.GetExportClassType"/>) while the asset is being read, and returns whether or not that export's data should be parsed right away.
+        /// <para />
+        /// Exports which are rejected are left unloaded, represented only by their entry in the export table, until they are requested with <see cref="LoadExport(int)"/> or <see cref="LoadAllExports"/>. This makes it cheap to pull a few exports (e.g. only Function and Class exports) out of a large asset. If null, every export is parsed.
+        /// </summary>
+        [JsonIgnore]
+        public Func<FName, bool> ExportLoadFilter = null;
+
+        /// <summary>
+        /// Should <see cref="PathToReader(string)"/> memory-map the asset files rather than copying them into memory? This avoids holding a private copy of large assets while they are parsed. The files are unmapped once every export has been read.
+        /// </summary>
+        [JsonIgnore]
+        public bool UseMemoryMappedInput = false;
+
+        /// <summary>
+        /// If set before the asset is read, it is filled in with how long each phase of <see cref="Read(AssetBinaryReader, int[], int[])"/> took and how many bytes it read, along with the same for each type of export. Leave this null to skip the bookkeeping.
+        /// </summary>
+        [JsonIgnore]
+        public AssetReadProfile Profile = null;
+
+        /// <summary>
+        /// An optional pool of name map strings to share with other assets. If set before the asset is read, each name map entry is replaced with the pool's copy of it, so that names common to many assets are only kept in memory once when lots of assets are loaded in one process.
+        /// </summary>
+        [JsonIgnore]
+        public NameInternPool NamePool = null;
+
         /// <summary>
         /// Should the asset be split into separate .uasset, .uexp, and .ubulk files, as opposed to one single .uasset file?
         /// </summary>
@@ -212,25 +238,109 @@ namespace UAssetAPI
         /// <returns>Whether or not the asset maintained binary equality.</returns>
         public bool VerifyBinaryEquality()
         {
-            MemoryStream f = this.PathToStream(FilePath);
-            f.Seek(0, SeekOrigin.Begin);
-            MemoryStream newDataStream = WriteData();
-            f.Seek(0, SeekOrigin.Begin);
+            return VerifyBinaryEqualityDetailed().Equal;
+        }
 
-            if (f.Length != newDataStream.Length) return false;
+        /// <summary>
+        /// The size of the blocks the original asset is read in by <see cref="VerifyBinaryEqualityDetailed"/>.
+        /// </summary>
+        private const int VerifyBlockSize = 1024 * 1024;
 
-            const int CHUNK_SIZE = 1024;
-            byte[] buffer = new byte[CHUNK_SIZE];
-            byte[] buffer2 = new byte[CHUNK_SIZE];
-            int lastRead1;
-            while ((lastRead1 = f.Read(buffer, 0, buffer.Length)) > 0)
+        /// <summary>
+        /// Checks whether or not this asset maintains binary equality when serialized, and if not, finds the first byte which differs and the export (or part of the package) it belongs to.
+        /// The original asset is streamed from disk a block at a time and compared against the serialized asset as it goes, so only the serialized copy is ever held in memory.
+        /// </summary>
+        /// <returns>The result of the comparison.</returns>
+        public BinaryEqualityResult VerifyBinaryEqualityDetailed()
+        {
+            // Serializing moves things around, so remember where everything was originally
+            long[] exportOffsets = new long[Exports.Count];
+            long[] exportSizes = new long[Exports.Count];
+            for (int i = 0; i < Exports.Count; i++)
+            {
+                exportOffsets[i] = Exports[i].SerialOffset;
+                exportSizes[i] = Exports[i].SerialSize;
+            }
+            KeyValuePair<string, long>[] sections =
+            {
+                new KeyValuePair<string, long>("Header", 0),
+                new KeyValuePair<string, long>("NameMap", NameOffset),
+                new KeyValuePair<string, long>("Imports", ImportOffset),
+                new KeyValuePair<string, long>("ExportMap", ExportOffset),
+                new KeyValuePair<string, long>("DependsMap", DependsOffset),
+                new KeyValuePair<string, long>("SoftPackageReferences", SoftPackageReferencesOffset),
+                new KeyValuePair<string, long>("AssetRegistryData", AssetRegistryDataOffset),
+                new KeyValuePair<string, long>("WorldTileInfo", WorldTileInfoDataOffset),
+                new KeyValuePair<string, long>("PreloadDependencies", PreloadDependencyOffset),
+            };
+
+            var result = new BinaryEqualityResult();
+            using (Stream original = PathToMemoryMappedStream(FilePath))
+            {
+                MemoryStream newDataStream = WriteData();
+                result.OriginalLength = original.Length;
+                result.SerializedLength = newDataStream.Length;
+                result.MismatchOffset = FindFirstMismatch(original, newDataStream.GetBuffer(), newDataStream.Length);
+            }
+            if (result.Equal) return result;
+
+            long exportsEnd = 0;
+            for (int i = 0; i < exportOffsets.Length; i++)
+            {
+                exportsEnd = Math.Max(exportsEnd, exportOffsets[i] + exportSizes[i]);
+                if (result.MismatchOffset >= exportOffsets[i] && result.MismatchOffset < exportOffsets[i] + exportSizes[i])
+                {
+                    result.MismatchExport = i;
+                    result.MismatchExportName = Exports[i].ObjectName?.ToString();
+                    result.MismatchExportOffset = result.MismatchOffset - exportOffsets[i];
+                    return result;
+                }
+            }
+
+            if (exportOffsets.Length > 0 && result.MismatchOffset >= exportsEnd)
             {
-                int lastRead2 = newDataStream.Read(buffer2, 0, buffer2.Length);
-                if (lastRead1 != lastRead2) return false;
-                if (!buffer.SequenceEqual(buffer2)) return false;
+                result.MismatchSection = "Trailer";
+                return result;
             }
+            long sectionStart = -1;
+            foreach (KeyValuePair<string, long> section in sections)
+            {
+                if ((section.Value > 0 || section.Key == "Header") && section.Value <= result.MismatchOffset && section.Value > sectionStart)
+                {
+                    result.MismatchSection = section.Key;
+                    sectionStart = section.Value;
+                }
+            }
+            return result;
+        }
 
-            return true;
+        /// <summary>
+        /// Reads through the given stream, returning the offset of the first byte which differs from the given data, or -1 if they are the same.
+        /// </summary>
+        private static long FindFirstMismatch(Stream original, byte[] data, long dataLength)
+        {
+            byte[] block = new byte[VerifyBlockSize];
+            long position = 0;
+            int read;
+            while ((read = original.Read(block, 0, block.Length)) > 0)
+            {
+                int count = (int)Math.Min(read, dataLength - position);
+                int i = 0;
+
+                // Compare eight bytes at a time until something differs, then find exactly which byte it was
+                for (; i <= count - 8; i += 8)
+                {
+                    if (BitConverter.ToUInt64(block, i) != BitConverter.ToUInt64(data, (int)(position + i))) break;
+                }
+                for (; i < count; i++)
+                {
+                    if (block[i] != data[position + i]) return position + i;
+                }
+
+                if (count < read) return position + count;
+                position += read;
+            }
+            return position < dataLength ? position : -1;
         }
 
         private void FixNameMapLookupIfNeeded()
@@ -468,8 +578,29 @@ namespace UAssetAPI
             return (T)(object)-1;
         }
 
-        private static ConcurrentDictionary<string, EngineVersion> cachedCustomVersionReflectionData = new ConcurrentDictionary<string, EngineVersion>();
+        /// <summary>
+        /// Guesses the value of a custom version for a specific Unreal version, based off of which members of the custom version enum were introduced in or before that version.
+        /// <para />
+        /// For the custom versions in <see cref="CustomVersion.GuidToCustomVersionStringMap"/>, the answer is looked up in a table generated ahead of time (see <see cref="CustomVersionTable"/>), so no reflection is needed. Any other enum falls back to <see cref="GuessCustomVersionFromIntroducedAttributes(EngineVersion, Type)"/>.
+        /// </summary>
+        /// <param name="chosenVersion">The version of the engine to check against.</param>
+        /// <param name="typ">The enum type of the custom version.</param>
+        /// <returns>The guessed custom version, or -1 if none of its members were introduced by <paramref name="chosenVersion"/>.</returns>
         public static int GuessCustomVersionFromTypeAndEngineVersion(EngineVersion chosenVersion, Type typ)
+        {
+            if (typ.Namespace == "UAssetAPI" && CustomVersionTable.TryGetGuessedVersion(typ.Name, chosenVersion, out int guessed)) return guessed;
+            return GuessCustomVersionFromIntroducedAttributes(chosenVersion, typ);
+        }
+
+        private static ConcurrentDictionary<string, EngineVersion> cachedCustomVersionReflectionData = new ConcurrentDictionary<string, EngineVersion>();
+
+        /// <summary>
+        /// Guesses the value of a custom version for a specific Unreal version by reflecting over the <see cref="IntroducedAttribute"/>s on the members of the custom version enum. <see cref="CustomVersionTable"/> is generated from this.
+        /// </summary>
+        /// <param name="chosenVersion">The version of the engine to check against.</param>
+        /// <param name="typ">The enum type of the custom version.</param>
+        /// <returns>The guessed custom version, or -1 if none of its members were introduced by <paramref name="chosenVersion"/>.</returns>
+        public static int GuessCustomVersionFromIntroducedAttributes(EngineVersion chosenVersion, Type typ)
         {
             string typeString = typ.ToString();
             string[] allVals = Enum.GetNames(typ);
@@ -505,9 +636,12 @@ namespace UAssetAPI
             List<CustomVersion> res = new List<CustomVersion>();
             foreach (KeyValuePair<Guid, string> entry in CustomVersion.GuidToCustomVersionStringMap)
             {
-                Type customVersionType = Type.GetType("UAssetAPI." + entry.Value);
-                if (customVersionType == null) continue;
-                int guessedCustomVersion = GuessCustomVersionFromTypeAndEngineVersion(chosenVersion, customVersionType);
+                if (!CustomVersionTable.TryGetGuessedVersion(entry.Value, chosenVersion, out int guessedCustomVersion))
+                {
+                    Type customVersionType = Type.GetType("UAssetAPI." + entry.Value);
+                    if (customVersionType == null) continue;
+                    guessedCustomVersion = GuessCustomVersionFromIntroducedAttributes(chosenVersion, customVersionType);
+                }
                 if (guessedCustomVersion < 0) continue;
                 res.Add(new CustomVersion(entry.Key, guessedCustomVersion));
             }
@@ -747,6 +881,31 @@ namespace UAssetAPI
         [JsonIgnore]
         public Dictionary<FString, uint> OverrideNameMapHashes;
 
+        /// <summary>Indices of the exports that were skipped by <see cref="ExportLoadFilter"/> and have not yet been loaded</summary>
+        private HashSet<int> unloadedExports = new HashSet<int>();
+
+        /// <summary>The reader used to read this asset, retained while any exports remain unloaded</summary>
+        private AssetBinaryReader lazyReader;
+
+        /// <summary>When the current <see cref="Profile"/> phase started, in <see cref="Stopwatch"/> ticks</summary>
+        private long profilePhaseStart;
+
+        /// <summary>The reader's position when the current <see cref="Profile"/> phase started</summary>
+        private long profilePhasePosition;
+
+        private void BeginProfilePhase(AssetBinaryReader reader)
+        {
+            if (Profile == null) return;
+            profilePhaseStart = Stopwatch.GetTimestamp();
+            profilePhasePosition = reader.BaseStream.Position;
+        }
+
+        private void EndProfilePhase(AssetBinaryReader reader, string name, long bytes = -1)
+        {
+            if (Profile == null) return;
+            Profile.AddPhase(name, Stopwatch.GetTimestamp() - profilePhaseStart, bytes >= 0 ? bytes : reader.BaseStream.Position - profilePhasePosition);
+        }
+
         /// <summary>This is called "TotalHeaderSize" in UE4 where header refers to the whole summary, whereas in UAssetAPI "header" refers to just the data before the start of the name map</summary>
         internal int SectionSixOffset = 0;
 
@@ -1058,14 +1217,37 @@ namespace UAssetAPI
         /// <exception cref="FormatException">Throw when the asset cannot be parsed correctly.</exception>
         public void Read(AssetBinaryReader reader, int[] manualSkips = null, int[] forceReads = null)
         {
+            try
+            {
+                ReadAsset(reader, manualSkips, forceReads);
+            }
+            catch
+            {
+                // Don't keep memory-mapped input (and the file handle behind it) open after a failed read
+                lazyReader = null;
+                if (reader.BaseStream is MemoryMappedAssetStream) reader.Dispose();
+                throw;
+            }
+        }
+
+        private void ReadAsset(AssetBinaryReader reader, int[] manualSkips, int[] forceReads)
+        {
+            long readStart = Stopwatch.GetTimestamp();
+            Profile?.Clear();
+
             reader.Asset = this;
             hasFoundParentClassExportName = false;
+            unloadedExports = new HashSet<int>();
+            lazyReader = null;
 
             // Header
+            BeginProfilePhase(reader);
             ReadHeader(reader);
+            EndProfilePhase(reader, "Header");
 
             // Name map
             reader.BaseStream.Seek(NameOffset, SeekOrigin.Begin);
+            BeginProfilePhase(reader);
 
             OverrideNameMapHashes = new Dictionary<FString, uint>();
             ClearNameIndexList();
@@ -1075,16 +1257,19 @@ namespace UAssetAPI
                 if (hashes == 0) OverrideNameMapHashes[nameInMap] = 0;
                 AddNameReference(nameInMap, true);
             }
+            EndProfilePhase(reader, "NameMap");
 
             // Imports
             Imports = new List<Import>();
             if (ImportOffset > 0)
             {
                 reader.BaseStream.Seek(ImportOffset, SeekOrigin.Begin);
+                BeginProfilePhase(reader);
                 for (int i = 0; i < ImportCount; i++)
                 {
                     Imports.Add(new Import(reader.ReadFName(), reader.ReadFName(), new FPackageIndex(reader.ReadInt32()), reader.ReadFName()));
                 }
+                EndProfilePhase(reader, "Imports");
             }
 
             // Export details
@@ -1092,6 +1277,7 @@ namespace UAssetAPI
             if (ExportOffset > 0)
             {
                 reader.BaseStream.Seek(ExportOffset, SeekOrigin.Begin);
+                BeginProfilePhase(reader);
                 for (int i = 0; i < ExportCount; i++)
                 {
                     var newExport = new Export(this, new byte[0]);
@@ -1138,6 +1324,7 @@ namespace UAssetAPI
 
                     Exports.Add(newExport);
                 }
+                EndProfilePhase(reader, "ExportMap");
             }
 
             // DependsMap
@@ -1145,6 +1332,7 @@ namespace UAssetAPI
             if (DependsOffset > 0)
             {
                 reader.BaseStream.Seek(DependsOffset, SeekOrigin.Begin);
+                BeginProfilePhase(reader);
                 for (int i = 0; i < ExportCount; i++)
                 {
                     int size = reader.ReadInt32();
@@ -1155,6 +1343,7 @@ namespace UAssetAPI
                     }
                     DependsMap.Add(data);
                 }
+                EndProfilePhase(reader, "DependsMap");
             }
             else
             {
@@ -1166,10 +1355,12 @@ namespace UAssetAPI
             if (SoftPackageReferencesOffset > 0)
             {
                 reader.BaseStream.Seek(SoftPackageReferencesOffset, SeekOrigin.Begin);
+                BeginProfilePhase(reader);
                 for (int i = 0; i < SoftPackageReferencesCount; i++)
                 {
                     SoftPackageReferenceList.Add(reader.ReadFString());
                 }
+                EndProfilePhase(reader, "SoftPackageReferences");
             }
             else
             {
@@ -1181,6 +1372,7 @@ namespace UAssetAPI
             if (AssetRegistryDataOffset > 0)
             {
                 reader.BaseStream.Seek(AssetRegistryDataOffset, SeekOrigin.Begin);
+                BeginProfilePhase(reader);
                 /*
                 int numAssets = reader.ReadInt32();
                 for (int i = 0; i < numAssets; i++)
@@ -1195,6 +1387,7 @@ namespace UAssetAPI
                 if (SectionSixOffset > 0 && Exports.Count > 0 && nextOffset <= 0) nextOffset = (int)Exports[0].SerialOffset;
                 if (nextOffset <= 0) nextOffset = (int)this.BulkDataStartOffset;
                 AssetRegistryData = reader.ReadBytes(nextOffset - AssetRegistryDataOffset);
+                EndProfilePhase(reader, "AssetRegistryData");
             }
             else
             {
@@ -1206,8 +1399,10 @@ namespace UAssetAPI
             if (WorldTileInfoDataOffset > 0)
             {
                 //reader.BaseStream.Seek(WorldTileInfoDataOffset, SeekOrigin.Begin);
+                BeginProfilePhase(reader);
                 WorldTileInfo = new FWorldTileInfo();
                 WorldTileInfo.Read(reader, this);
+                EndProfilePhase(reader, "WorldTileInfo");
             }
             else
             {
@@ -1217,6 +1412,8 @@ namespace UAssetAPI
             // PreloadDependencies
             if (this.UseSeparateBulkDataFiles)
             {
+                BeginProfilePhase(reader);
+                long preloadDependencyBytes = 0;
                 for (int i = 0; i < Exports.Count; i++)
                 {
                     reader.BaseStream.Seek(PreloadDependencyOffset, SeekOrigin.Begin);
@@ -1233,12 +1430,17 @@ namespace UAssetAPI
 
                     Exports[i].CreateBeforeCreateDependencies = new List<FPackageIndex>(Exports[i].CreateBeforeCreateDependenciesSize);
                     for (int j = 0; j < Exports[i].CreateBeforeCreateDependenciesSize; j++) Exports[i].CreateBeforeCreateDependencies.Add(FPackageIndex.FromRawIndex(reader.ReadInt32()));
+
+                    preloadDependencyBytes += sizeof(int) * (Exports[i].SerializationBeforeSerializationDependenciesSize + Exports[i].CreateBeforeSerializationDependenciesSize + Exports[i].SerializationBeforeCreateDependenciesSize + Exports[i].CreateBeforeCreateDependenciesSize);
                 }
+                EndProfilePhase(reader, "PreloadDependencies", preloadDependencyBytes);
             }
 
             // Export data
             if (SectionSixOffset > 0 && Exports.Count > 0)
             {
+                BeginProfilePhase(reader);
+                long exportDataBytes = 0;
                 for (int i = 0; i < Exports.Count; i++)
                 {
                     reader.BaseStream.Seek(Exports[i].SerialOffset, SeekOrigin.Begin);
@@ -1246,102 +1448,184 @@ namespace UAssetAPI
                     {
                         if (forceReads == null || !forceReads.Contains(i))
                         {
+                            long skipStart = Stopwatch.GetTimestamp();
                             Exports[i] = Exports[i].ConvertToChildExport<RawExport>();
                             ((RawExport)Exports[i]).Data = reader.ReadBytes((int)Exports[i].SerialSize);
+                            Profile?.AddExport(nameof(RawExport), Stopwatch.GetTimestamp() - skipStart, Exports[i].SerialSize, false);
+                            exportDataBytes += Exports[i].SerialSize;
                             continue;
                         }
                     }
 
-                    try
+                    if (ExportLoadFilter != null && !ExportLoadFilter(Exports[i].GetExportClassType()))
                     {
-                        long nextStarting = reader.BaseStream.Length - 4;
-                        if ((Exports.Count - 1) > i) nextStarting = Exports[i + 1].SerialOffset;
+                        unloadedExports.Add(i);
+                        continue;
+                    }
+
+                    ReadExportData(reader, i);
+                    exportDataBytes += Exports[i].SerialSize;
+                }
+                EndProfilePhase(reader, "ExportData", exportDataBytes);
+
+                if (unloadedExports.Count > 0) lazyReader = reader;
+            }
+
+            // Release memory-mapped input as soon as we're done with it
+            if (lazyReader == null && reader.BaseStream is MemoryMappedAssetStream) reader.Dispose();
+
+            if (Profile != null) Profile.Total = AssetReadProfile.TicksToTimeSpan(Stopwatch.GetTimestamp() - readStart);
+        }
+
+        /// <summary>
+        /// Reads the data of a single export. The reader should already be positioned at the start of the export's data. If the export cannot be parsed, it is read as a <see cref="RawExport"/> instead.
+        /// </summary>
+        /// <param name="reader">The reader to read the export from.</param>
+        /// <param name="i">The index of the export within <see cref="Exports"/>.</param>
+        private void ReadExportData(AssetBinaryReader reader, int i)
+        {
+            long exportStart = Profile != null ? Stopwatch.GetTimestamp() : 0;
+            bool failed = false;
+            try
+            {
+                long nextStarting = reader.BaseStream.Length - 4;
+                if ((Exports.Count - 1) > i) nextStarting = Exports[i + 1].SerialOffset;
 
-                        FName exportClassTypeName = Exports[i].GetExportClassType();
-                        string exportClassType = exportClassTypeName.Value.Value;
-                        switch (exportClassType)
+                FName exportClassTypeName = Exports[i].GetExportClassType();
+                string exportClassType = exportClassTypeName.Value.Value;
+                switch (exportClassType)
+                {
+                    case "Level":
+                        Exports[i] = Exports[i].ConvertToChildExport<LevelExport>();
+                        Exports[i].Read(reader, (int)nextStarting);
+                        break;
+                    case "Enum":
+                    case "UserDefinedEnum":
+                        Exports[i] = Exports[i].ConvertToChildExport<EnumExport>();
+                        Exports[i].Read(reader, (int)nextStarting);
+                        break;
+                    case "Function":
+                        Exports[i] = Exports[i].ConvertToChildExport<FunctionExport>();
+                        Exports[i].Read(reader, (int)nextStarting);
+                        break;
+                    default:
+                        if (exportClassType.EndsWith("DataTable"))
                         {
-                            case "Level":
-                                Exports[i] = Exports[i].ConvertToChildExport<LevelExport>();
-                                Exports[i].Read(reader, (int)nextStarting);
-                                break;
-                            case "Enum":
-                            case "UserDefinedEnum":
-                                Exports[i] = Exports[i].ConvertToChildExport<EnumExport>();
-                                Exports[i].Read(reader, (int)nextStarting);
-                                break;
-                            case "Function":
-                                Exports[i] = Exports[i].ConvertToChildExport<FunctionExport>();
-                                Exports[i].Read(reader, (int)nextStarting);
-                                break;
-                            default:
-                                if (exportClassType.EndsWith("DataTable"))
-                                {
-                                    Exports[i] = Exports[i].ConvertToChildExport<DataTableExport>();
-                                    Exports[i].Read(reader, (int)nextStarting);
-                                }
-                                else if (exportClassType.EndsWith("StringTable"))
-                                {
-                                    Exports[i] = Exports[i].ConvertToChildExport<StringTableExport>();
-                                    Exports[i].Read(reader, (int)nextStarting);
-                                }
-                                else if (exportClassType.EndsWith("BlueprintGeneratedClass"))
+                            Exports[i] = Exports[i].ConvertToChildExport<DataTableExport>();
+                            Exports[i].Read(reader, (int)nextStarting);
+                        }
+                        else if (exportClassType.EndsWith("StringTable"))
+                        {
+                            Exports[i] = Exports[i].ConvertToChildExport<StringTableExport>();
+                            Exports[i].Read(reader, (int)nextStarting);
+                        }
+                        else if (exportClassType.EndsWith("BlueprintGeneratedClass"))
+                        {
+                            var bgc = Exports[i].ConvertToChildExport<ClassExport>();
+                            Exports[i] = bgc;
+                            Exports[i].Read(reader, (int)nextStarting);
+
+                            // Check to see if we can add some new map type overrides
+                            if (bgc.LoadedProperties != null)
+                            {
+                                foreach (FProperty entry in bgc.LoadedProperties)
                                 {
-                                    var bgc = Exports[i].ConvertToChildExport<ClassExport>();
-                                    Exports[i] = bgc;
-                                    Exports[i].Read(reader, (int)nextStarting);
-
-                                    // Check to see if we can add some new map type overrides
-                                    if (bgc.LoadedProperties != null)
+                                    if (entry is FMapProperty fMapEntry)
                                     {
-                                        foreach (FProperty entry in bgc.LoadedProperties)
-                                        {
-                                            if (entry is FMapProperty fMapEntry)
-                                            {
-                                                FString keyOverride = null;
-                                                FString valueOverride = null;
-                                                if (fMapEntry.KeyProp is FStructProperty keyPropStruc && keyPropStruc.Struct.IsImport()) keyOverride = keyPropStruc.Struct.ToImport(this).ObjectName.Value;
-                                                if (fMapEntry.ValueProp is FStructProperty valuePropStruc && valuePropStruc.Struct.IsImport()) valueOverride = valuePropStruc.Struct.ToImport(this).ObjectName.Value;
-
-                                                this.MapStructTypeOverride.Add(fMapEntry.Name.Value.Value, new Tuple<FString, FString>(keyOverride, valueOverride));
-                                            }
-                                        }
+                                        FString keyOverride = null;
+                                        FString valueOverride = null;
+                                        if (fMapEntry.KeyProp is FStructProperty keyPropStruc && keyPropStruc.Struct.IsImport()) keyOverride = keyPropStruc.Struct.ToImport(this).ObjectName.Value;
+                                        if (fMapEntry.ValueProp is FStructProperty valuePropStruc && valuePropStruc.Struct.IsImport()) valueOverride = valuePropStruc.Struct.ToImport(this).ObjectName.Value;
+
+                                        this.MapStructTypeOverride.Add(fMapEntry.Name.Value.Value, new Tuple<FString, FString>(keyOverride, valueOverride));
                                     }
                                 }
-                                else if (MainSerializer.PropertyTypeRegistry.ContainsKey(exportClassType) || exportClassType == "ClassProperty")
-                                {
-                                    Exports[i] = Exports[i].ConvertToChildExport<PropertyExport>();
-                                    Exports[i].Read(reader, (int)nextStarting);
-                                }
-                                else
-                                {
-                                    Exports[i] = Exports[i].ConvertToChildExport<NormalExport>();
-                                    Exports[i].Read(reader, (int)nextStarting);
-                                }
-                                break;
+                            }
                         }
-
-                        long extrasLen = nextStarting - reader.BaseStream.Position;
-                        if (extrasLen < 0)
+                        else if (MainSerializer.PropertyTypeRegistry.ContainsKey(exportClassType) || exportClassType == "ClassProperty")
                         {
-                            throw new FormatException("Invalid padding at end of export " + (i + 1) + ": " + extrasLen + " bytes");
+                            Exports[i] = Exports[i].ConvertToChildExport<PropertyExport>();
+                            Exports[i].Read(reader, (int)nextStarting);
                         }
                         else
                         {
-                            Exports[i].Extras = reader.ReadBytes((int)extrasLen);
+                            Exports[i] = Exports[i].ConvertToChildExport<NormalExport>();
+                            Exports[i].Read(reader, (int)nextStarting);
                         }
-                    }
-                    catch (Exception ex)
-                    {
+                        break;
+                }
+
+                long extrasLen = nextStarting - reader.BaseStream.Position;
+                if (extrasLen < 0)
+                {
+                    throw new FormatException("Invalid padding at end of export " + (i + 1) + ": " + extrasLen + " bytes");
+                }
+                else
+                {
+                    Exports[i].Extras = reader.ReadBytes((int)extrasLen);
+                }
+            }
+            catch (Exception ex)
+            {
 #if DEBUG_VERBOSE
-                        Debug.WriteLine("\nFailed to parse export " + (i + 1) + ": " + ex.ToString());
+                Debug.WriteLine("\nFailed to parse export " + (i + 1) + ": " + ex.ToString());
 #endif
-                        reader.BaseStream.Seek(Exports[i].SerialOffset, SeekOrigin.Begin);
-                        Exports[i] = Exports[i].ConvertToChildExport<RawExport>();
-                        ((RawExport)Exports[i]).Data = reader.ReadBytes((int)Exports[i].SerialSize);
-                    }
+                reader.BaseStream.Seek(Exports[i].SerialOffset, SeekOrigin.Begin);
+                Exports[i] = Exports[i].ConvertToChildExport<RawExport>();
+                ((RawExport)Exports[i]).Data = reader.ReadBytes((int)Exports[i].SerialSize);
+                failed = true;
+            }
+
+            Profile?.AddExport(Exports[i].GetType().Name, Stopwatch.GetTimestamp() - exportStart, Exports[i].SerialSize, failed);
+        }
+
+        /// <summary>
+        /// Returns whether or not the data of a given export has been parsed. This is only ever false for exports which were skipped by <see cref="ExportLoadFilter"/>.
+        /// </summary>
+        /// <param name="index">The index of the export within <see cref="Exports"/>.</param>
+        /// <returns>Whether or not the export has been loaded.</returns>
+        public bool IsExportLoaded(int index)
+        {
+            return !unloadedExports.Contains(index);
+        }
+
+        /// <summary>
+        /// Parses the data of an export which was skipped by <see cref="ExportLoadFilter"/>. Does nothing if the export has already been loaded.
+        /// <para />
+        /// Because blueprint class exports can affect how other exports are parsed, any unloaded blueprint class exports will be loaded first.
+        /// </summary>
+        /// <param name="index">The index of the export within <see cref="Exports"/>.</param>
+        public void LoadExport(int index)
+        {
+            if (!unloadedExports.Contains(index)) return;
+
+            if (!Exports[index].GetExportClassType().Value.Value.EndsWith("BlueprintGeneratedClass"))
+            {
+                foreach (int otherIndex in unloadedExports.OrderBy(x => x).ToArray())
+                {
+                    if (Exports[otherIndex].GetExportClassType().Value.Value.EndsWith("BlueprintGeneratedClass")) LoadExport(otherIndex);
                 }
             }
+
+            unloadedExports.Remove(index);
+            lazyReader.BaseStream.Seek(Exports[index].SerialOffset, SeekOrigin.Begin);
+            ReadExportData(lazyReader, index);
+            if (unloadedExports.Count == 0)
+            {
+                if (lazyReader.BaseStream is MemoryMappedAssetStream) lazyReader.Dispose();
+                lazyReader = null;
+            }
+        }
+
+        /// <summary>
+        /// Parses the data of every export which was skipped by <see cref="ExportLoadFilter"/>.
+        /// </summary>
+        public void LoadAllExports()
+        {
+            foreach (int index in unloadedExports.OrderBy(x => x).ToArray())
+            {
+                LoadExport(index);
+            }
         }
 
         /// <summary>
@@ -1488,6 +1772,7 @@ namespace UAssetAPI
         /// <returns>A stream that the asset has been serialized to.</returns>
         public MemoryStream WriteData()
         {
+            LoadAllExports();
             isSerializationTime = true;
             var stre = new MemoryStream();
             try
@@ -1784,7 +2069,7 @@ namespace UAssetAPI
         /// <returns>A new MemoryStream that stores the binary data of the input file.</returns>
         public MemoryStream PathToStream(string p)
         {
-            using (FileStream origStream = File.Open(p, FileMode.Open))
+            using (FileStream origStream = File.Open(p, FileMode.Open, FileAccess.Read, FileShare.Read))
             {
                 MemoryStream completeStream = new MemoryStream();
                 origStream.CopyTo(completeStream);
@@ -1795,7 +2080,7 @@ namespace UAssetAPI
                     var targetFile = Path.ChangeExtension(p, "uexp");
                     if (File.Exists(targetFile))
                     {
-                        using (FileStream newStream = File.Open(targetFile, FileMode.Open))
+                        using (FileStream newStream = File.Open(targetFile, FileMode.Open, FileAccess.Read, FileShare.Read))
                         {
                             completeStream.Seek(0, SeekOrigin.End);
                             newStream.CopyTo(completeStream);
@@ -1810,6 +2095,18 @@ namespace UAssetAPI
             }
         }
 
+        /// <summary>
+        /// Creates a read-only stream from an asset path which memory-maps the asset, and its .uexp file if one exists, rather than copying them into memory.
+        /// </summary>
+        /// <param name="p">The path to the input file.</param>
+        /// <returns>A new MemoryMappedAssetStream that presents the binary data of the input file.</returns>
+        public MemoryMappedAssetStream PathToMemoryMappedStream(string p)
+        {
+            var targetFile = Path.ChangeExtension(p, "uexp");
+            UseSeparateBulkDataFiles = File.Exists(targetFile);
+            return UseSeparateBulkDataFiles ? new MemoryMappedAssetStream(p, targetFile) : new MemoryMappedAssetStream(p);
+        }
+
         /// <summary>
         /// Creates a BinaryReader from an asset path.
         /// </summary>
@@ -1817,7 +2114,7 @@ namespace UAssetAPI
         /// <returns>A new BinaryReader that stores the binary data of the input file.</returns>
         public AssetBinaryReader PathToReader(string p)
         {
-            return new AssetBinaryReader(PathToStream(p), this);
+            return new AssetBinaryReader(UseMemoryMappedInput ? (Stream)PathToMemoryMappedStream(p) : PathToStream(p), this);
         }
 
         /// <summary>
@@ -1878,6 +2175,7 @@ namespace UAssetAPI
         /// <returns>A serialized JSON string that represents the asset.</returns>
         public string SerializeJson(Formatting jsonFormatting = Formatting.None)
         {
+            LoadAllExports();
             Info = "Serialized with UAssetAPI " + typeof(PropertyData).Assembly.GetName().Version + (string.IsNullOrEmpty(UAPUtils.CurrentCommit) ? "" : (" (" + UAPUtils.CurrentCommit + ")"));
             return JsonConvert.SerializeObject(this, jsonFormatting, jsonSettings);
         }
@@ -218,20 +218,117 @@ namespace UAssetAPI.Unversioned
         /// </summary>
         internal UsmapVersion Version;
 
+        private List<string> nameMap;
+        private Dictionary<string, List<string>> enumMap;
+        private Dictionary<string, UsmapSchema> schemas;
+        private readonly object snapshotLock = new object();
+
+        /// <summary>
+        /// The snapshot this instance reads its mappings from, if it was opened from a snapshot file rather than a .usmap file. See <see cref="UsmapSnapshot"/>.
+        /// </summary>
+        public UsmapSnapshot Snapshot { get; private set; }
+
+        /// <summary>
+        /// .usmap name map. If this instance was opened from a snapshot, the whole name map is read in the first time this is accessed.
+        /// </summary>
+        public List<string> NameMap
+        {
+            get
+            {
+                if (nameMap == null && Snapshot != null)
+                {
+                    lock (snapshotLock)
+                    {
+                        if (nameMap == null) nameMap = Snapshot.ReadNameMap();
+                    }
+                }
+                return nameMap;
+            }
+            set
+            {
+                nameMap = value;
+            }
+        }
+
+        /// <summary>
+        /// .usmap enum map. If this instance was opened from a snapshot, every enum is read in the first time this is accessed; use <see cref="TryGetEnum"/> to look up enums one at a time instead.
+        /// </summary>
+        public Dictionary<string, List<string>> EnumMap
+        {
+            get
+            {
+                if (enumMap == null && Snapshot != null)
+                {
+                    lock (snapshotLock)
+                    {
+                        if (enumMap == null) enumMap = Snapshot.ReadEnumMap();
+                    }
+                }
+                return enumMap;
+            }
+            set
+            {
+                enumMap = value;
+            }
+        }
+
+        /// <summary>
+        /// .usmap schema map. If this instance was opened from a snapshot, every schema is read in the first time this is accessed; use <see cref="TryGetSchema"/> to look up schemas one at a time instead.
+        /// </summary>
+        public Dictionary<string, UsmapSchema> Schemas
+        {
+            get
+            {
+                if (schemas == null && Snapshot != null)
+                {
+                    lock (snapshotLock)
+                    {
+                        if (schemas == null) schemas = Snapshot.ReadSchemas();
+                    }
+                }
+                return schemas;
+            }
+            set
+            {
+                schemas = value;
+            }
+        }
+
         /// <summary>
-        /// .usmap name map
+        /// Looks up a schema by name. If this instance was opened from a snapshot, only the requested schema is read.
         /// </summary>
-        public List<string> NameMap;
+        /// <param name="name">The name of the schema to look up.</param>
+        /// <param name="schema">The schema, if one was found.</param>
+        /// <returns>Whether or not a schema with the given name exists.</returns>
+        public bool TryGetSchema(string name, out UsmapSchema schema)
+        {
+            if (schemas == null && Snapshot != null) return Snapshot.TryGetSchema(name, out schema);
+
+            schema = null;
+            return name != null && schemas != null && schemas.TryGetValue(name, out schema);
+        }
 
         /// <summary>
-        /// .usmap enum map
+        /// Looks up the values of an enum by name. If this instance was opened from a snapshot, only the requested enum is read.
         /// </summary>
-        public Dictionary<string, List<string>> EnumMap;
+        /// <param name="name">The name of the enum to look up.</param>
+        /// <param name="values">The enum's values, if it was found.</param>
+        /// <returns>Whether or not an enum with the given name exists.</returns>
+        public bool TryGetEnum(string name, out List<string> values)
+        {
+            if (enumMap == null && Snapshot != null) return Snapshot.TryGetEnum(name, out values);
+
+            values = null;
+            return name != null && enumMap != null && enumMap.TryGetValue(name, out values);
+        }
 
         /// <summary>
-        /// .usmap schema map
+        /// Returns the entry at the given index of the name map, without reading in the whole name map if this instance was opened from a snapshot.
         /// </summary>
-        public Dictionary<string, UsmapSchema> Schemas;
+        internal string GetName(int index)
+        {
+            return nameMap != null ? nameMap[index] : Snapshot.GetName(index);
+        }
 
         /// <summary>
         /// Creates a MemoryStream from an asset path.
@@ -333,69 +430,105 @@ namespace UAssetAPI.Unversioned
 
         public void Read(UsmapBinaryReader compressedReader)
         {
-            var reader = ReadHeader(compressedReader);
+            ReadData(ReadHeader(compressedReader), null);
+        }
+
+        /// <summary>
+        /// Reads the name map, enums and schemas, which follow the header. If <paramref name="layout"/> is given, where each entry was found is recorded in it, relative to where the reader started.
+        /// </summary>
+        internal void ReadData(UsmapBinaryReader reader, UsmapSnapshot.Layout layout)
+        {
+            long start = reader.BaseStream.Position;
 
             // part 1: names
-            //Console.WriteLine(reader.BaseStream.Position);
             NameMap = new List<string>();
             int numNames = reader.ReadInt32();
             for (int i = 0; i < numNames; i++)
             {
+                layout?.Names.Add(reader.BaseStream.Position - start);
                 NameMap.Add(reader.ReadString());
             }
 
             // part 2: enums
-            //Console.WriteLine(reader.BaseStream.Position);
             EnumMap = new Dictionary<string, List<string>>();
             int numEnums = reader.ReadInt32();
             for (int i = 0; i < numEnums; i++)
             {
-                string enumName = reader.ReadName();
-                EnumMap[enumName] = new List<string>();
-
-                byte numEnumEntries = reader.ReadByte();
-                for (int j = 0; j < numEnumEntries; j++)
-                {
-                    EnumMap[enumName].Add(reader.ReadName());
-                }
+                long recordStart = reader.BaseStream.Position;
+                string enumName = ReadEnum(reader, out List<string> values);
+                EnumMap[enumName] = values;
+                if (layout != null) layout.Enums[enumName] = new long[] { recordStart - start, reader.BaseStream.Position - recordStart };
             }
 
             // part 3: schema
-            //Console.WriteLine(reader.BaseStream.Position);
             Schemas = new Dictionary<string, UsmapSchema>();
             int numSchema = reader.ReadInt32();
             for (int i = 0; i < numSchema; i++)
             {
-                string schemaName = reader.ReadName();
-                string schemaSuperName = reader.ReadName();
-                ushort numProps = reader.ReadUInt16();
-                ushort serializablePropCount = reader.ReadUInt16();
-                List<UsmapProperty> props = new List<UsmapProperty>();
-                for (int j = 0; j < serializablePropCount; j++)
-                {
-                    ushort SchemaIdx = reader.ReadUInt16();
-                    byte ArraySize = reader.ReadByte();
-                    string Name = reader.ReadName();
+                long recordStart = reader.BaseStream.Position;
+                UsmapSchema schema = ReadSchema(reader);
+                Schemas.Add(schema.Name, schema);
+                layout?.Schemas.Add(schema.Name, new long[] { recordStart - start, reader.BaseStream.Position - recordStart });
+            }
 
-                    var currProp = new UsmapProperty(Name, SchemaIdx, ArraySize, null);
-                    currProp.PropertyData = DeserializePropData(reader);
-                    props.Add(currProp);
-                }
+            if (layout != null) layout.Length = reader.BaseStream.Position - start;
+        }
+
+        /// <summary>
+        /// Reads a single enum, returning its name.
+        /// </summary>
+        internal string ReadEnum(UsmapBinaryReader reader, out List<string> values)
+        {
+            string enumName = reader.ReadName();
+            values = new List<string>();
+
+            byte numEnumEntries = reader.ReadByte();
+            for (int j = 0; j < numEnumEntries; j++)
+            {
+                values.Add(reader.ReadName());
+            }
+            return enumName;
+        }
 
-                Schemas.Add(schemaName, new UsmapSchema(schemaName, schemaSuperName, numProps, props));
+        /// <summary>
+        /// Reads a single schema.
+        /// </summary>
+        internal UsmapSchema ReadSchema(UsmapBinaryReader reader)
+        {
+            string schemaName = reader.ReadName();
+            string schemaSuperName = reader.ReadName();
+            ushort numProps = reader.ReadUInt16();
+            ushort serializablePropCount = reader.ReadUInt16();
+            List<UsmapProperty> props = new List<UsmapProperty>();
+            for (int j = 0; j < serializablePropCount; j++)
+            {
+                ushort SchemaIdx = reader.ReadUInt16();
+                byte ArraySize = reader.ReadByte();
+                string Name = reader.ReadName();
+
+                var currProp = new UsmapProperty(Name, SchemaIdx, ArraySize, null);
+                currProp.PropertyData = DeserializePropData(reader);
+                props.Add(currProp);
             }
 
-            //Console.WriteLine(reader.BaseStream.Position);
+            return new UsmapSchema(schemaName, schemaSuperName, numProps, props);
         }
 
         /// <summary>
         /// Reads a .usmap file from disk and initializes a new instance of the <see cref="Usmap"/> class to store its data in memory.
+        /// If the file is a snapshot written by <see cref="UsmapSnapshot.Create"/>, it is memory-mapped instead, and names, enums and schemas are only read from it as they're needed.
         /// </summary>
         /// <param name="path">The path of the file file on disk that this instance will read from.</param>
         /// <exception cref="FormatException">Throw when the file cannot be parsed correctly.</exception>
         public Usmap(string path)
         {
             this.FilePath = path;
+            if (UsmapSnapshot.IsSnapshot(path))
+            {
+                Snapshot = new UsmapSnapshot(path, this);
+                Version = Snapshot.UsmapVersion;
+                return;
+            }
             Read(PathToReader(path));
         }
 
@@ -84,7 +84,7 @@ namespace UAssetAPI
         {
             int val = ReadInt32();
             if (val < 0) return null;
-            return File.NameMap[val];
+            return File.GetName(val);
         }
     }
 }
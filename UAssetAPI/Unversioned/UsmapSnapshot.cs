@@ -0,0 +1,360 @@
+﻿using System;
+using System.Collections.Concurrent;
+using System.Collections.Generic;
+using System.IO;
+using System.IO.MemoryMappedFiles;
+using System.Linq;
+using System.Text;
+using System.Threading;
+
+namespace UAssetAPI.Unversioned
+{
+    /// <summary>
+    /// A pre-decoded copy of a .usmap file which can be memory-mapped, so that names, enums and schemas can be looked up by name without parsing (or decompressing) the whole file first.
+    /// Several processes opening the same snapshot share its pages, rather than each building their own copy of every schema; only the schemas that are actually looked up are ever read.
+    /// Create one with <see cref="Create"/>, and open it by passing its path to <see cref="Usmap(string)"/>.
+    /// </summary>
+    /// <remarks>
+    /// A snapshot starts with a header of 32-bit little-endian integers: the magic bytes "USNP", the snapshot format version, the .usmap version, the name count and the offset of the name table, the enum count, bucket count and table offset, the schema count, bucket count and table offset, and the offset and length of the data.
+    /// The data is the decompressed contents of the .usmap after its header, exactly as they appear in the .usmap itself. The name table gives the offset of each name, and the enum and schema tables are open-addressed hash tables of names (hashed with FNV-1a over their characters), where each bucket holds the offset and length of an entry within the data, or zero if it's empty.
+    /// All offsets are from the start of the snapshot.
+    /// </remarks>
+    public class UsmapSnapshot : IDisposable
+    {
+        /// <summary>
+        /// Magic bytes at the start of every snapshot.
+        /// </summary>
+        public static readonly byte[] Magic = { (byte)'U', (byte)'S', (byte)'N', (byte)'P' };
+
+        /// <summary>
+        /// The version of the snapshot format written by this version of UAssetAPI.
+        /// </summary>
+        public const int FormatVersion = 1;
+
+        private const int HeaderSize = 64;
+        private const int BucketSize = 8;
+
+        /// <summary>
+        /// Where each entry was found while reading a .usmap, relative to the start of its data. Filled in by <see cref="Usmap.ReadData"/>.
+        /// </summary>
+        internal class Layout
+        {
+            public List<long> Names = new List<long>();
+            /// <summary>The offset and length of each enum, by name.</summary>
+            public Dictionary<string, long[]> Enums = new Dictionary<string, long[]>();
+            /// <summary>The offset and length of each schema, by name.</summary>
+            public Dictionary<string, long[]> Schemas = new Dictionary<string, long[]>();
+            public long Length;
+        }
+
+        private readonly Usmap usmap;
+        private readonly MemoryMappedFile file;
+        private readonly MemoryMappedViewAccessor view;
+
+        private readonly int nameCount;
+        private readonly long nameTableOffset;
+        private readonly int enumBucketCount;
+        private readonly long enumTableOffset;
+        private readonly int schemaBucketCount;
+        private readonly long schemaTableOffset;
+
+        private readonly string[] names;
+        private readonly bool[] namesRead;
+        private readonly ConcurrentDictionary<string, List<string>> enums = new ConcurrentDictionary<string, List<string>>();
+        private readonly ConcurrentDictionary<string, UsmapSchema> schemas = new ConcurrentDictionary<string, UsmapSchema>();
+
+        /// <summary>
+        /// The version of the .usmap file this snapshot was made from.
+        /// </summary>
+        public UsmapVersion UsmapVersion { get; }
+
+        /// <summary>
+        /// The number of enums in the snapshot.
+        /// </summary>
+        public int EnumCount { get; }
+
+        /// <summary>
+        /// The number of schemas in the snapshot.
+        /// </summary>
+        public int SchemaCount { get; }
+
+        /// <summary>
+        /// Returns whether or not the file at the given path is a snapshot, rather than a .usmap file.
+        /// </summary>
+        /// <param name="path">The path of the file to check.</param>
+        /// <returns>Whether or not the file is a snapshot.</returns>
+        public static bool IsSnapshot(string path)
+        {
+            byte[] start = new byte[Magic.Length];
+            using (FileStream stream = new FileStream(path, FileMode.Open, FileAccess.Read, FileShare.Read))
+            {
+                if (stream.Read(start, 0, start.Length) != start.Length) return false;
+            }
+            return start.SequenceEqual(Magic);
+        }
+
+        /// <summary>
+        /// Converts a .usmap file into a snapshot. This only needs to be done once for each .usmap file.
+        /// </summary>
+        /// <param name="usmapPath">The path of the .usmap file to convert.</param>
+        /// <param name="snapshotPath">The path to write the snapshot to.</param>
+        /// <exception cref="FormatException">Thrown when the .usmap file cannot be parsed correctly, or is too large to snapshot.</exception>
+        public static void Create(string usmapPath, string snapshotPath)
+        {
+            Usmap source = new Usmap();
+            source.FilePath = usmapPath;
+            UsmapBinaryReader reader = source.ReadHeader(source.PathToReader(usmapPath));
+            long dataStart = reader.BaseStream.Position;
+            Layout layout = new Layout();
+            source.ReadData(reader, layout);
+
+            byte[] data = new byte[layout.Length];
+            reader.BaseStream.Seek(dataStart, SeekOrigin.Begin);
+            if (reader.BaseStream.Read(data, 0, data.Length) != data.Length) throw new FormatException(".usmap: Unexpected end of file");
+
+            int enumBucketCount = GetBucketCount(layout.Enums.Count);
+            int schemaBucketCount = GetBucketCount(layout.Schemas.Count);
+            long nameTableOffset = HeaderSize + data.LongLength;
+            long enumTableOffset = nameTableOffset + 4L * layout.Names.Count;
+            long schemaTableOffset = enumTableOffset + (long)BucketSize * enumBucketCount;
+            if (schemaTableOffset + (long)BucketSize * schemaBucketCount > int.MaxValue) throw new FormatException(".usmap: File is too large to snapshot");
+
+            using (BinaryWriter writer = new BinaryWriter(new FileStream(snapshotPath, FileMode.Create, FileAccess.Write)))
+            {
+                writer.Write(Magic);
+                writer.Write(FormatVersion);
+                writer.Write((int)source.Version);
+                writer.Write(layout.Names.Count);
+                writer.Write((int)nameTableOffset);
+                writer.Write(layout.Enums.Count);
+                writer.Write(enumBucketCount);
+                writer.Write((int)enumTableOffset);
+                writer.Write(layout.Schemas.Count);
+                writer.Write(schemaBucketCount);
+                writer.Write((int)schemaTableOffset);
+                writer.Write(HeaderSize);
+                writer.Write(data.Length);
+                writer.Write(new byte[HeaderSize - writer.BaseStream.Position]);
+
+                writer.Write(data);
+                foreach (long nameOffset in layout.Names) writer.Write((int)(HeaderSize + nameOffset));
+                WriteTable(writer, layout.Enums, enumBucketCount);
+                WriteTable(writer, layout.Schemas, schemaBucketCount);
+            }
+        }
+
+        private static int GetBucketCount(int count)
+        {
+            // A power of two, at most half full
+            int buckets = 1;
+            while (buckets < count * 2) buckets <<= 1;
+            return buckets;
+        }
+
+        private static void WriteTable(BinaryWriter writer, Dictionary<string, long[]> entries, int bucketCount)
+        {
+            int[] offsets = new int[bucketCount];
+            int[] lengths = new int[bucketCount];
+            foreach (KeyValuePair<string, long[]> entry in entries)
+            {
+                int bucket = (int)(Hash(entry.Key) & (uint)(bucketCount - 1));
+                while (offsets[bucket] != 0) bucket = (bucket + 1) & (bucketCount - 1);
+                offsets[bucket] = (int)(HeaderSize + entry.Value[0]);
+                lengths[bucket] = (int)entry.Value[1];
+            }
+            for (int i = 0; i < bucketCount; i++)
+            {
+                writer.Write(offsets[i]);
+                writer.Write(lengths[i]);
+            }
+        }
+
+        private static uint Hash(string name)
+        {
+            uint hash = 2166136261;
+            foreach (char c in name)
+            {
+                hash = (hash ^ c) * 16777619;
+            }
+            return hash;
+        }
+
+        /// <summary>
+        /// Memory-maps the snapshot at the given path, for the given <see cref="Usmap"/> to read from.
+        /// </summary>
+        internal UsmapSnapshot(string path, Usmap usmap)
+        {
+            this.usmap = usmap;
+            var fileStream = new FileStream(path, FileMode.Open, FileAccess.Read, FileShare.Read);
+            try
+            {
+                file = MemoryMappedFile.CreateFromFile(fileStream, null, 0, MemoryMappedFileAccess.Read, HandleInheritability.None, false);
+                view = file.CreateViewAccessor(0, 0, MemoryMappedFileAccess.Read);
+            }
+            catch
+            {
+                file?.Dispose();
+                fileStream.Dispose();
+                throw;
+            }
+
+            int formatVersion = view.ReadInt32(4);
+            if (formatVersion != FormatVersion)
+            {
+                Dispose();
+                throw new FormatException(".usmap: Snapshot format version " + formatVersion + " is unsupported");
+            }
+            UsmapVersion = (UsmapVersion)view.ReadInt32(8);
+            nameCount = view.ReadInt32(12);
+            nameTableOffset = view.ReadInt32(16);
+            EnumCount = view.ReadInt32(20);
+            enumBucketCount = view.ReadInt32(24);
+            enumTableOffset = view.ReadInt32(28);
+            SchemaCount = view.ReadInt32(32);
+            schemaBucketCount = view.ReadInt32(36);
+            schemaTableOffset = view.ReadInt32(40);
+
+            names = new string[nameCount];
+            namesRead = new bool[nameCount];
+        }
+
+        /// <summary>
+        /// Returns the entry at the given index of the name map, reading it in if it hasn't been already.
+        /// </summary>
+        internal string GetName(int index)
+        {
+            if (Volatile.Read(ref namesRead[index])) return names[index];
+
+            long offset = view.ReadInt32(nameTableOffset + 4L * index);
+            int length = view.ReadByte(offset);
+            string name = null;
+            if (length > 0)
+            {
+                byte[] data = new byte[length];
+                view.ReadArray(offset + 1, data, 0, length);
+                name = Encoding.ASCII.GetString(data);
+            }
+            names[index] = name;
+            Volatile.Write(ref namesRead[index], true);
+            return name;
+        }
+
+        /// <summary>
+        /// Looks up a schema by name, reading it in if it hasn't been already.
+        /// </summary>
+        /// <param name="name">The name of the schema to look up.</param>
+        /// <param name="schema">The schema, if one was found.</param>
+        /// <returns>Whether or not a schema with the given name exists.</returns>
+        public bool TryGetSchema(string name, out UsmapSchema schema)
+        {
+            schema = null;
+            if (name == null) return false;
+            if (schemas.TryGetValue(name, out schema)) return true;
+
+            UsmapBinaryReader reader = FindEntry(name, schemaTableOffset, schemaBucketCount);
+            if (reader == null) return false;
+            schema = schemas.GetOrAdd(name, usmap.ReadSchema(reader));
+            return true;
+        }
+
+        /// <summary>
+        /// Looks up the values of an enum by name, reading it in if it hasn't been already.
+        /// </summary>
+        /// <param name="name">The name of the enum to look up.</param>
+        /// <param name="values">The enum's values, if it was found.</param>
+        /// <returns>Whether or not an enum with the given name exists.</returns>
+        public bool TryGetEnum(string name, out List<string> values)
+        {
+            values = null;
+            if (name == null) return false;
+            if (enums.TryGetValue(name, out values)) return true;
+
+            UsmapBinaryReader reader = FindEntry(name, enumTableOffset, enumBucketCount);
+            if (reader == null) return false;
+            usmap.ReadEnum(reader, out values);
+            values = enums.GetOrAdd(name, values);
+            return true;
+        }
+
+        /// <summary>
+        /// Finds the entry with the given name in one of the hash tables, returning a reader over a copy of it, or null if there is no such entry.
+        /// </summary>
+        private UsmapBinaryReader FindEntry(string name, long tableOffset, int bucketCount)
+        {
+            int bucket = (int)(Hash(name) & (uint)(bucketCount - 1));
+            while (true)
+            {
+                long bucketOffset = tableOffset + (long)BucketSize * bucket;
+                int offset = view.ReadInt32(bucketOffset);
+                if (offset == 0) return null;
+
+                // Both enums and schemas start with the index of their name
+                if (GetName(view.ReadInt32(offset)) == name)
+                {
+                    byte[] data = new byte[view.ReadInt32(bucketOffset + 4)];
+                    view.ReadArray(offset, data, 0, data.Length);
+                    return new UsmapBinaryReader(new MemoryStream(data), usmap);
+                }
+                bucket = (bucket + 1) & (bucketCount - 1);
+            }
+        }
+
+        private IEnumerable<UsmapBinaryReader> AllEntries(long tableOffset, int bucketCount)
+        {
+            for (int bucket = 0; bucket < bucketCount; bucket++)
+            {
+                long bucketOffset = tableOffset + (long)BucketSize * bucket;
+                int offset = view.ReadInt32(bucketOffset);
+                if (offset == 0) continue;
+
+                byte[] data = new byte[view.ReadInt32(bucketOffset + 4)];
+                view.ReadArray(offset, data, 0, data.Length);
+                yield return new UsmapBinaryReader(new MemoryStream(data), usmap);
+            }
+        }
+
+        /// <summary>
+        /// Reads in the whole name map.
+        /// </summary>
+        internal List<string> ReadNameMap()
+        {
+            var nameMap = new List<string>(nameCount);
+            for (int i = 0; i < nameCount; i++) nameMap.Add(GetName(i));
+            return nameMap;
+        }
+
+        /// <summary>
+        /// Reads in every enum.
+        /// </summary>
+        internal Dictionary<string, List<string>> ReadEnumMap()
+        {
+            var enumMap = new Dictionary<string, List<string>>();
+            foreach (UsmapBinaryReader reader in AllEntries(enumTableOffset, enumBucketCount))
+            {
+                string name = usmap.ReadEnum(reader, out List<string> values);
+                enumMap[name] = enums.GetOrAdd(name, values);
+            }
+            return enumMap;
+        }
+
+        /// <summary>
+        /// Reads in every schema.
+        /// </summary>
+        internal Dictionary<string, UsmapSchema> ReadSchemas()
+        {
+            var schemaMap = new Dictionary<string, UsmapSchema>();
+            foreach (UsmapBinaryReader reader in AllEntries(schemaTableOffset, schemaBucketCount))
+            {
+                UsmapSchema schema = usmap.ReadSchema(reader);
+                schemaMap[schema.Name] = schemas.GetOrAdd(schema.Name, schema);
+            }
+            return schemaMap;
+        }
+
+        public void Dispose()
+        {
+            view?.Dispose();
+            file?.Dispose();
+        }
+    }
+}
@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+# vim: set expandtab tabstop=4 shiftwidth=4:
+
+# Copyright 2022 Christopher J Kucera
+# <cj@apocalyptech.com>
+# <https://apocalyptech.com/contact.php>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import subprocess
+import importlib.util
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows; we just won't report memory use there
+    resource = None
+
+# Our sibling scripts have dashes in their names, so they need to be
+# imported by hand.
+def _load_sibling(name, filename):
+    my_dir = os.path.dirname(os.path.realpath(__file__))
+    spec = importlib.util.spec_from_file_location(name, os.path.join(my_dir, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+serialize_ubergraph = _load_sibling('serialize_ubergraph', 'serialize-ubergraph.py')
+bytecode_to_dot = _load_sibling('bytecode_to_dot', 'bytecode-to-dot.py')
+
+# Stages which can only happen once per process, so each trial gets a fresh
+# one.  These are timed for the first object in the corpus.
+cold_stages = ['clr_load', 'add_reference', 'first_uasset', 'to_first_uasset']
+
+# Stages which are timed in-process, once per trial, summed over every
+# object in the corpus.
+warm_stages = ['uasset', 'serialize', 'interop_string', 'json_load', 'script', 'to_dotfile']
+
+stage_descriptions = {
+        'clr_load': 'Starting the CLR (`import clr`)',
+        'add_reference': 'clr.AddReference() on UAssetAPI.dll',
+        'first_uasset': 'First UAsset load in a fresh process',
+        'to_first_uasset': 'Total cold-start time, from starting the CLR to the first parsed UAsset',
+        'uasset': 'UAsset loads (as serialize-ubergraph.py does them)',
+        'serialize': 'KismetScriptBatch.Serialize() on every export',
+        'interop_string': 'Batched serializations and raw bytecode brought into Python',
+        'json_load': 'json.loads() on those strings',
+        'script': 'bytecode-to-dot Script construction',
+        'to_dotfile': 'bytecode-to-dot Script.to_dotfile()',
+        }
+
+def default_corpus():
+    """
+    Returns the default list of `(filename, engine_version)` tuples to
+    benchmark: the objects in UAssetAPI.Benchmark's TestAssets (using the
+    versions listed in its `_asset_versions.json`), plus the Astroneer
+    objects from the unit tests.
+    """
+    my_dir = os.path.dirname(os.path.realpath(__file__))
+    corpus = []
+    bench_dir = os.path.join(my_dir, '..', 'UAssetAPI.Benchmark', 'TestAssets')
+    versions_filename = os.path.join(bench_dir, '_asset_versions.json')
+    if os.path.exists(versions_filename):
+        with open(versions_filename, encoding='utf-8-sig') as df:
+            versions = json.load(df)
+        for filename in serialize_ubergraph.find_objects([bench_dir]):
+            base = os.path.splitext(os.path.basename(filename))[0]
+            if base in versions:
+                corpus.append((filename, versions[base]))
+    astroneer_dir = os.path.join(my_dir, '..', 'UAssetAPI.Tests', 'TestAssets', 'TestManyAssets', 'Astroneer')
+    if os.path.isdir(astroneer_dir):
+        for filename in serialize_ubergraph.find_objects([astroneer_dir]):
+            corpus.append((filename, 'VER_UE4_23'))
+    return [(os.path.normpath(filename), version) for filename, version in corpus]
+
+def peak_rss_kb():
+    """
+    Returns the peak resident set size of this process in KB, or `None` if
+    that's not available on this platform.
+    """
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes; everything else reports KB
+    if sys.platform == 'darwin':
+        rss //= 1024
+    return rss
+
+def percentile(values, pct):
+    """
+    Returns the given percentile of `values`, using the nearest-rank method.
+    """
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered)*pct // 100))
+    return ordered[int(rank)-1]
+
+def summarize(samples):
+    """
+    Returns min/median/p95 (in milliseconds) for the given list of timings
+    (in seconds).
+    """
+    return {
+            'count': len(samples),
+            'min': min(samples)*1000,
+            'median': percentile(samples, 50)*1000,
+            'p95': percentile(samples, 95)*1000,
+            }
+
+def run_cold_child(filename, engine_version):
+    """
+    Times the cold-start stages in this (fresh) process, and prints them
+    out as JSON for the parent to collect.
+    """
+    timings = {}
+    dir_name = serialize_ubergraph.find_uassetapi_dir()
+    if dir_name is None:
+        raise RuntimeError('Could not find UAssetAPI.dll')
+
+    cold_start = time.perf_counter()
+    start = cold_start
+    import clr
+    timings['clr_load'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    clr.AddReference(os.path.join(dir_name, 'UAssetAPI'))
+    import UAssetAPI
+    timings['add_reference'] = time.perf_counter() - start
+
+    # Hand the already-loaded namespace over, so this doesn't count loading
+    # the DLL again
+    serialize_ubergraph.UAssetAPI = UAssetAPI
+    start = time.perf_counter()
+    serialize_ubergraph.load_asset(filename, engine_version)
+    timings['first_uasset'] = time.perf_counter() - start
+    timings['to_first_uasset'] = time.perf_counter() - cold_start
+
+    print(json.dumps({'timings': timings, 'peak_rss_kb': peak_rss_kb()}))
+
+def bench_cold(corpus, trials):
+    """
+    Runs the cold-start stages in `trials` fresh processes.  Returns a dict
+    of stage samples, and the peak RSS of the largest child.
+    """
+    filename, engine_version = corpus[0]
+    samples = {stage: [] for stage in cold_stages}
+    peak = None
+    for _ in range(trials):
+        result = subprocess.run([sys.executable, os.path.realpath(__file__),
+                '--cold-child', filename, engine_version,
+                ], stdout=subprocess.PIPE, check=True, encoding='utf-8')
+        data = json.loads(result.stdout.strip().splitlines()[-1])
+        for stage in cold_stages:
+            samples[stage].append(data['timings'][stage])
+        if data['peak_rss_kb'] is not None:
+            peak = max(peak or 0, data['peak_rss_kb'])
+    return samples, peak
+
+def bench_warm_trial(corpus, tmp_dir, samples):
+    """
+    Runs every warm stage over the whole corpus once, adding the total time
+    for each stage to `samples`.
+    """
+    UAssetAPI = serialize_ubergraph.load_uassetapi()
+    totals = {stage: 0 for stage in warm_stages}
+    json_filename = os.path.join(tmp_dir, 'bench.json')
+    dot_filename = os.path.join(tmp_dir, 'bench.dot')
+    for filename, engine_version in corpus:
+        start = time.perf_counter()
+        ass = serialize_ubergraph.load_asset(filename, engine_version)
+        totals['uasset'] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        batch = UAssetAPI.Kismet.KismetScriptBatch.Serialize(UAssetAPI.Kismet.KismetSerializerContext(ass))
+        totals['serialize'] += time.perf_counter() - start
+
+        # Same conversions as serialize_ubergraph.get_script_batch()
+        start = time.perf_counter()
+        json.loads(str(batch.Manifest))
+        serialized = str(batch.Scripts).split('\0') if batch.Count else []
+        serialize_ubergraph.net_bytes(batch.Raw)
+        totals['interop_string'] += time.perf_counter() - start
+
+        for text in serialized:
+            start = time.perf_counter()
+            json.loads(text)
+            totals['json_load'] += time.perf_counter() - start
+
+            with open(json_filename, 'w', encoding='utf-8') as odf:
+                odf.write(text)
+            start = time.perf_counter()
+            script = bytecode_to_dot.Script(json_filename)
+            totals['script'] += time.perf_counter() - start
+
+            start = time.perf_counter()
+            script.to_dotfile(dot_filename)
+            totals['to_dotfile'] += time.perf_counter() - start
+
+    for stage, total in totals.items():
+        samples[stage].append(total)
+
+def bench_warm(corpus, trials, warmup=1):
+    """
+    Runs the warm stages `trials` times (after `warmup` untimed runs).
+    Returns a dict of stage samples, and the peak RSS of this process.
+    """
+    samples = {stage: [] for stage in warm_stages}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for _ in range(warmup):
+            bench_warm_trial(corpus, tmp_dir, {stage: [] for stage in warm_stages})
+        for _ in range(trials):
+            bench_warm_trial(corpus, tmp_dir, samples)
+    return samples, peak_rss_kb()
+
+def compare(results, baseline, threshold):
+    """
+    Compares our results against a baseline, printing out how each stage
+    changed.  Returns a list of the stages (and memory figures) which got
+    more than `threshold` percent worse.
+    """
+    regressions = []
+    print('')
+    print(f'Compared to baseline (regression threshold: {threshold:g}%):')
+    for stage, stats in results['stages'].items():
+        if stage not in baseline.get('stages', {}):
+            continue
+        before = baseline['stages'][stage]['median']
+        after = stats['median']
+        change = (after - before) / before * 100 if before else 0
+        flag = ''
+        if change > threshold:
+            flag = '  <-- REGRESSION'
+            regressions.append(stage)
+        print(f'  {stage:16} {before:10.2f} -> {after:10.2f} ms  ({change:+.1f}%){flag}')
+    for key, after in results['peak_rss_kb'].items():
+        before = baseline.get('peak_rss_kb', {}).get(key)
+        if before is None or after is None:
+            continue
+        change = (after - before) / before * 100 if before else 0
+        flag = ''
+        if change > threshold:
+            flag = '  <-- REGRESSION'
+            regressions.append(f'peak_rss_kb.{key}')
+        print(f'  {"rss (" + key + ")":16} {before:10} -> {after:10} KB  ({change:+.1f}%){flag}')
+    return regressions
+
+def main():
+
+    parser = argparse.ArgumentParser(
+            description='Benchmark each stage of the scripts pipeline, from loading the CLR to writing dotfiles',
+            epilog='Stages: ' + '; '.join(f'{stage}: {desc}' for stage, desc in stage_descriptions.items()),
+            )
+
+    parser.add_argument('-t', '--trials',
+            type=int,
+            default=10,
+            help='Number of timed runs of each stage (default: %(default)s)',
+            )
+
+    parser.add_argument('-c', '--cold-trials',
+            type=int,
+            help='Number of fresh processes to time the cold-start stages in (defaults to --trials)',
+            )
+
+    parser.add_argument('-e', '--engine-version',
+            type=str,
+            default=serialize_ubergraph.default_engine_version,
+            help=f'UAssetAPI EngineVersion to use for objects given on the commandline (defaults to {serialize_ubergraph.default_engine_version})',
+            )
+
+    parser.add_argument('-o', '--output',
+            type=str,
+            help='Save the results to this file, as JSON, for later use with --baseline',
+            )
+
+    parser.add_argument('-b', '--baseline',
+            type=str,
+            help='Compare the results against a file saved with --output, exiting with an error if any stage regressed',
+            )
+
+    parser.add_argument('--threshold',
+            type=float,
+            default=10,
+            help='Percentage by which a median time (or peak RSS) has to grow to count as a regression (default: %(default)s)',
+            )
+
+    parser.add_argument('--cold-child',
+            nargs=2,
+            metavar=('FILENAME', 'ENGINE_VERSION'),
+            help=argparse.SUPPRESS,
+            )
+
+    parser.add_argument('filename',
+            nargs='*',
+            help='Objects to benchmark, instead of the test assets in the git tree.  Directories (searched recursively) and glob patterns may also be given.',
+            )
+
+    args = parser.parse_args()
+    serialize_ubergraph.announce_dll_load = False
+
+    if args.cold_child:
+        run_cold_child(*args.cold_child)
+        return
+
+    if args.filename:
+        corpus = [(filename, args.engine_version) for filename in serialize_ubergraph.find_objects(args.filename)]
+    else:
+        corpus = default_corpus()
+    if not corpus:
+        raise RuntimeError('No objects found to benchmark')
+    if args.trials < 1:
+        raise RuntimeError('Need at least one trial')
+    cold_trials = args.cold_trials if args.cold_trials is not None else args.trials
+
+    print(f'Benchmarking {len(corpus)} object{"s" if len(corpus) != 1 else ""}:')
+    for filename, engine_version in corpus:
+        print(f' - {filename} ({engine_version})')
+    print('')
+
+    samples = {}
+    rss = {}
+    if cold_trials > 0:
+        cold_samples, rss['cold'] = bench_cold(corpus, cold_trials)
+        samples.update(cold_samples)
+    warm_samples, rss['warm'] = bench_warm(corpus, args.trials)
+    samples.update(warm_samples)
+
+    # Objects are recorded relative to the top of the git tree, so that
+    # baselines can be compared no matter where we're run from
+    top_dir = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..')
+    results = {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'corpus': [[os.path.relpath(filename, top_dir), version] for filename, version in corpus],
+            'trials': args.trials,
+            'cold_trials': cold_trials,
+            'stages': {stage: summarize(stage_samples) for stage, stage_samples in samples.items()},
+            'peak_rss_kb': rss,
+            }
+
+    print(f'{"stage":16} {"min":>10} {"median":>10} {"p95":>10}  (ms)')
+    for stage, stats in results['stages'].items():
+        print(f'{stage:16} {stats["min"]:10.2f} {stats["median"]:10.2f} {stats["p95"]:10.2f}')
+    print('')
+    for key, value in rss.items():
+        print(f'Peak RSS ({key}): {value if value is not None else "(unavailable)"}{" KB" if value is not None else ""}')
+
+    if args.output:
+        with open(args.output, 'w') as odf:
+            json.dump(results, odf, indent=2)
+        print(f'Results saved to: {args.output}')
+
+    if args.baseline:
+        with open(args.baseline) as df:
+            baseline = json.load(df)
+        if baseline.get('corpus') != results['corpus']:
+            print('WARNING: Baseline was run over a different set of objects')
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
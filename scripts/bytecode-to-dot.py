@@ -25,13 +25,27 @@
 
 import os
 import sys
+import glob
 import json
+import time
+import shutil
+import tempfile
 import argparse
 import subprocess
+import concurrent.futures
+
+import kismetbin
 
 
 class Statement:
 
+    # Statements (and their subclasses) use slots, and don't keep hold of the
+    # data they were built from, to keep memory use down on large scripts.
+    __slots__ = (
+            'level', 'prefix', 'type', 'index', 'dot_name',
+            'link_to_next', 'next', 'shape', 'color', 'fillcolor', 'styles',
+            )
+
     shape_margins = {
             'larrow': '0.15,0.15',
             'rarrow': '0.15,0.15',
@@ -40,7 +54,6 @@ class Statement:
             }
 
     def __init__(self, data, level=0):
-        self.data = data
         self.level = level
         self.prefix = '    '*self.level
         self.type = data['Inst']
@@ -66,24 +79,29 @@ class Statement:
     def _dot_label(self):
         return [f'{self.prefix}{self.inline_label()}']
 
-    def dot_label(self):
+    def dot_label(self, max_lines=None):
         lines = []
         lines.append('&lt;{}&gt; <b>{}</b>'.format(
             self.index,
             self.type,
             ))
-        lines.extend(self._dot_label())
+        body = self._dot_label()
+        if max_lines is not None and len(body) > max_lines:
+            hidden = len(body) - max_lines
+            body = body[:max_lines]
+            body.append(f'<i>... ({hidden} more line{"s" if hidden != 1 else ""})</i>')
+        lines.extend(body)
         # Need a final <br> at the end so the last line is left-justified
         lines.append('')
         return '<br align="left"/>'.join(lines)
 
-    def dot_node(self):
+    def dot_node(self, max_lines=None):
         margin = '0.11,0.055'
         if self.shape in self.shape_margins:
             margin = self.shape_margins[self.shape]
         return '{} [label=<{}> shape={} color={} fillcolor={} style="{}" margin="{}"];'.format(
                 self.dot_name,
-                self.dot_label(),
+                self.dot_label(max_lines),
                 self.shape,
                 self.color,
                 self.fillcolor,
@@ -94,19 +112,59 @@ class Statement:
     def _dot_links(self):
         return []
 
-    def dot_links(self):
+    def link_targets(self):
+        """
+        Returns the statement indexes which this statement can branch to (not
+        including simply carrying on to the next statement).
+        """
+        targets = []
+        for link in self._dot_links():
+            if type(link) == tuple:
+                targets.append(link[0])
+            else:
+                targets.append(link)
+        return targets
+
+    def dot_links(self, include=None):
+        """
+        Returns our links as dot statements.  If `include` is passed, only
+        links to statement indexes in that set will be returned.
+        """
         links = []
         if self.link_to_next and self.next:
-            links.append(f'{self.dot_name} -> {self.next.dot_name} [weight=2];')
+            if include is None or self.next.index in include:
+                links.append(f'{self.dot_name} -> {self.next.dot_name} [weight=2];')
         for link in self._dot_links():
             if type(link) == tuple:
                 link_num, link_attrs = link
                 dest = f's{link_num} [{link_attrs}]'
             else:
+                link_num = link
                 dest = f's{link}'
-            links.append(f'{self.dot_name} -> {dest};')
+            if include is None or link_num in include:
+                links.append(f'{self.dot_name} -> {dest};')
         return links
 
+    def children(self):
+        """
+        Returns the expressions nested directly inside this statement.
+        """
+        children = []
+        for cls in reversed(type(self).__mro__):
+            for slot in cls.__dict__.get('__slots__', ()):
+                if slot != 'next':
+                    _collect_statements(getattr(self, slot, None), children)
+        return children
+
+    def walk(self):
+        """
+        Yields this statement followed by every expression nested inside it,
+        depth-first.
+        """
+        yield self
+        for child in self.children():
+            yield from child.walk()
+
     @staticmethod
     def from_data(statement, level=0):
         global statement_types
@@ -118,8 +176,28 @@ class Statement:
             return Statement(statement, level)
 
 
+def _collect_statements(value, found):
+    """
+    Appends any statements contained in `value` (which may be a statement
+    itself, or a list/dict/SwitchCase holding them) to `found`.
+    """
+    if isinstance(value, Statement):
+        found.append(value)
+    elif isinstance(value, SwitchCase):
+        found.append(value.key)
+        found.append(value.value)
+    elif isinstance(value, list):
+        for item in value:
+            _collect_statements(item, found)
+    elif isinstance(value, dict):
+        for item in value.values():
+            _collect_statements(item, found)
+
+
 class _HardValue(Statement):
 
+    __slots__ = ('value',)
+
     def __init__(self, data, value, level=0):
         super().__init__(data, level)
         self.value = value
@@ -130,24 +208,32 @@ class _HardValue(Statement):
 
 class NoObject(_HardValue):
 
+    __slots__ = ()
+
     def __init__(self, data, level=0):
         super().__init__(data, 'None', level)
 
 
 class Nothing(_HardValue):
 
+    __slots__ = ()
+
     def __init__(self, data, level=0):
         super().__init__(data, 'Nothing', level)
 
 
 class Self(_HardValue):
 
+    __slots__ = ()
+
     def __init__(self, data, level=0):
         super().__init__(data, 'Self', level)
 
 
 class DeprecatedOp4A(_HardValue):
 
+    __slots__ = ()
+
     def __init__(self, data, level=0):
         super().__init__(data, '(deprecated op 4A)', level)
         print('NOTE: DeprecatedOp4A is currently untested.  Verify and make sure this works!')
@@ -155,6 +241,8 @@ class DeprecatedOp4A(_HardValue):
 
 class NoInterface(_HardValue):
 
+    __slots__ = ()
+
     def __init__(self, data, level=0):
         super().__init__(data, 'NoInterface', level)
         print('NOTE: NoInterface is currently untested.  Verify and make sure this works!')
@@ -162,6 +250,8 @@ class NoInterface(_HardValue):
 
 class Breakpoint(_HardValue):
 
+    __slots__ = ()
+
     def __init__(self, data, level=0):
         super().__init__(data, '(Breakpoint)', level)
         print('NOTE: Breakpoint is currently untested.  Verify and make sure this works!')
@@ -169,6 +259,8 @@ class Breakpoint(_HardValue):
 
 class WireTracepoint(_HardValue):
 
+    __slots__ = ()
+
     def __init__(self, data, level=0):
         super().__init__(data, '(WireTracepoint)', level)
         print('NOTE: WireTracepoint is currently untested.  Verify and make sure this works!')
@@ -176,6 +268,8 @@ class WireTracepoint(_HardValue):
 
 class Tracepoint(_HardValue):
 
+    __slots__ = ()
+
     def __init__(self, data, level=0):
         super().__init__(data, '(Tracepoint)', level)
         print('NOTE: Tracepoint is currently untested.  Verify and make sure this works!')
@@ -183,6 +277,8 @@ class Tracepoint(_HardValue):
 
 class _IndexHardValue(Statement):
 
+    __slots__ = ('value',)
+
     def __init__(self, data, value, level=0):
         super().__init__(data, level)
         self.value = value
@@ -194,18 +290,24 @@ class _IndexHardValue(Statement):
 
 class STrue(_IndexHardValue):
 
+    __slots__ = ()
+
     def __init__(self, data, level=0):
         super().__init__(data, 'True', level)
 
 
 class SFalse(_IndexHardValue):
 
+    __slots__ = ()
+
     def __init__(self, data, level=0):
         super().__init__(data, 'False', level)
 
 
 class IntZero(_IndexHardValue):
 
+    __slots__ = ()
+
     def __init__(self, data, level=0):
         super().__init__(data, 0, level)
         print('NOTE: IntZero is currently untested.  Verify and make sure this works!')
@@ -213,6 +315,8 @@ class IntZero(_IndexHardValue):
 
 class IntOne(_IndexHardValue):
 
+    __slots__ = ()
+
     def __init__(self, data, level=0):
         super().__init__(data, 1, level)
         print('NOTE: IntOne is currently untested.  Verify and make sure this works!')
@@ -220,6 +324,8 @@ class IntOne(_IndexHardValue):
 
 class _Const(Statement):
 
+    __slots__ = ('value',)
+
     def __init__(self, data, level=0):
         super().__init__(data, level)
         self.value = data['Value']
@@ -233,18 +339,24 @@ class SkipOffsetConst(_Const):
     No changes we care about
     """
 
+    __slots__ = ()
+
 
 class StringConst(_Const):
     """
     No changes we care about
     """
 
+    __slots__ = ()
+
 
 class UnicodeStringConst(_Const):
     """
     No changes we care about (apart from the note about being untested)
     """
 
+    __slots__ = ()
+
     def __init__(self, data, level=0):
         super().__init__(data, level)
         print('NOTE: UnicodeStringConst is currently untested.  Verify and make sure this works!')
@@ -252,6 +364,8 @@ class UnicodeStringConst(_Const):
 
 class _IndexConst(Statement):
 
+    __slots__ = ('value',)
+
     def __init__(self, data, level=0):
         super().__init__(data, level)
         self.index = data['_hotfix_index']
@@ -266,18 +380,24 @@ class ByteConst(_IndexConst):
     No changes we care about
     """
 
+    __slots__ = ()
+
 
 class IntConst(_IndexConst):
     """
     No changes we care about
     """
 
+    __slots__ = ()
+
 
 class IntConstByte(_IndexConst):
     """
     No changes we care about
     """
 
+    __slots__ = ()
+
     def __init__(self, data, level=0):
         super().__init__(data, level)
         print('NOTE: IntConstByte is currently untested.  Verify and make sure this works!')
@@ -288,6 +408,8 @@ class Int64Const(_IndexConst):
     No changes we care about
     """
 
+    __slots__ = ()
+
     def __init__(self, data, level=0):
         super().__init__(data, level)
         print('NOTE: Int64Const is currently untested.  Verify and make sure this works!')
@@ -298,6 +420,8 @@ class UInt64Const(_IndexConst):
     No changes we care about
     """
 
+    __slots__ = ()
+
     def __init__(self, data, level=0):
         super().__init__(data, level)
         print('NOTE: UInt64Const is currently untested.  Verify and make sure this works!')
@@ -308,15 +432,21 @@ class FloatConst(_IndexConst):
     No changes we care about
     """
 
+    __slots__ = ()
+
 
 class NameConst(_IndexConst):
     """
     No changes we care about
     """
 
+    __slots__ = ()
+
 
 class TextConst(Statement):
 
+    __slots__ = ('text_type', 'value', 'loc_key', 'loc_namespace', 'table_id', 'table_key')
+
     def __init__(self, data, level=0):
         super().__init__(data, level)
         self.text_type = data['TextLiteralType']
@@ -347,6 +477,8 @@ class TextConst(Statement):
 
 class ObjectConst(Statement):
 
+    __slots__ = ('object',)
+
     def __init__(self, data, level=0):
         super().__init__(data, level)
         self.index = data['_hotfix_index']
@@ -364,6 +496,8 @@ class ObjectConst(Statement):
 
 class FieldPathConst(Statement):
 
+    __slots__ = ('expression',)
+
     def __init__(self, data, level=0):
         super().__init__(data, level)
         print('NOTE: FieldPathConst is currently untested.  Verify and make sure this works!')
@@ -375,6 +509,8 @@ class FieldPathConst(Statement):
 
 class RotationConst(Statement):
 
+    __slots__ = ('pitch', 'yaw', 'roll')
+
     def __init__(self, data, level=0):
         super().__init__(data, level)
         self.index = data['_hotfix_index']
@@ -388,6 +524,8 @@ class RotationConst(Statement):
 
 class VectorConst(Statement):
 
+    __slots__ = ('x', 'y', 'z')
+
     def __init__(self, data, level=0):
         super().__init__(data, level)
         self.index = data['_hotfix_index']
@@ -401,6 +539,12 @@ class VectorConst(Statement):
 
 class TransformConst(Statement):
 
+    __slots__ = (
+            'rot_x', 'rot_y', 'rot_z', 'rot_w',
+            'trans_x', 'trans_y', 'trans_z',
+            'scale_x', 'scale_y', 'scale_z',
+            )
+
     def __init__(self, data, level=0):
         super().__init__(data, level)
         print('NOTE: TransformConst is currently untested.  Verify and make sure this works!')
@@ -427,6 +571,8 @@ class TransformConst(Statement):
 
 class ArrayConst(Statement):
 
+    __slots__ = ('outer', 'values')
+
     def __init__(self, data, level=0):
         super().__init__(data, level)
         self.outer = data['Variable Outer']
@@ -451,6 +597,8 @@ class ArrayConst(Statement):
 
 class SoftObjectConst(Statement):
 
+    __slots__ = ('value',)
+
     def __init__(self, data, level=0):
         super().__init__(data, level)
         self.value = Statement.from_data(data['Value'], level)
@@ -461,6 +609,8 @@ class SoftObjectConst(Statement):
 
 class SetArray(Statement):
 
+    __slots__ = ('left', 'values')
+
     def __init__(self, data, level=0):
         super().__init__(data, level)
         self.left = Statement.from_data(data['LeftSideExpression'])
@@ -479,6 +629,8 @@ class SetArray(Statement):
 
 class Context(Statement):
 
+    __slots__ = ('context', 'expression')
+
     def __init__(self, data, level=0):
         super().__init__(data, level)
         self.context = Statement.from_data(data['Context'], level)
@@ -497,6 +649,8 @@ class Context(Statement):
 
 class InterfaceContext(Statement):
 
+    __slots__ = ('expression',)
+
     def __init__(self, data, level=0):
         super().__init__(data, level)
         self.expression = Statement.from_data(data['Expression'], level)
@@ -512,6 +666,8 @@ class InterfaceContext(Statement):
 
 class Let(Statement):
 
+    __slots__ = ('var', 'val')
+
     def __init__(self, data, level=0):
         super().__init__(data, level)
         self.shape = 'ellipse'
@@ -530,30 +686,40 @@ class LetBool(Let):
     No changes that we care about
     """
 
+    __slots__ = ()
+
 
 class LetObj(Let):
     """
     No changes that we care about
     """
 
+    __slots__ = ()
+
 
 class LetDelegate(Let):
     """
     No changes that we care about
     """
 
+    __slots__ = ()
+
 
 class LetWeakObjPtr(Let):
     """
     No changes that we care about
     """
 
+    __slots__ = ()
+
 
 class LetMulticastDelegate(Let):
     """
     No changes that we care about (apart from the non-tested note)
     """
 
+    __slots__ = ()
+
     def __init__(self, data, level=0):
         super().__init__(data, level)
         print('NOTE: LetMulticastDelegate is currently untested.  Verify and make sure this works!')
@@ -561,6 +727,8 @@ class LetMulticastDelegate(Let):
 
 class Function(Statement):
 
+    __slots__ = ('func_key', 'function', 'parameters')
+
     def __init__(self, data, level=0, func_key='Function'):
         super().__init__(data, level)
         self.func_key = func_key
@@ -585,15 +753,21 @@ class FinalFunction(Function):
     No changes we care about
     """
 
+    __slots__ = ()
+
 
 class VirtualFunction(Function):
     """
     No changes we care about
     """
 
+    __slots__ = ()
+
 
 class LocalVirtualFunction(Function):
 
+    __slots__ = ()
+
     def __init__(self, data, level=0):
         super().__init__(data, level, func_key='FunctionName')
         print('NOTE: LocalVirtualFunction is currently untested.  Verify and make sure this works!')
@@ -604,6 +778,8 @@ class LocalFinalFunction(Function):
     No changes we care about (apart from the alert about not being tested)
     """
 
+    __slots__ = ()
+
     def __init__(self, data, level=0):
         super().__init__(data, level)
         print('NOTE: LocalFinalFunction is currently untested.  Verify and make sure this works!')
@@ -611,6 +787,8 @@ class LocalFinalFunction(Function):
 
 class CallMath(Function):
 
+    __slots__ = ('contextclass',)
+
     def __init__(self, data, level=0):
         super().__init__(data, level)
         self.contextclass = data['ContextClass']
@@ -629,9 +807,12 @@ class _Variable(Statement):
     specifically in the RemoveMulticastDelegate at index 20156.
     """
 
+    __slots__ = ('name', 'full_name', 'outer')
+
     def __init__(self, data, level=0):
         super().__init__(data, level)
         self.name = data['Variable Name']
+        self.full_name = self.name
         self.outer = data['Variable Outer']
         self.shape = 'ellipse'
         if '.' in self.name:
@@ -646,24 +827,32 @@ class LocalVariable(_Variable):
     No changes we care about
     """
 
+    __slots__ = ()
+
 
 class LocalOutVariable(_Variable):
     """
     No changes we care about
     """
 
+    __slots__ = ()
+
 
 class InstanceVariable(_Variable):
     """
     No changes we care about
     """
 
+    __slots__ = ()
+
 
 class DefaultVariable(LocalVariable):
     """
     No changes we care about (apart from the non-tested note)
     """
 
+    __slots__ = ()
+
     def __init__(self, data, level=0):
         super().__init__(data, level)
         print('NOTE: DefaultVariable is currently untested.  Verify and make sure this works!')
@@ -671,6 +860,8 @@ class DefaultVariable(LocalVariable):
 
 class Jump(Statement):
 
+    __slots__ = ('offset',)
+
     def __init__(self, data, level=0):
         super().__init__(data, level)
         self.shape = 'rarrow'
@@ -689,6 +880,8 @@ class Jump(Statement):
 
 class JumpIfNot(Statement):
 
+    __slots__ = ('offset', 'condition')
+
     def __init__(self, data, level=0):
         super().__init__(data, level)
         self.shape = 'rarrow'
@@ -708,6 +901,8 @@ class JumpIfNot(Statement):
 
 class ComputedJump(Statement):
 
+    __slots__ = ('offset',)
+
     def __init__(self, data, level=0):
         super().__init__(data, level)
         self.shape = 'rpromoter'
@@ -729,6 +924,8 @@ class PushExecutionFlow(Statement):
     we *do* still want to link_to_next?
     """
 
+    __slots__ = ('offset',)
+
     def __init__(self, data, level=0):
         super().__init__(data, level)
         self.shape = 'rarrow'
@@ -752,6 +949,8 @@ class PopExecutionFlow(Statement):
     we *do* still want to link_to_next?
     """
 
+    __slots__ = ()
+
     def __init__(self, data, level=0):
         super().__init__(data, level)
         self.shape = 'larrow'
@@ -766,6 +965,8 @@ class PopExecutionFlowIfNot(Statement):
     we *do* still want to link_to_next?
     """
 
+    __slots__ = ('condition',)
+
     def __init__(self, data, level=0):
         super().__init__(data, level)
         self.shape = 'larrow'
@@ -780,6 +981,8 @@ class PopExecutionFlowIfNot(Statement):
 
 class StructMemberContext(Statement):
 
+    __slots__ = ('name', 'expression')
+
     def __init__(self, data, level=0):
         super().__init__(data, level)
         self.name = data['Property Name']
@@ -797,6 +1000,8 @@ class StructMemberContext(Statement):
 
 class Return(Statement):
 
+    __slots__ = ('expression',)
+
     def __init__(self, data, level=0):
         super().__init__(data, level)
         self.shape = 'larrow'
@@ -811,6 +1016,8 @@ class Return(Statement):
 
 class EndOfScript(Statement):
 
+    __slots__ = ()
+
     def __init__(self, data, level=0):
         super().__init__(data, level)
         self.shape = 'octagon'
@@ -823,6 +1030,8 @@ class EndOfScript(Statement):
 
 class BindDelegate(Statement):
 
+    __slots__ = ('delegate', 'object', 'function_name')
+
     def __init__(self, data, level=0):
         super().__init__(data, level)
         self.delegate = Statement.from_data(data['Delegate'], level)
@@ -843,6 +1052,8 @@ class BindDelegate(Statement):
 
 class DynamicCast(Statement):
 
+    __slots__ = ('to_class', 'expression')
+
     def __init__(self, data, level=0):
         super().__init__(data, level)
         self.to_class = data['Class']
@@ -857,6 +1068,8 @@ class DynamicCast(Statement):
 
 class PrimitiveCast(Statement):
 
+    __slots__ = ('cast_type', 'expression')
+
     def __init__(self, data, level=0):
         super().__init__(data, level)
         self.cast_type = data['CastType']
@@ -871,6 +1084,8 @@ class PrimitiveCast(Statement):
 
 class ObjToInterfaceCast(Statement):
 
+    __slots__ = ('to_class', 'expression')
+
     def __init__(self, data, level=0):
         super().__init__(data, level)
         self.to_class = data['InterfaceClass']
@@ -885,6 +1100,8 @@ class ObjToInterfaceCast(Statement):
 
 class CrossInterfaceCast(Statement):
 
+    __slots__ = ('to_class', 'expression')
+
     def __init__(self, data, level=0):
         super().__init__(data, level)
         print('NOTE: CrossInterfaceCast is currently untested.  Verify and make sure this works!')
@@ -900,6 +1117,8 @@ class CrossInterfaceCast(Statement):
 
 class InterfaceToObjCast(Statement):
 
+    __slots__ = ('to_class', 'expression')
+
     def __init__(self, data, level=0):
         super().__init__(data, level)
         print('NOTE: InterfaceToObjCast is currently untested.  Verify and make sure this works!')
@@ -915,6 +1134,8 @@ class InterfaceToObjCast(Statement):
 
 class SwitchCase:
 
+    __slots__ = ('key', 'value')
+
     def __init__(self, key, value):
         self.key = key
         self.value = value
@@ -922,6 +1143,8 @@ class SwitchCase:
 
 class SwitchValue(Statement):
 
+    __slots__ = ('expression', 'cases', 'default')
+
     def __init__(self, data, level=0):
         super().__init__(data, level)
         self.expression = Statement.from_data(data['Expression'], level)
@@ -948,6 +1171,8 @@ class SwitchValue(Statement):
 
 class StructConst(Statement):
 
+    __slots__ = ('struct', 'properties', 'guid')
+
     def __init__(self, data, level=0):
         super().__init__(data, level)
         self.struct = data['Struct']
@@ -985,10 +1210,13 @@ class StructConst(Statement):
 
 class LetValueOnPersistentFrame(Statement):
 
+    __slots__ = ('outer', 'name', 'full_name', 'expression')
+
     def __init__(self, data, level=0):
         super().__init__(data, level)
         self.outer = data['Property Outer']
         self.name = data['Property Name']
+        self.full_name = self.name
         if '.' in self.name:
             self.name = self.name.split('.', 1)[-1]
         self.expression = Statement.from_data(data['Expression'], level+1)
@@ -1005,6 +1233,8 @@ class LetValueOnPersistentFrame(Statement):
 
 class AddMulticastDelegate(Statement):
 
+    __slots__ = ('multicast', 'delegate')
+
     def __init__(self, data, level=0):
         super().__init__(data, level)
         self.multicast = Statement.from_data(data['MulticastDelegate'], level+1)
@@ -1021,6 +1251,8 @@ class AddMulticastDelegate(Statement):
 
 class RemoveMulticastDelegate(Statement):
 
+    __slots__ = ('multicast', 'delegate')
+
     def __init__(self, data, level=0):
         super().__init__(data, level)
         self.multicast = Statement.from_data(data['MulticastDelegate'], level+1)
@@ -1037,6 +1269,8 @@ class RemoveMulticastDelegate(Statement):
 
 class ClearMulticastDelegate(Statement):
 
+    __slots__ = ('multicast',)
+
     def __init__(self, data, level=0):
         super().__init__(data, level)
         print('NOTE: ClearMulticastDelegate is currently untested.  Verify and make sure this works!')
@@ -1048,6 +1282,8 @@ class ClearMulticastDelegate(Statement):
 
 class CallMulticastDelegate(Statement):
 
+    __slots__ = ('self_context', 'function_parent', 'function_name', 'delegate', 'parameters')
+
     def __init__(self, data, level=0):
         super().__init__(data, level)
         self.self_context = data['DelegateSignatureFunction']['IsSelfContext']
@@ -1072,6 +1308,8 @@ class CallMulticastDelegate(Statement):
 
 class MetaCast(Statement):
 
+    __slots__ = ('class_name', 'expression')
+
     def __init__(self, data, level=0):
         super().__init__(data, level)
         self.class_name = data['Class']
@@ -1083,6 +1321,8 @@ class MetaCast(Statement):
 
 class ArrayGetByRef(Statement):
 
+    __slots__ = ('array',)
+
     def __init__(self, data, level=0):
         super().__init__(data, level)
         self.array = Statement.from_data(data['ArrayExpression'], level+1)
@@ -1094,6 +1334,8 @@ class ArrayGetByRef(Statement):
 
 class InstanceDelegate(Statement):
 
+    __slots__ = ('function',)
+
     def __init__(self, data, level=0):
         super().__init__(data, level)
         print('NOTE: InstanceDelegate is currently untested.  Verify and make sure this works!')
@@ -1191,34 +1433,352 @@ statement_types = {
         #'InstrumentationEvent': InstrumentationEvent,
         }
 
+def iter_json_array(df, chunk_size=65536):
+    """
+    Given an open JSON file whose top-level value is an array, yields the
+    array's elements one at a time, reading the file in chunks rather than
+    loading the whole thing at once.
+    """
+    decoder = json.JSONDecoder()
+    buf = ''
+    pos = 0
+    eof = False
+    # What we expect to see next: the opening bracket, an element, or the
+    # comma after one.  A closing bracket is fine for either of the latter.
+    expecting = '['
+    while True:
+        while pos < len(buf) and buf[pos] in ' \t\n\r':
+            pos += 1
+        if pos < len(buf):
+            char = buf[pos]
+            if expecting == '[':
+                if char != '[':
+                    raise ValueError('Top-level JSON value is not an array')
+                expecting = 'element'
+                pos += 1
+                continue
+            if char == ']':
+                return
+            if expecting == ',':
+                if char != ',':
+                    raise ValueError(f'Expected "," or "]" in JSON array, got {char!r}')
+                expecting = 'element'
+                pos += 1
+                continue
+            try:
+                value, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                # Most likely just incomplete; read more and try again
+                if eof:
+                    raise
+            else:
+                # A number which runs right up to the end of the buffer might
+                # carry on in the next chunk.
+                if eof or buf[end:].lstrip('0123456789+-.eE') != '':
+                    yield value
+                    pos = end
+                    expecting = ','
+                    continue
+        elif eof:
+            raise ValueError('Unexpected end of JSON data')
+        # Reads grow along with the buffer, so that a huge element doesn't
+        # get re-parsed from the start for every chunk.
+        more = df.read(max(chunk_size, len(buf) - pos))
+        eof = not more
+        buf = buf[pos:] + more
+        pos = 0
+
+def iter_script_data(filename):
+    """
+    Yields the raw data for each top-level statement in the given script
+    serialization (in either JSON or binary format), one at a time.
+    """
+    if filename.endswith(f'.{kismetbin.extension}'):
+        yield from kismetbin.iterload(filename)
+    else:
+        with open(filename) as df:
+            yield from iter_json_array(df)
+
 class Script:
 
     def __init__(self, filename):
         self.filename = filename
-        with open(filename) as df:
-            data = json.load(df)
         self.statements = []
-        for statement in data:
-            parsed = Statement.from_data(statement)
+        for parsed in Script.iter_statements(filename):
             if len(self.statements) > 0:
                 self.statements[-1].next = parsed
             self.statements.append(parsed)
 
-    def to_dotfile(self, filename):
+    @staticmethod
+    def iter_statements(filename):
+        """
+        Yields each top-level statement in the given script, parsing them one
+        at a time.  Their `next` attributes are left unset.
+        """
+        for statement in iter_script_data(filename):
+            yield Statement.from_data(statement)
+
+    def basic_blocks(self):
+        """
+        Splits our statements up into basic blocks: runs of statements which
+        are only ever entered at the top, and only branch at the bottom.  A
+        new block starts at the beginning of the script, at anything which is
+        the target of a jump (or a PushExecutionFlow), and after anything
+        which jumps or doesn't carry on to the next statement.  Returns a list
+        of lists of statements.
+        """
+        leaders = set()
+        for statement in self.statements:
+            targets = statement.link_targets()
+            leaders.update(targets)
+            if (targets or not statement.link_to_next) and statement.next:
+                leaders.add(statement.next.index)
+        blocks = []
+        for statement in self.statements:
+            if not blocks or statement.index in leaders:
+                blocks.append([])
+            blocks[-1].append(statement)
+        return blocks
+
+    def entry_points(self, blocks):
+        """
+        Given the list of blocks from `basic_blocks()`, returns a dict mapping
+        the index of each block which can't be reached from any other block
+        (so the start of the script, and each event entry point in an
+        ubergraph) to the list of blocks reachable from it, in script order.
+        """
+        block_for = {}
+        for block_num, block in enumerate(blocks):
+            block_for[block[0].index] = block_num
+        successors = []
+        has_predecessor = set()
+        for block_num, block in enumerate(blocks):
+            last = block[-1]
+            following = set()
+            if last.link_to_next and last.next:
+                following.add(block_for[last.next.index])
+            for target in last.link_targets():
+                if target in block_for:
+                    following.add(block_for[target])
+            following.discard(block_num)
+            successors.append(following)
+            has_predecessor.update(following)
+
+        entries = {}
+        for block_num in range(len(blocks)):
+            if block_num in has_predecessor:
+                continue
+            seen = {block_num}
+            to_visit = [block_num]
+            while to_visit:
+                for following in successors[to_visit.pop()]:
+                    if following not in seen:
+                        seen.add(following)
+                        to_visit.append(following)
+            entries[blocks[block_num][0].index] = [blocks[num] for num in sorted(seen)]
+        return entries
+
+    def to_dotfile(self, filename, blocks=None, cluster=False, max_label_lines=None):
+        """
+        Writes out a dotfile.  By default, all statements are written out;
+        pass a list of `blocks` (from `basic_blocks()`) to only include those.
+        If `cluster` is `True`, each block will be drawn as its own cluster,
+        which helps Graphviz cope with large scripts.  `max_label_lines` will
+        truncate large statement labels.
+        """
+        if blocks is None:
+            if cluster:
+                blocks = self.basic_blocks()
+            else:
+                blocks = [self.statements]
+            include = None
+        else:
+            include = set()
+            for block in blocks:
+                include.update(statement.index for statement in block)
         with open(filename, 'w') as df:
             print('digraph ubergraph {', file=df)
             print('', file=df)
             print('// Nodes', file=df)
-            for statement in self.statements:
-                print(statement.dot_node(), file=df)
+            for block in blocks:
+                if cluster:
+                    print(f'subgraph cluster_{block[0].index} {{', file=df)
+                    print('style="rounded,dashed"; color=gray50;', file=df)
+                for statement in block:
+                    print(statement.dot_node(max_label_lines), file=df)
+                if cluster:
+                    print('}', file=df)
             print('', file=df)
             print('// Links', file=df)
-            for statement in self.statements:
-                for link in statement.dot_links():
-                    print(link, file=df)
+            for block in blocks:
+                for statement in block:
+                    for link in statement.dot_links(include):
+                        print(link, file=df)
             print('', file=df)
             print('}', file=df)
 
+def stream_dotfile(filename, filename_dot, max_label_lines=None):
+    """
+    Writes out a dotfile for the given script just as `Script.to_dotfile()`
+    would with its default arguments, but without loading the whole script
+    into memory: statements are parsed one at a time and written out as they
+    go, with their links spooled to a temporary file until all the nodes are
+    done.  `max_label_lines` will truncate large statement labels.
+    """
+    with open(filename_dot, 'w') as df, tempfile.TemporaryFile('w+') as links:
+        print('digraph ubergraph {', file=df)
+        print('', file=df)
+        print('// Nodes', file=df)
+        previous = None
+        for statement in Script.iter_statements(filename):
+            print(statement.dot_node(max_label_lines), file=df)
+            if previous is not None:
+                previous.next = statement
+                for link in previous.dot_links():
+                    print(link, file=links)
+            previous = statement
+        if previous is not None:
+            for link in previous.dot_links():
+                print(link, file=links)
+        print('', file=df)
+        print('// Links', file=df)
+        links.seek(0)
+        shutil.copyfileobj(links, df)
+        print('', file=df)
+        print('}', file=df)
+
+# Serializations we know how to read
+script_exts = ('.json', f'.{kismetbin.extension}')
+
+def resolve_filename(filename):
+    """
+    Given a user-supplied JSON filename, which may be missing its extension
+    (or just have a trailing dot, as often happens with tab-completion),
+    returns a tuple of the real filename and the filename without its
+    extension.
+    """
+    if filename.endswith('.'):
+        filename += 'json'
+    filename_base = filename.rsplit('.', 1)[0]
+    if filename_base == filename:
+        filename += '.json'
+    return filename, filename_base
+
+def find_scripts(paths):
+    """
+    Given a list of paths (which may be directories, glob patterns, or
+    individual JSON filenames), returns a sorted list of all the JSON files
+    they refer to.  Directories are searched recursively for serializations
+    generated by `serialize-ubergraph.py`, in either JSON or binary format.
+    """
+    found = set()
+    for path in paths:
+        if os.path.isdir(path):
+            for dirpath, dirnames, filenames in os.walk(path):
+                for filename in filenames:
+                    if '-ubergraph-' in filename and filename.endswith(script_exts):
+                        found.add(os.path.join(dirpath, filename))
+        elif glob.has_magic(path):
+            for match in glob.glob(path, recursive=True):
+                if match.endswith(script_exts) and os.path.isfile(match):
+                    found.add(match)
+        else:
+            found.add(resolve_filename(path)[0])
+    return sorted(found)
+
+def is_up_to_date(filename_render, filename):
+    """
+    Returns `True` if the given render exists, and is newer than the JSON
+    file it was generated from.
+    """
+    return os.path.exists(filename_render) \
+            and os.path.getmtime(filename_render) >= os.path.getmtime(filename)
+
+def generate(filename, args):
+    """
+    Converts the given JSON file to one or more dotfiles, returning a list of
+    `(filename_dot, filename_render)` tuples for the renders which need to be
+    done.  Renders which are already newer than the JSON file are skipped
+    (and their dotfiles left alone), unless `--force` was specified.  Returns
+    a tuple of that list and the number of renders skipped.
+    """
+    filename, filename_base = resolve_filename(filename)
+    filename_dot = f'{filename_base}.dot'
+    filename_render = f'{filename_base}.{args.render}'
+
+    # If we're not splitting, we know what the render will be called, so we
+    # can avoid even parsing the JSON if it's already done.
+    if not args.split_events and args.render != 'none' and not args.force \
+            and is_up_to_date(filename_render, filename):
+        return [], 1
+
+    # Without splitting or clustering, nothing needs the whole script at
+    # once, so stream it straight through to the dotfile.
+    if not args.split_events and not args.large:
+        stream_dotfile(filename, filename_dot, max_label_lines=args.max_label_lines)
+        print(f'Generated: {filename_dot}')
+        return [(filename_dot, filename_render)], 0
+
+    # Load and convert to dot
+    script = Script(filename)
+    to_render = []
+    skipped = 0
+    if args.split_events:
+        for entry, blocks in script.entry_points(script.basic_blocks()).items():
+            filename_entry_base = f'{filename_base}-entry-{entry:05d}'
+            filename_dot = f'{filename_entry_base}.dot'
+            filename_render = f'{filename_entry_base}.{args.render}'
+            if args.render != 'none' and not args.force and is_up_to_date(filename_render, filename):
+                skipped += 1
+                continue
+            script.to_dotfile(filename_dot,
+                    blocks=blocks,
+                    cluster=True,
+                    max_label_lines=args.max_label_lines,
+                    )
+            print(f'Generated: {filename_dot}')
+            to_render.append((filename_dot, filename_render))
+    else:
+        script.to_dotfile(filename_dot,
+                cluster=args.large,
+                max_label_lines=args.max_label_lines,
+                )
+        print(f'Generated: {filename_dot}')
+        to_render.append((filename_dot, filename_render))
+    return to_render, skipped
+
+def render(filename_dot, filename_render, render_type, timeout=None):
+    """
+    Renders the given dotfile with Graphviz.  Returns a tuple of a status
+    string (`ok`, `failed`, or `timeout`) and the time taken, in seconds.
+    """
+    # Remove the render if it already exists
+    if os.path.exists(filename_render):
+        os.unlink(filename_render)
+
+    # Render it!
+    start = time.perf_counter()
+    try:
+        subprocess.run(['dot', f'-T{render_type}', '-o', filename_render, filename_dot],
+                timeout=timeout,
+                )
+    except subprocess.TimeoutExpired:
+        # Don't leave a partial render lying around, or it'd be considered
+        # up-to-date on the next run.
+        if os.path.exists(filename_render):
+            os.unlink(filename_render)
+        return 'timeout', time.perf_counter() - start
+    except OSError as e:
+        print(f'WARNING: Could not run dot: {e}')
+        return 'failed', time.perf_counter() - start
+    elapsed = time.perf_counter() - start
+
+    # Check to make sure that worked
+    if os.path.exists(filename_render):
+        return 'ok', elapsed
+    else:
+        return 'failed', elapsed
+
 def main():
 
     parser = argparse.ArgumentParser(
@@ -1245,47 +1805,108 @@ def main():
             help="Don't auto-display renders",
             )
 
-    parser.add_argument('filename',
-            nargs=1,
-            help='JSON filename to process',
+    parser.add_argument('-l', '--large',
+            action='store_true',
+            help='Large-graph mode: group statements into clustered basic blocks, which Graphviz copes with much better',
             )
 
-    args = parser.parse_args()
-    filename = args.filename[0]
-    if filename.endswith('.'):
-        filename += 'json'
-    filename_base = filename.rsplit('.', 1)[0]
-    if filename_base == filename:
-        filename += '.json'
-    filename_dot = f'{filename_base}.dot'
-    filename_render = f'{filename_base}.{args.render}'
+    parser.add_argument('-m', '--max-label-lines',
+            type=int,
+            help='Truncate statement labels to this many lines',
+            )
 
-    # Load and convert to dot
-    script = Script(filename)
-    script.to_dotfile(filename_dot)
-    print(f'Generated: {filename_dot}')
+    parser.add_argument('-s', '--split-events',
+            action='store_true',
+            help='Write out a separate graph for each entry point (event) in the script, rather than one big graph (implies --large)',
+            )
 
-    # Render
-    if args.render != 'none':
+    parser.add_argument('-j', '--jobs',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Number of renders to run at once (defaults to the number of CPUs)',
+            )
 
-        # Remove the render if it already exists
-        if os.path.exists(filename_render):
-            os.unlink(filename_render)
+    parser.add_argument('-t', '--timeout',
+            type=float,
+            help='Give up on any individual render which takes longer than this many seconds',
+            )
+
+    parser.add_argument('-f', '--force',
+            action='store_true',
+            help='Render even if the render is already newer than its JSON file',
+            )
 
-        # Render it!
-        subprocess.run(['dot', f'-T{args.render}', '-o', filename_render, filename_dot])
+    parser.add_argument('filename',
+            nargs='+',
+            help='JSON (or binary .ubc) filename to process.  Directories (searched recursively for *-ubergraph-*.json/.ubc) and glob patterns may also be given.',
+            )
 
-        # Check to make sure that worked
-        if os.path.exists(filename_render):
-            print(f'Rendered to: {filename_render}')
-            if args.render in {'png', 'svg'} and args.do_display:
-                try:
-                    subprocess.run([args.display, filename_render])
-                except Exception as e:
-                    print(f'WARNING: Could not render to "{filename_render}": {e}')
-        else:
-            print(f'WARNING: Could not render to: {filename_render}')
+    args = parser.parse_args()
+    start = time.perf_counter()
+
+    # Generate all the dotfiles
+    filenames = find_scripts(args.filename)
+    to_render = []
+    skipped = 0
+    for filename in filenames:
+        file_to_render, file_skipped = generate(filename, args)
+        to_render.extend(file_to_render)
+        skipped += file_skipped
+    if args.render == 'none':
+        return
+
+    # Render, running up to `--jobs` copies of dot at once.  The work itself
+    # happens in the dot processes, so threads are all we need here.
+    results = []
+    jobs = max(1, args.jobs)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = {}
+        for filename_dot, filename_render in to_render:
+            future = executor.submit(render, filename_dot, filename_render, args.render, args.timeout)
+            futures[future] = filename_render
+        for future in concurrent.futures.as_completed(futures):
+            filename_render = futures[future]
+            status, elapsed = future.result()
+            results.append((status, elapsed, filename_render))
+            if status == 'ok':
+                print(f'Rendered to: {filename_render}')
+            elif status == 'timeout':
+                print(f'WARNING: Timed out after {elapsed:0.1f}s rendering to: {filename_render}')
+            else:
+                print(f'WARNING: Could not render to: {filename_render}')
+
+    # If we only did a single render, display it.  Don't want to pop up
+    # dozens of viewers, though.
+    if len(results) == 1 and len(filenames) == 1:
+        status, elapsed, filename_render = results[0]
+        if status == 'ok' and args.render in {'png', 'svg'} and args.do_display:
+            try:
+                subprocess.run([args.display, filename_render])
+            except Exception as e:
+                print(f'WARNING: Could not render to "{filename_render}": {e}')
+    elif len(filenames) > 1 or len(results) > 1 or skipped > 0:
+        elapsed = time.perf_counter() - start
+        print('')
+        print('Rendered {} of {} graph(s) in {:0.2f}s with {} job(s): {} skipped as up-to-date, {} failed, {} timed out'.format(
+            sum(1 for result in results if result[0] == 'ok'),
+            len(results) + skipped,
+            elapsed,
+            jobs,
+            skipped,
+            sum(1 for result in results if result[0] == 'failed'),
+            sum(1 for result in results if result[0] == 'timeout'),
+            ))
+        if results:
+            render_times = sorted(result[1] for result in results)
+            print('Render times: total {:0.2f}s, median {:0.2f}s, max {:0.2f}s'.format(
+                sum(render_times),
+                render_times[len(render_times)//2],
+                render_times[-1],
+                ))
+            if len(results) > 1:
+                print('Slowest renders:')
+                for status, elapsed, filename_render in sorted(results, key=lambda result: result[1], reverse=True)[:5]:
+                    print(f' - {elapsed:0.2f}s ({status}): {filename_render}')
 
 if __name__ == '__main__':
     main()
-
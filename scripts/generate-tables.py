@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+# vim: set expandtab tabstop=4 shiftwidth=4:
+
+# Copyright 2022 Christopher J Kucera
+# <cj@apocalyptech.com>
+# <https://apocalyptech.com/contact.php>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Regenerates the tables which UAssetAPI uses to avoid reflection when it
+# starts up:
+#
+#   UAssetAPI/CustomVersionTable.cs: the default custom versions for each
+#       engine version, rather than reflecting over the custom version enums
+#       every time an asset is created.
+#   UAssetAPI/PropertyTypeTable.cs: a constructor for each built-in property
+#       type, rather than scanning the assembly for them when the property type
+#       registry is built.
+#
+# The tables are built by asking an already-compiled `UAssetAPI.dll` for the
+# answers the slow way, so after changing any custom version enum,
+# `EngineVersion`, `CustomVersion.GuidToCustomVersionStringMap`, or adding or
+# removing a property type: build, run this, and build again.
+# `TestCustomVersionTable` and `TestPropertyTypeTable` in the unit tests fail
+# if the tables are out of date.
+
+import os
+import sys
+import argparse
+import importlib.util
+
+# Our sibling scripts have dashes in their names, so they need to be
+# imported by hand.
+def _load_sibling(name, filename):
+    my_dir = os.path.dirname(os.path.realpath(__file__))
+    spec = importlib.util.spec_from_file_location(name, os.path.join(my_dir, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+serialize_ubergraph = _load_sibling('serialize_ubergraph', 'serialize-ubergraph.py')
+
+default_output_dir = os.path.join(
+        os.path.dirname(os.path.dirname(os.path.realpath(__file__))),
+        'UAssetAPI',
+        )
+
+header = """//------------------------------------------------------------------------------
+// <auto-generated>
+//     This code was generated by scripts/generate-tables.py.
+//
+//     Changes to this file will be lost if the code is regenerated. Regenerate
+//     it after {when}.
+// </auto-generated>
+//------------------------------------------------------------------------------
+"""
+
+custom_version_template = header.format(when='changing any custom version enum, EngineVersion, or\n//     CustomVersion.GuidToCustomVersionStringMap') + """using System.Collections.Generic;
+using UAssetAPI.UnrealTypes;
+
+namespace UAssetAPI
+{{
+    /// <summary>
+    /// The results of <see cref="UAsset.GuessCustomVersionFromIntroducedAttributes(EngineVersion, System.Type)"/> for every custom version in <see cref="CustomVersion.GuidToCustomVersionStringMap"/> and every <see cref="EngineVersion"/>, worked out ahead of time so that setting up an asset's default custom versions doesn't need any reflection.
+    /// </summary>
+    internal static class CustomVersionTable
+    {{
+        /// <summary>
+        /// Guessed custom versions, indexed by <see cref="EngineVersion"/>. Null for names which don't have an enum.
+        /// </summary>
+        private static readonly Dictionary<string, int[]> GuessedVersions = new Dictionary<string, int[]>()
+        {{
+{entries}
+        }};
+
+        /// <summary>
+        /// Looks up the guessed value of a custom version for a specific Unreal version.
+        /// </summary>
+        /// <param name="name">The name of the custom version, as in <see cref="CustomVersion.GuidToCustomVersionStringMap"/>.</param>
+        /// <param name="chosenVersion">The version of the engine to check against.</param>
+        /// <param name="guessed">The guessed custom version, or -1 if there isn't one.</param>
+        /// <returns>Whether the table has an answer for this custom version and engine version.</returns>
+        internal static bool TryGetGuessedVersion(string name, EngineVersion chosenVersion, out int guessed)
+        {{
+            guessed = -1;
+            if (!GuessedVersions.TryGetValue(name, out int[] versions)) return false;
+            if (versions == null) return true;
+            if (chosenVersion < 0 || (int)chosenVersion >= versions.Length) return false;
+            guessed = versions[(int)chosenVersion];
+            return true;
+        }}
+    }}
+}}
+"""
+
+property_type_template = header.format(when='adding or removing a property type, or changing the\n//     PropertyType, HasCustomStructSerialization, or ShouldBeRegistered of one') + """using System.Collections.Generic;
+{usings}
+
+namespace UAssetAPI
+{{
+    /// <summary>
+    /// The registry entries for every property type built into UAssetAPI, just as <see cref="MainSerializer"/> would find them by scanning the assembly, so that the property type registry can be built without any reflection or creating any instances.
+    /// </summary>
+    internal static class PropertyTypeTable
+    {{
+        /// <summary>
+        /// Adds an entry for each built-in property type to the given registry.
+        /// </summary>
+        /// <param name="registry">The registry to add to.</param>
+        internal static void Register(IDictionary<string, RegistryEntry> registry)
+        {{
+{entries}
+        }}
+    }}
+}}
+"""
+
+def generate_custom_version_table():
+    """
+    Returns the source of `CustomVersionTable.cs`, as computed by the loaded
+    `UAssetAPI.dll`.
+    """
+    UAssetAPI = serialize_ubergraph.load_uassetapi(verbose=False)
+    import clr
+    import System
+
+    engine_version_type = clr.GetClrType(UAssetAPI.UnrealTypes.EngineVersion)
+    num_engine_versions = max(int(value) for value in System.Enum.GetValues(engine_version_type)) + 1
+    assembly = clr.GetClrType(UAssetAPI.UAsset).Assembly
+
+    entries = []
+    seen = set()
+    for name in UAssetAPI.CustomVersion.GuidToCustomVersionStringMap.Values:
+        if name in seen:
+            continue
+        seen.add(name)
+        custom_version_type = assembly.GetType(f'UAssetAPI.{name}')
+        if custom_version_type is None:
+            entries.append(f'            {{ "{name}", null }},')
+        else:
+            versions = [UAssetAPI.UAsset.GuessCustomVersionFromIntroducedAttributes(
+                    UAssetAPI.UnrealTypes.EngineVersion(i),
+                    custom_version_type,
+                    ) for i in range(num_engine_versions)]
+            entries.append('            {{ "{}", new int[] {{ {} }} }},'.format(
+                name,
+                ', '.join(str(version) for version in versions),
+                ))
+
+    return custom_version_template.format(entries='\n'.join(entries))
+
+def generate_property_type_table():
+    """
+    Returns the source of `PropertyTypeTable.cs`, listing the property types
+    which `MainSerializer` would register if it scanned the loaded
+    `UAssetAPI.dll` by reflection.
+    """
+    UAssetAPI = serialize_ubergraph.load_uassetapi(verbose=False)
+    import clr
+    import System
+
+    property_data_type = clr.GetClrType(UAssetAPI.PropertyTypes.Objects.PropertyData)
+    namespaces = {'UAssetAPI.PropertyTypes.Objects', 'UAssetAPI.UnrealTypes'}
+    entries = []
+    for property_type in property_data_type.Assembly.GetTypes():
+        if not property_type.IsSubclassOf(property_data_type) or property_type.ContainsGenericParameters:
+            continue
+        instance = System.Activator.CreateInstance(property_type)
+        if instance.PropertyType is None or not instance.ShouldBeRegistered:
+            continue
+        if property_type.IsNested:
+            raise RuntimeError(f'Nested property types are not supported: {property_type.FullName}')
+        namespaces.add(property_type.Namespace)
+        entries.append('            registry["{}"] = new RegistryEntry() {{ PropertyType = typeof({}), HasCustomStructSerialization = {}, Creator = name => new {}(name) }};'.format(
+            instance.PropertyType,
+            property_type.Name,
+            'true' if instance.HasCustomStructSerialization else 'false',
+            property_type.Name,
+            ))
+
+    return property_type_template.format(
+            usings='\n'.join(f'using {namespace};' for namespace in sorted(namespaces)),
+            entries='\n'.join(entries),
+            )
+
+tables = {
+        'CustomVersionTable.cs': generate_custom_version_table,
+        'PropertyTypeTable.cs': generate_property_type_table,
+        }
+
+def main():
+
+    parser = argparse.ArgumentParser(
+            description='Regenerate the precomputed tables in UAssetAPI',
+            )
+
+    parser.add_argument('-o', '--output-dir',
+            default=default_output_dir,
+            help=f'Directory to write to (defaults to {default_output_dir})',
+            )
+
+    parser.add_argument('--check',
+            action='store_true',
+            help="Don't write anything, but exit with a nonzero status if any table is out of date",
+            )
+
+    args = parser.parse_args()
+
+    out_of_date = False
+    for filename, generate in tables.items():
+        output = os.path.join(args.output_dir, filename)
+
+        # Match the rest of the C# sources: UTF-8 with a BOM, and CRLF line endings
+        source = generate().replace('\n', '\r\n').encode('utf-8-sig')
+        if os.path.exists(output):
+            with open(output, 'rb') as df:
+                current = df.read()
+        else:
+            current = None
+
+        if current == source:
+            print(f'{output} is up to date')
+        elif args.check:
+            print(f'{output} is out of date')
+            out_of_date = True
+        else:
+            with open(output, 'wb') as odf:
+                odf.write(source)
+            print(f'Wrote to: {output}')
+
+    if out_of_date:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
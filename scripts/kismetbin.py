@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+# vim: set expandtab tabstop=4 shiftwidth=4:
+
+# Copyright 2022 Christopher J Kucera
+# <cj@apocalyptech.com>
+# <https://apocalyptech.com/contact.php>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Reads and writes the compact binary format which UAssetAPI's
+# `KismetBinaryWriter` produces, as an alternative to JSON for serialized
+# bytecode.  The data decodes to exactly what `json.load()` would give for
+# the equivalent JSON.
+#
+# The format is the four bytes `UBC1` followed by a single value.  Each value
+# starts with a one-byte tag:
+#
+#   0x00: null
+#   0x01: false
+#   0x02: true
+#   0x03: integer, as a zigzag-encoded varint
+#   0x04: float, as a little-endian 64-bit double
+#   0x05: string, as a varint byte count and then UTF-8.  Gets added to the
+#         string table.
+#   0x06: string, as a varint index into the string table
+#   0x07: array: values follow, until an end tag
+#   0x08: object: alternating string keys and values follow, until an end tag
+#   0x09: end of array/object
+#
+# Varints are little-endian base-128, with the high bit set on all but the
+# last byte.  Run directly, this converts between JSON and the binary format.
+
+import json
+import mmap
+import struct
+
+magic = b'UBC1'
+
+# Filename extension used for the binary format
+extension = 'ubc'
+
+TAG_NULL = 0x00
+TAG_FALSE = 0x01
+TAG_TRUE = 0x02
+TAG_INTEGER = 0x03
+TAG_FLOAT = 0x04
+TAG_STRING = 0x05
+TAG_STRING_REF = 0x06
+TAG_ARRAY = 0x07
+TAG_OBJECT = 0x08
+TAG_END = 0x09
+
+_unpack_double = struct.Struct('<d').unpack_from
+_pack_double = struct.Struct('<d').pack
+
+def _reader(data):
+    """
+    Returns a function which decodes the value at a given offset in `data`,
+    returning it along with the offset just past it.  Values have to be read
+    in order, since strings are stored by reference to earlier ones.
+    """
+    strings = []
+    add_string = strings.append
+
+    def read_varint(pos):
+        result = 0
+        shift = 0
+        while True:
+            byte = data[pos]
+            pos += 1
+            result |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return result, pos
+            shift += 7
+
+    # Returns the value at `pos` along with the position after it.  Checks
+    # are ordered roughly by how common each tag is, and single-byte varints
+    # (by far the most common) are special-cased.
+    def read(pos):
+        tag = data[pos]
+        pos += 1
+        if tag == TAG_STRING_REF:
+            index = data[pos]
+            if index < 0x80:
+                return strings[index], pos+1
+            index, pos = read_varint(pos)
+            return strings[index], pos
+        if tag == TAG_OBJECT:
+            obj = {}
+            while data[pos] != TAG_END:
+                key, pos = read(pos)
+                obj[key], pos = read(pos)
+            return obj, pos+1
+        if tag == TAG_INTEGER:
+            raw = data[pos]
+            if raw < 0x80:
+                pos += 1
+            else:
+                raw, pos = read_varint(pos)
+            return (raw >> 1) ^ -(raw & 1), pos
+        if tag == TAG_STRING:
+            length = data[pos]
+            if length < 0x80:
+                pos += 1
+            else:
+                length, pos = read_varint(pos)
+            value = data[pos:pos+length].decode('utf-8')
+            add_string(value)
+            return value, pos+length
+        if tag == TAG_ARRAY:
+            arr = []
+            while data[pos] != TAG_END:
+                value, pos = read(pos)
+                arr.append(value)
+            return arr, pos+1
+        if tag == TAG_FLOAT:
+            return _unpack_double(data, pos)[0], pos+8
+        if tag == TAG_NULL:
+            return None, pos
+        if tag == TAG_FALSE:
+            return False, pos
+        if tag == TAG_TRUE:
+            return True, pos
+        raise ValueError(f'Unknown tag 0x{tag:02X} at offset {pos-1}')
+
+    return read
+
+def loads(data):
+    """
+    Decodes the given binary-format `bytes`, returning the same structure
+    that `json.loads()` would for the equivalent JSON.
+    """
+    if data[:4] != magic:
+        raise ValueError('Not a serialized bytecode file (bad magic)')
+    value, pos = _reader(data)(4)
+    if pos != len(data):
+        raise ValueError(f'Unexpected trailing data at offset {pos}')
+    return value
+
+def load(filename):
+    """
+    Reads the given binary-format file.
+    """
+    with open(filename, 'rb') as df:
+        return loads(df.read())
+
+def iterloads(data):
+    """
+    Decodes the given binary-format `bytes`, which must hold an array (as
+    serialized scripts do), yielding its elements one at a time rather than
+    building the whole list.
+    """
+    if data[:4] != magic:
+        raise ValueError('Not a serialized bytecode file (bad magic)')
+    if data[4] != TAG_ARRAY:
+        raise ValueError('Top-level value is not an array')
+    read = _reader(data)
+    pos = 5
+    while data[pos] != TAG_END:
+        value, pos = read(pos)
+        yield value
+    if pos+1 != len(data):
+        raise ValueError(f'Unexpected trailing data at offset {pos+1}')
+
+def iterload(filename):
+    """
+    Reads the given binary-format file, which must hold an array, yielding
+    its elements one at a time.  The file is memory-mapped rather than read
+    in, so only the elements still in use take up any memory.
+    """
+    with open(filename, 'rb') as df:
+        with mmap.mmap(df.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            yield from iterloads(data)
+
+def dumps(obj):
+    """
+    Encodes the given JSON-compatible structure into the binary format,
+    returning `bytes`.
+    """
+    out = bytearray(magic)
+    strings = {}
+
+    def write_varint(value):
+        while value >= 0x80:
+            out.append((value & 0x7F) | 0x80)
+            value >>= 7
+        out.append(value)
+
+    def write_string(value):
+        index = strings.get(value)
+        if index is None:
+            strings[value] = len(strings)
+            encoded = value.encode('utf-8')
+            out.append(TAG_STRING)
+            write_varint(len(encoded))
+            out.extend(encoded)
+        else:
+            out.append(TAG_STRING_REF)
+            write_varint(index)
+
+    def write(value):
+        if value is None:
+            out.append(TAG_NULL)
+        elif value is True:
+            out.append(TAG_TRUE)
+        elif value is False:
+            out.append(TAG_FALSE)
+        elif isinstance(value, int):
+            out.append(TAG_INTEGER)
+            write_varint(value*2 if value >= 0 else -value*2-1)
+        elif isinstance(value, float):
+            out.append(TAG_FLOAT)
+            out.extend(_pack_double(value))
+        elif isinstance(value, str):
+            write_string(value)
+        elif isinstance(value, (list, tuple)):
+            out.append(TAG_ARRAY)
+            for item in value:
+                write(item)
+            out.append(TAG_END)
+        elif isinstance(value, dict):
+            out.append(TAG_OBJECT)
+            for key, item in value.items():
+                write_string(key)
+                write(item)
+            out.append(TAG_END)
+        else:
+            raise TypeError(f'Cannot encode {type(value).__name__}')
+
+    write(obj)
+    return bytes(out)
+
+def dump(obj, filename):
+    """
+    Writes the given JSON-compatible structure to a binary-format file.
+    """
+    with open(filename, 'wb') as odf:
+        odf.write(dumps(obj))
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+            description='Convert serialized bytecode between JSON and the compact binary format',
+            )
+
+    parser.add_argument('infile',
+            help='File to convert.  Binary files are converted to JSON, and vice versa.',
+            )
+
+    parser.add_argument('outfile',
+            help='Filename to write to',
+            )
+
+    args = parser.parse_args()
+
+    with open(args.infile, 'rb') as df:
+        data = df.read()
+    if data[:4] == magic:
+        with open(args.outfile, 'w', encoding='utf-8') as odf:
+            json.dump(loads(data), odf, indent=2)
+    else:
+        dump(json.loads(data), args.outfile)
+
+if __name__ == '__main__':
+    main()
@@ -25,56 +25,905 @@
 
 # Initial Imports
 import os
-import clr
 import sys
+import glob
+import json
+import time
+import base64
+import shutil
+import hashlib
+import tempfile
 import argparse
-import pythonnet
+import threading
+import contextlib
+import socketserver
+import multiprocessing
+import concurrent.futures
+
+import kismetbin
 
 # Load UAssetAPI.  We're attempting to be clever here.  Perhaps that will
 # shoot us in the foot!  To hardcode the directory where UAssetAPI.dll is
 # stored, rather than searching for it, set `dll_dir_override`
 dll_dir_override = None
-if dll_dir_override:
-    dirs_to_search = [dll_dir_override]
-else:
-    my_dir = os.path.dirname(os.path.realpath(__file__))
-    dirs_to_search = []
-    dirs_to_search.append(my_dir)
-    dirs_to_search.append(os.path.realpath(os.path.join(my_dir, '..', 'UAssetAPI', 'bin', 'Debug', 'netstandard2.0', 'publish')))
-    dirs_to_search.append(os.path.realpath(os.path.join(my_dir, '..', 'UAssetAPI', 'bin', 'Release', 'netstandard2.0', 'publish')))
-dll_found = False
-for dir_name in dirs_to_search:
-    if os.path.exists(os.path.join(dir_name, 'UAssetAPI.dll')):
-        print(f'Loading UAssetAPI.dll from: {dir_name}')
-        clr.AddReference(os.path.join(dir_name, 'UAssetAPI'))
-        dll_found = True
-        break
-if not dll_found:
+
+# The file extensions we consider to be UE4 objects
+obj_exts = {'uasset', 'umap'}
+
+# The engine version to use when one isn't specified
+default_engine_version = 'VER_UE4_20'
+
+# Default location and size cap (in MB) for the serialization cache
+default_cache_dir = os.path.join(
+        os.environ.get('XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache')),
+        'uassetapi',
+        'serialize-ubergraph',
+        )
+default_cache_size = 1024
+
+# This gets populated by `load_uassetapi()`.  The CLR isn't loaded until it's
+# actually needed, so that the parent process in batch mode (which only hands
+# out work) doesn't have to pay for it.
+UAssetAPI = None
+
+# Guards loading the CLR, when worker threads are in use
+_load_lock = threading.Lock()
+
+# Whether `load_uassetapi()` reports which DLL it's loading, by default.  Batch
+# workers turn this off, since every one of them would otherwise report it.
+announce_dll_load = True
+
+# Whether to only parse the exports which can contain bytecode (Functions and
+# blueprint classes).  Everything else in the object is left unparsed, which
+# makes a big difference on large maps.  Turned on with `--lazy`.
+lazy_loading = False
+
+# Whether UAssetAPI should memory-map objects rather than reading them into
+# memory.  Turned on with `--mmap`.
+memory_mapped_input = False
+
+# The format serializations get written in: `json`, or `binary` for the compact
+# format described in `kismetbin.py`.  Set with `--format`.
+output_format = 'json'
+
+# Whether to have UAssetAPI time each phase of reading an object (and each
+# type of export), printing the breakdown after the object is loaded.  Turned
+# on with `--profile`.
+profile_reads = False
+
+# Whether objects loaded by this process should share a single pool of name
+# map strings (a `UAssetAPI.NameInternPool`), so that names common to many
+# objects are only kept in memory once.  Turned on with `--intern`.  The pool
+# itself gets created along with the first object that's loaded.
+intern_names = False
+_name_pool = None
+
+# Filename extensions for each output format
+format_exts = {
+        'json': 'json',
+        'binary': kismetbin.extension,
+        }
+
+def load_serialization(filename):
+    """
+    Reads a serialization written by this script, in either format.
+    """
+    if filename.endswith(f'.{kismetbin.extension}'):
+        return kismetbin.load(filename)
+    with open(filename, encoding='utf-8') as df:
+        return json.load(df)
+
+def find_uassetapi_dir():
+    """
+    Returns the directory containing UAssetAPI.dll, or `None` if it couldn't
+    be found (in which case a warning will have been printed).
+    """
+    if dll_dir_override:
+        dirs_to_search = [dll_dir_override]
+    else:
+        my_dir = os.path.dirname(os.path.realpath(__file__))
+        dirs_to_search = []
+        dirs_to_search.append(my_dir)
+        dirs_to_search.append(os.path.realpath(os.path.join(my_dir, '..', 'UAssetAPI', 'bin', 'Debug', 'netstandard2.0', 'publish')))
+        dirs_to_search.append(os.path.realpath(os.path.join(my_dir, '..', 'UAssetAPI', 'bin', 'Release', 'netstandard2.0', 'publish')))
+    for dir_name in dirs_to_search:
+        if os.path.exists(os.path.join(dir_name, 'UAssetAPI.dll')):
+            return dir_name
     print('WARNING: Could not find UAssetAPI.dll - Looked in the following places:')
     for dir_name in dirs_to_search:
         print(f' -> {dir_name}')
-import UAssetAPI
+    return None
+
+def load_uassetapi(verbose=None):
+    """
+    Loads the CLR and UAssetAPI.dll into the current process, if that hasn't
+    already been done, and returns the `UAssetAPI` namespace.  Subsequent calls
+    are free, so it's safe to call this from anything that needs the DLL.
+    """
+    global UAssetAPI
+    if UAssetAPI is not None:
+        return UAssetAPI
+
+    with _load_lock:
+        if UAssetAPI is not None:
+            return UAssetAPI
+        import clr
+        dir_name = find_uassetapi_dir()
+        if dir_name is not None:
+            if verbose or (verbose is None and announce_dll_load):
+                print(f'Loading UAssetAPI.dll from: {dir_name}')
+            clr.AddReference(os.path.join(dir_name, 'UAssetAPI'))
+        import UAssetAPI as uassetapi
+        UAssetAPI = uassetapi
+    return UAssetAPI
+
+def _is_bytecode_export_class(class_type):
+    """
+    Export filter used when `lazy_loading` is enabled: only Function and
+    blueprint class exports can contain bytecode.
+    """
+    class_type = str(class_type)
+    return class_type == 'Function' or class_type.endswith('BlueprintGeneratedClass')
+
+def load_asset(filename, engine_version=default_engine_version):
+    """
+    Loads the given object with UAssetAPI, returning the `UAsset`.  If
+    `lazy_loading` is enabled, only exports which can contain bytecode get
+    parsed; UAssetAPI will load any others on demand.  If `memory_mapped_input`
+    is enabled, the object is memory-mapped instead of being copied into
+    memory.  If `profile_reads` is enabled, a breakdown of where the time went
+    while reading is printed afterwards, and is left in the asset's `Profile`.
+    """
+    load_uassetapi()
+    ass = UAssetAPI.UAsset(getattr(UAssetAPI.UnrealTypes.EngineVersion, engine_version))
+    ass.FilePath = filename
+    ass.UseMemoryMappedInput = memory_mapped_input
+    if lazy_loading:
+        import System
+        ass.ExportLoadFilter = System.Func[UAssetAPI.UnrealTypes.FName, System.Boolean](_is_bytecode_export_class)
+    if profile_reads:
+        ass.Profile = UAssetAPI.AssetReadProfile()
+    if intern_names:
+        ass.NamePool = get_name_pool()
+    ass.Read(ass.PathToReader(filename))
+    if profile_reads:
+        print(f'Read profile for {filename}:\n{ass.Profile}')
+    return ass
+
+def get_name_pool():
+    """
+    Returns this process's shared `NameInternPool`, creating it if need be.
+    """
+    global _name_pool
+    if _name_pool is None:
+        with _load_lock:
+            if _name_pool is None:
+                _name_pool = load_uassetapi().NameInternPool()
+    return _name_pool
+
+def get_intern_stats():
+    """
+    Returns a dict of statistics from this process's `NameInternPool`, or
+    `None` if nothing has been loaded with one yet.
+    """
+    if _name_pool is None:
+        return None
+    return {
+            'lookups': _name_pool.Lookups,
+            'hits': _name_pool.Hits,
+            'saved': _name_pool.BytesSaved,
+            'count': _name_pool.Count,
+            'retained': _name_pool.BytesRetained,
+            }
+
+def report_interning(all_stats, file=None):
+    """
+    Reports on how much name interning saved, given a list of the dicts
+    returned by `get_intern_stats()` (one per process).
+    """
+    all_stats = [stats for stats in all_stats if stats is not None]
+    if not all_stats:
+        return
+    totals = {key: sum(stats[key] for stats in all_stats) for key in all_stats[0]}
+    print('Name interning: {} of {} name map strings were duplicates, saving about {:0.2f} MB ({} distinct strings kept in {} pool(s), about {:0.2f} MB)'.format(
+        totals['hits'],
+        totals['lookups'],
+        totals['saved']/1048576,
+        totals['count'],
+        len(all_stats),
+        totals['retained']/1048576,
+        ), file=file)
+
+def net_bytes(array):
+    """
+    Copies a .NET `byte[]` into a Python `bytes`.  Recent pythonnet versions
+    expose arrays through the buffer protocol, so this is a single memory
+    copy; older ones would otherwise convert the array one element at a
+    time, so for those the array is pinned and copied out with `ctypes`
+    instead.
+    """
+    try:
+        return memoryview(array).tobytes()
+    except TypeError:
+        pass
+    import ctypes
+    from System.Runtime.InteropServices import GCHandle, GCHandleType
+    handle = GCHandle.Alloc(array, GCHandleType.Pinned)
+    try:
+        return ctypes.string_at(handle.AddrOfPinnedObject().ToInt64(), array.Length)
+    finally:
+        handle.Free()
+
+def get_script_batch(ass, path_format=None, raw_path_format=None):
+    """
+    Serializes the bytecode of every export in the given `UAsset` which has
+    any, using a single call into UAssetAPI rather than visiting each export
+    from Python (where every attribute access has to cross over into the CLR).
+    Returns a list of `(index, name, serialization, raw_bytecode)` tuples,
+    with the serialization as a JSON string and the raw bytecode as `bytes`.
+
+    If `path_format` is given, each serialization is instead written out by
+    UAssetAPI (in `output_format`) to `path_format` formatted with the
+    export's index and name -- as a .NET format string, so `{0:D3}` rather
+    than `{0:03d}` -- and the filename written takes the place of the
+    serialization in the returned tuples.  If `raw_path_format` is given as
+    well, UAssetAPI also writes each export's raw bytecode to the path it
+    gives.
+    """
+    serializer = UAssetAPI.Kismet.KismetSerializerContext(ass)
+    if path_format is None:
+        batch = UAssetAPI.Kismet.KismetScriptBatch.Serialize(serializer)
+    else:
+        batch = UAssetAPI.Kismet.KismetScriptBatch.SerializeToFiles(serializer, path_format, output_format == 'binary', raw_path_format)
+    manifest = json.loads(str(batch.Manifest))
+    if not manifest:
+        return []
+    if path_format is None:
+        serializations = str(batch.Scripts).split('\0')
+    else:
+        serializations = [export['path'] for export in manifest]
+    raw = net_bytes(batch.Raw)
+    return [(export['index'],
+            export['name'],
+            serialization,
+            raw[export['offset']:export['offset']+export['length']])
+            for export, serialization in zip(manifest, serializations)]
 
-def get_serializations(filename):
+def get_serializations(filename, engine_version=default_engine_version):
     """
-    Given a filename, yields tuples containing the following:
+    Given a filename, returns a list of tuples containing the following:
        1. Export index (1-indexed, not 0-indexed)
        2. Export Name
-       3. Serialized Ubergraph Bytecode
-       4. "Raw" on-disk Bytecode (will not match in-memory bytecode!)
+       3. Serialized Ubergraph Bytecode, as a JSON string
+       4. "Raw" on-disk Bytecode, as `bytes` (will not match in-memory bytecode!)
+    """
+    return get_script_batch(load_asset(filename, engine_version))
+
+def hash_file(filename, hasher=None):
+    """
+    Feeds the contents of the given file into `hasher` (a new SHA-256 by
+    default), and returns the hasher.  The file is read in chunks, so large
+    maps are never held in memory all at once.
+    """
+    if hasher is None:
+        hasher = hashlib.sha256()
+    with open(filename, 'rb') as df:
+        for chunk in iter(lambda: df.read(1 << 20), b''):
+            hasher.update(chunk)
+    return hasher
+
+def get_library_hash():
+    """
+    Returns the SHA-256 hex digest of the UAssetAPI.dll which would be used.
+    This doesn't require loading the DLL.
+    """
+    dir_name = find_uassetapi_dir()
+    if dir_name is None:
+        raise RuntimeError('Could not find UAssetAPI.dll')
+    return hash_file(os.path.join(dir_name, 'UAssetAPI.dll')).hexdigest()
+
+def get_library_version(cache_dir):
+    """
+    Returns a string identifying the UAssetAPI.dll which would be used, for
+    use in cache keys.  This is the UAssetAPI commit (`UAPUtils.CurrentCommit`)
+    plus a hash of the DLL itself, since local builds may not have a commit
+    baked in (or may have uncommitted changes).  Finding out the commit
+    requires loading the DLL, so the result is remembered in `cache_dir`,
+    keyed on the DLL hash -- that way runs which are satisfied entirely from
+    the cache never have to load the CLR at all.
+    """
+    dll_hash = get_library_hash()
+
+    versions_file = os.path.join(cache_dir, 'library-versions.json')
+    try:
+        with open(versions_file) as df:
+            versions = json.load(df)
+    except (OSError, ValueError):
+        versions = {}
+    if dll_hash not in versions:
+        load_uassetapi()
+        versions[dll_hash] = str(UAssetAPI.UAPUtils.CurrentCommit)
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(f'{versions_file}.{os.getpid()}', 'w') as odf:
+            json.dump(versions, odf, indent=2)
+        os.replace(f'{versions_file}.{os.getpid()}', versions_file)
+    return f'{versions[dll_hash]}:{dll_hash}'
+
+class SerializationCache:
+    """
+    On-disk cache of bytecode serializations, so that objects which haven't
+    changed since the last run don't have to be parsed again.  Entries are
+    keyed on a hash of the object's `.uasset`+`.uexp` contents, the engine
+    version, and the UAssetAPI library version, and contain the JSON
+    serializations and raw bytecode for every export which has bytecode.
+
+    Each entry is a directory containing an `index.json` plus one
+    serialization (`.json`, or `.ubc` in binary format) and one `.raw` file
+    per export.  The mtime of `index.json` is bumped
+    whenever an entry is used, and `trim()` evicts the least-recently-used
+    entries once the cache grows past `max_size` bytes.
+
+    Several processes (or threads, each with their own `SerializationCache`)
+    can safely share a cache: entries are written into a
+    temporary directory and renamed into place.
     """
-    ass = UAssetAPI.UAsset(
-            path=filename,
-            engineVersion=UAssetAPI.UnrealTypes.EngineVersion.VER_UE4_20,
+
+    def __init__(self, cache_dir, max_size, library_version):
+        self.cache_dir = cache_dir
+        self.entries_dir = os.path.join(cache_dir, 'entries')
+        self.max_size = max_size
+        self.library_version = library_version
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+        os.makedirs(self.entries_dir, exist_ok=True)
+
+    def key_for(self, filename, engine_version):
+        """
+        Computes the cache key for the given (already-resolved) object
+        filename.
+        """
+        hasher = hashlib.sha256()
+        hasher.update(f'{engine_version}\0{self.library_version}\0{output_format}\0'.encode('utf-8'))
+        return hash_object(filename, hasher).hexdigest()
+
+    def _entry_dir(self, key):
+        return os.path.join(self.entries_dir, key[:2], key)
+
+    def get(self, key):
+        """
+        Returns a list of `(index, name, json_filename, raw_bytecode)` tuples
+        for the given key, or `None` if it's not in the cache.  The JSON
+        serializations are left on disk, to be copied wherever they're needed.
+        """
+        entry_dir = self._entry_dir(key)
+        index_file = os.path.join(entry_dir, 'index.json')
+        try:
+            with open(index_file) as df:
+                index = json.load(df)
+            serializations = []
+            for export in index['exports']:
+                json_filename = os.path.join(entry_dir, f'{export["index"]:03d}.{format_exts[output_format]}')
+                if not os.path.exists(json_filename):
+                    raise OSError(f'Missing cached serialization: {json_filename}')
+                with open(os.path.join(entry_dir, f'{export["index"]:03d}.raw'), 'rb') as df:
+                    raw = df.read()
+                serializations.append((export['index'], export['name'], json_filename, raw))
+            os.utime(index_file)
+        except (OSError, ValueError, KeyError):
+            self.stats['misses'] += 1
+            return None
+        self.stats['hits'] += 1
+        return serializations
+
+    def put(self, key, filename, serializations):
+        """
+        Stores a list of `(index, name, json_filename, raw_bytecode)` tuples
+        in the cache.  The JSON files are copied into the cache.
+        """
+        entry_dir = self._entry_dir(key)
+        os.makedirs(os.path.dirname(entry_dir), exist_ok=True)
+        tmp_dir = f'{entry_dir}.tmp{os.getpid()}-{threading.get_ident()}'
+        os.makedirs(tmp_dir, exist_ok=True)
+        size = 0
+        exports = []
+        for index, name, json_filename, raw in serializations:
+            shutil.copyfile(json_filename, os.path.join(tmp_dir, f'{index:03d}.{format_exts[output_format]}'))
+            size += os.path.getsize(json_filename)
+            with open(os.path.join(tmp_dir, f'{index:03d}.raw'), 'wb') as odf:
+                size += odf.write(raw)
+            exports.append({'index': index, 'name': name})
+        with open(os.path.join(tmp_dir, 'index.json'), 'w') as odf:
+            json.dump({
+                'source': filename,
+                'library_version': self.library_version,
+                'size': size,
+                'exports': exports,
+                }, odf, indent=2)
+        try:
+            os.rename(tmp_dir, entry_dir)
+        except OSError:
+            # Someone else stored the same content in the meantime
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def trim(self):
+        """
+        Evicts least-recently-used entries until the cache fits within its
+        size cap.
+        """
+        entries = []
+        total_size = 0
+        for prefix in os.listdir(self.entries_dir):
+            prefix_dir = os.path.join(self.entries_dir, prefix)
+            for key in os.listdir(prefix_dir):
+                index_file = os.path.join(prefix_dir, key, 'index.json')
+                try:
+                    with open(index_file) as df:
+                        size = json.load(df)['size']
+                    mtime = os.path.getmtime(index_file)
+                except (OSError, ValueError, KeyError):
+                    continue
+                entries.append((mtime, size, os.path.join(prefix_dir, key)))
+                total_size += size
+        entries.sort()
+        for mtime, size, entry_dir in entries:
+            if total_size <= self.max_size:
+                break
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total_size -= size
+            self.stats['evictions'] += 1
+        return total_size
+
+    def report(self, file=None):
+        """
+        Trims the cache and prints out statistics for this run.
+        """
+        total_size = self.trim()
+        lookups = self.stats['hits'] + self.stats['misses']
+        print('Cache: {} hit(s), {} miss(es) ({:0.1f}% hit rate), {} eviction(s), {:0.1f}/{:0.1f} MB used'.format(
+            self.stats['hits'],
+            self.stats['misses'],
+            self.stats['hits']/lookups*100 if lookups else 0,
+            self.stats['evictions'],
+            total_size/1048576,
+            self.max_size/1048576,
+            ), file=file)
+
+def write_serializations(filename, filename_base, engine_version=default_engine_version, cache=None, raw=False):
+    """
+    Writes the serialization of each export with bytecode in the given
+    (already-resolved) object to `{filename_base}-ubergraph-{index}-{name}.json`
+    (or `.ubc`, if `output_format` is `binary`), and if `raw` is set, its raw
+    bytecode to `{filename_base}-ubergraph-{index}-{name}.raw`.
+    Each serialization (and raw dump) is written straight to disk by UAssetAPI,
+    rather than being built up in memory and passed back to us.  If
+    `cache` is given, it'll be checked first (and updated on a miss), so that
+    unchanged objects don't have to be parsed at all.
+
+    Returns a list of `(index, name, json_filename, raw_bytecode)` tuples, with
+    the raw bytecode as `bytes`.
+    """
+    if cache is not None:
+        key = cache.key_for(filename, engine_version)
+        cached = cache.get(key)
+        if cached is not None:
+            written = []
+            for index, name, cached_filename, raw_bytecode in cached:
+                to_filename = f'{filename_base}-ubergraph-{index:03d}-{name}.{format_exts[output_format]}'
+                shutil.copyfile(cached_filename, to_filename)
+                if raw:
+                    with open(f'{filename_base}-ubergraph-{index:03d}-{name}.raw', 'wb') as odf:
+                        odf.write(raw_bytecode)
+                written.append((index, name, to_filename, raw_bytecode))
+            return written
+
+    # Format strings for UAssetAPI, so any braces in the filename need escaping
+    path_format = '{}-ubergraph-{{0:D3}}-{{1}}'.format(filename_base.replace('{', '{{').replace('}', '}}'))
+    written = get_script_batch(load_asset(filename, engine_version),
+            f'{path_format}.{format_exts[output_format]}',
+            f'{path_format}.raw' if raw else None,
             )
 
-    UAssetAPI.Kismet.KismetSerializer.asset = ass
-    for idx, export in enumerate(ass.Exports):
-        if hasattr(export, 'ScriptBytecode'):
-            if export.ScriptBytecode:
-                # Attempt serialization (return is an object, but stringifies nicely)
-                serialized = UAssetAPI.Kismet.KismetSerializer.SerializeScript(export.ScriptBytecode)
-                yield (idx+1, export.ObjectName, serialized, export.ScriptBytecodeRaw)
+    if cache is not None:
+        cache.put(key, filename, written)
+    return written
+
+def resolve_filename(filename):
+    """
+    Given a user-supplied filename, which may be missing its extension (or
+    only have a partial one, as often happens with tab-completion), returns
+    a tuple of the real filename and the filename without its extension.
+    """
+    _, filename_alone = os.path.split(filename)
+    if '.' in filename_alone:
+        filename_base, ext = filename.rsplit('.', 1)
+    else:
+        filename_base = filename
+        ext = ''
+    if ext not in obj_exts:
+        for ext in obj_exts:
+            if os.path.exists(f'{filename_base}.{ext}'):
+                filename = f'{filename_base}.{ext}'
+                break
+    if not os.path.exists(filename):
+        raise RuntimeError(f'Not found: {filename}')
+    return filename, filename_base
+
+def find_objects(paths):
+    """
+    Given a list of paths (which may be directories, glob patterns, or
+    individual object filenames), returns a sorted list of all the object
+    files they refer to.  Directories are searched recursively.
+    """
+    found = set()
+    for path in paths:
+        if os.path.isdir(path):
+            matches = [path]
+        elif glob.has_magic(path):
+            matches = glob.glob(path, recursive=True)
+        else:
+            found.add(resolve_filename(path)[0])
+            continue
+        for match in matches:
+            if os.path.isdir(match):
+                for dirpath, dirnames, filenames in os.walk(match):
+                    for filename in filenames:
+                        if filename.rsplit('.', 1)[-1] in obj_exts:
+                            found.add(os.path.join(dirpath, filename))
+            elif match.rsplit('.', 1)[-1] in obj_exts:
+                found.add(match)
+    return sorted(found)
+
+def hash_object(filename, hasher=None):
+    """
+    Feeds the contents of the given (already-resolved) object, plus its
+    `.uexp` file if one exists, into `hasher` (a new SHA-256 by default),
+    and returns the hasher.
+    """
+    if hasher is None:
+        hasher = hashlib.sha256()
+    uexp = f'{filename.rsplit(".", 1)[0]}.uexp'
+    for part in [filename, uexp]:
+        if os.path.exists(part):
+            hasher.update(f'{os.path.getsize(part)}\0'.encode('utf-8'))
+            hash_file(part, hasher)
+        else:
+            hasher.update(b'-\0')
+    return hasher
+
+def object_size(filename):
+    """
+    Returns the on-disk size of the given object, including its `.uexp`
+    file, if one exists.
+    """
+    size = os.path.getsize(filename)
+    uexp = f'{filename.rsplit(".", 1)[0]}.uexp'
+    if os.path.exists(uexp):
+        size += os.path.getsize(uexp)
+    return size
+
+def serialize_file(filename, raw=False, verbose=True,
+        engine_version=default_engine_version, cache=None):
+    """
+    Serializes all the bytecode found in the given object, writing the results
+    alongside it.  Returns a list of the filenames which were written (not
+    including raw bytecode dumps).
+    """
+    filename, filename_base = resolve_filename(filename)
+    written = []
+    for index, name, to_filename, _ in write_serializations(filename, filename_base, engine_version, cache, raw):
+        if verbose:
+            print(f'Wrote to: {to_filename}')
+            if raw:
+                print(f'Wrote raw to: {filename_base}-ubergraph-{index:03d}-{name}.raw')
+
+        written.append(to_filename)
+    return written
+
+# Per-worker state for batch mode, set up by `_batch_worker_init()`.  This is
+# thread-local so that worker threads each get their own cache handle.
+_worker = threading.local()
+
+def _batch_worker_init(engine_version=default_engine_version, cache_args=None, lazy=False, mmap=False, fmt='json', profile=False, intern=False):
+    """
+    Initializer for batch-mode workers (processes or threads).  Each worker
+    process loads the CLR and UAssetAPI.dll at most once, and then re-uses it
+    for every asset that gets handed to it.  When a cache is in use, loading
+    is put off until the first cache miss, since a fully-cached run doesn't
+    need the CLR at all.
+    """
+    global announce_dll_load, lazy_loading, memory_mapped_input, output_format, profile_reads, intern_names
+    announce_dll_load = False
+    lazy_loading = lazy
+    memory_mapped_input = mmap
+    output_format = fmt
+    profile_reads = profile
+    intern_names = intern
+    _worker.engine_version = engine_version
+    if cache_args is None:
+        _worker.cache = None
+        load_uassetapi()
+    else:
+        _worker.cache = SerializationCache(*cache_args)
+
+def _batch_worker(job):
+    """
+    Processes a single object in batch mode.  Returns a dict describing the
+    results, since exceptions raised in here would otherwise abort the whole
+    pool.
+    """
+    filename, raw = job
+    result = {
+            'filename': filename,
+            'size': object_size(filename),
+            'count': 0,
+            'error': None,
+            'cache_hit': None,
+            'pid': os.getpid(),
+            'interning': None,
+            }
+    if _worker.cache is not None:
+        hits = _worker.cache.stats['hits']
+    start = time.perf_counter()
+    try:
+        result['count'] = len(serialize_file(filename,
+            raw=raw,
+            verbose=False,
+            engine_version=_worker.engine_version,
+            cache=_worker.cache,
+            ))
+        if _worker.cache is not None:
+            result['cache_hit'] = _worker.cache.stats['hits'] > hits
+    except Exception as e:
+        result['error'] = f'{type(e).__name__}: {e}'
+    result['elapsed'] = time.perf_counter() - start
+    if intern_names:
+        result['interning'] = get_intern_stats()
+    return result
+
+def run_batch(filenames, raw=False, jobs=None,
+        engine_version=default_engine_version, cache=None, threads=False):
+    """
+    Serializes all the given objects, spread out across `jobs` worker
+    processes (defaulting to one per CPU), and reports on throughput.  With
+    `threads`, the workers are threads inside this process instead, sharing
+    a single CLR; pythonnet releases the GIL while UAssetAPI is working, so
+    they can parse and serialize in parallel.  If `cache` is given, each
+    worker opens its own handle on the same cache directory, and their hits
+    and misses are added into `cache.stats`.  Returns the number of objects
+    which failed to process.
+    """
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    jobs = max(1, min(jobs, len(filenames)))
+    work = [(filename, raw) for filename in filenames]
+    if cache is None:
+        init_args = (engine_version, None, lazy_loading, memory_mapped_input, output_format, profile_reads, intern_names)
+    else:
+        init_args = (engine_version, (cache.cache_dir, cache.max_size, cache.library_version), lazy_loading, memory_mapped_input, output_format, profile_reads, intern_names)
+
+    print('Processing {} objects with {} worker {}'.format(
+        len(filenames),
+        jobs,
+        'thread(s)' if threads else 'process(es)',
+        ))
+    start = time.perf_counter()
+    if jobs == 1:
+        _batch_worker_init(*init_args)
+        results = map(_batch_worker, work)
+        pool = None
+    elif threads:
+        pool = concurrent.futures.ThreadPoolExecutor(
+                max_workers=jobs,
+                initializer=_batch_worker_init,
+                initargs=init_args,
+                )
+        results = (future.result() for future in concurrent.futures.as_completed(
+            [pool.submit(_batch_worker, job) for job in work]))
+    else:
+        # The CLR does not survive being forked, so always spawn fresh
+        # interpreters for the workers, even where fork is the default.
+        pool = multiprocessing.get_context('spawn').Pool(
+                processes=jobs,
+                initializer=_batch_worker_init,
+                initargs=init_args,
+                )
+        results = pool.imap_unordered(_batch_worker, work)
+
+    total_files = 0
+    total_failed = 0
+    total_count = 0
+    total_size = 0
+    total_busy = 0
+    # Latest interning stats from each worker process (threads share a pool)
+    interning = {}
+    try:
+        for result in results:
+            total_files += 1
+            total_size += result['size']
+            total_busy += result['elapsed']
+            if result['interning'] is not None:
+                latest = interning.get(result['pid'])
+                if latest is None or result['interning']['lookups'] > latest['lookups']:
+                    interning[result['pid']] = result['interning']
+            if result['cache_hit'] is not None:
+                cache.stats['hits' if result['cache_hit'] else 'misses'] += 1
+            if result['error'] is None:
+                total_count += result['count']
+                print('{}: {} serialization(s) in {:0.1f}ms ({:0.2f} MB/s){}'.format(
+                    result['filename'],
+                    result['count'],
+                    result['elapsed']*1000,
+                    result['size']/1048576/max(result['elapsed'], 1e-9),
+                    ' [cached]' if result['cache_hit'] else '',
+                    ))
+            else:
+                total_failed += 1
+                print('{}: ERROR after {:0.1f}ms: {}'.format(
+                    result['filename'],
+                    result['elapsed']*1000,
+                    result['error'],
+                    ))
+    finally:
+        if threads and pool is not None:
+            pool.shutdown(cancel_futures=True)
+        elif pool is not None:
+            pool.close()
+            pool.join()
+    elapsed = time.perf_counter() - start
+
+    print('')
+    print(f'Processed {total_files} objects ({total_failed} failed), writing {total_count} serializations')
+    print('Wall time: {:0.2f}s ({:0.2f}s spent in workers)'.format(elapsed, total_busy))
+    print('Throughput: {:0.1f} objects/s, {:0.1f} serializations/s, {:0.2f} MB/s'.format(
+        total_files/max(elapsed, 1e-9),
+        total_count/max(elapsed, 1e-9),
+        total_size/1048576/max(elapsed, 1e-9),
+        ))
+    report_interning(interning.values())
+    return total_failed
+
+def warm_up():
+    """
+    Loads UAssetAPI and builds its property type registry ahead of time, so
+    that the first request handled by a server doesn't have to pay for it.
+    Any chatter from loading the DLL is sent to stderr, since stdout may be
+    the protocol channel.
+    """
+    with contextlib.redirect_stdout(sys.stderr):
+        load_uassetapi()
+    UAssetAPI.MainSerializer.InitializePropertyTypeRegistry()
+
+def handle_request(request, engine_version=default_engine_version, cache=None):
+    """
+    Handles a single server request (already decoded from JSON), returning
+    the response dict.  Supported requests:
+
+        {"cmd": "serialize", "path": "...", "raw": false, "inline": false}
+            Serializes the given object.  By default the serializations are
+            written alongside the object just like on the commandline, and
+            the response contains the filenames written.  With `inline`, the
+            serializations are returned in the response instead (raw
+            bytecode, if requested, is base64-encoded).  `cmd` may be
+            omitted for this one.
+        {"cmd": "ping"}
+        {"cmd": "shutdown"}
+
+    Any `id` key in the request is echoed back in the response.
+    """
+    response = {'id': request.get('id'), 'ok': True}
+    start = time.perf_counter()
+    try:
+        cmd = request.get('cmd', 'serialize')
+        if cmd == 'ping':
+            pass
+        elif cmd == 'shutdown':
+            response['shutdown'] = True
+        elif cmd == 'serialize':
+            if 'path' not in request:
+                raise RuntimeError('No path specified')
+            raw = bool(request.get('raw', False))
+            if request.get('inline', False):
+                filename, _ = resolve_filename(request['path'])
+                exports = []
+                with tempfile.TemporaryDirectory() as tmp_dir:
+                    tmp_base = os.path.join(tmp_dir, 'inline')
+                    for index, name, json_filename, raw_bytecode in write_serializations(filename, tmp_base, engine_version, cache):
+                        export = {
+                                'index': index,
+                                'name': name,
+                                'serialization': load_serialization(json_filename),
+                                }
+                        if raw:
+                            export['raw'] = base64.b64encode(raw_bytecode).decode('ascii')
+                        exports.append(export)
+                response['exports'] = exports
+            else:
+                response['files'] = serialize_file(request['path'],
+                        raw=raw,
+                        verbose=False,
+                        engine_version=engine_version,
+                        cache=cache,
+                        )
+        else:
+            raise RuntimeError(f'Unknown command: {cmd}')
+    except Exception as e:
+        response['ok'] = False
+        response['error'] = f'{type(e).__name__}: {e}'
+    response['elapsed_ms'] = round((time.perf_counter() - start)*1000, 3)
+    return response
+
+def serve_stream(infile, outfile, engine_version=default_engine_version, cache=None):
+    """
+    Reads JSON-lines requests from `infile`, writing one JSON-line response
+    to `outfile` for each.  Returns `True` if a shutdown was requested, or
+    `False` if we just ran out of input.
+    """
+    for line in infile:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError('Requests must be JSON objects')
+        except ValueError as e:
+            response = {'id': None, 'ok': False, 'error': f'Invalid request: {e}'}
+        else:
+            response = handle_request(request, engine_version, cache)
+            print('{}: {} ({:0.1f}ms)'.format(
+                request.get('cmd', 'serialize'),
+                request.get('path', '-'),
+                response['elapsed_ms'],
+                ), file=sys.stderr)
+        outfile.write(json.dumps(response) + '\n')
+        outfile.flush()
+        if response.get('shutdown'):
+            return True
+    return False
+
+class _ServerHandler(socketserver.StreamRequestHandler):
+    """
+    Handles a single connection to the Unix socket server.  Connections can
+    send as many requests as they like before disconnecting.
+    """
+
+    def handle(self):
+        infile = (line.decode('utf-8') for line in self.rfile)
+        outfile = _SocketWriter(self.wfile)
+        if serve_stream(infile, outfile, self.server.engine_version, self.server.cache):
+            self.server.shutdown_requested = True
+
+class _SocketWriter:
+    """
+    Minimal text wrapper around a socket's binary write file, for use with
+    `serve_stream()`.
+    """
+
+    def __init__(self, wfile):
+        self.wfile = wfile
+
+    def write(self, text):
+        self.wfile.write(text.encode('utf-8'))
+
+    def flush(self):
+        self.wfile.flush()
+
+def serve_socket(socket_path, engine_version=default_engine_version, cache=None):
+    """
+    Listens on the Unix socket at `socket_path` for JSON-lines requests
+    until a shutdown is requested.  Connections are handled one at a time.
+    """
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+    with socketserver.UnixStreamServer(socket_path, _ServerHandler) as server:
+        server.shutdown_requested = False
+        server.engine_version = engine_version
+        server.cache = cache
+        print(f'Listening on: {socket_path}', file=sys.stderr)
+        try:
+            while not server.shutdown_requested:
+                server.handle_request()
+        finally:
+            os.unlink(socket_path)
 
 def main():
 
@@ -92,45 +941,154 @@ def main():
             help='Show .NET runtime being used',
             )
 
+    parser.add_argument('-j', '--jobs',
+            type=int,
+            help='Number of workers to use when processing more than one object (defaults to the number of CPUs)',
+            )
+
+    parser.add_argument('--threads',
+            action='store_true',
+            help='Use worker threads inside a single process, rather than worker processes, in batch mode',
+            )
+
+    parser.add_argument('-e', '--engine-version',
+            type=str,
+            default=default_engine_version,
+            help=f'UAssetAPI EngineVersion to use when reading objects (defaults to {default_engine_version})',
+            )
+
+    parser.add_argument('-c', '--cache',
+            action='store_true',
+            help=f'Cache serializations, so that unchanged objects are not parsed again (stored in {default_cache_dir})',
+            )
+
+    parser.add_argument('--cache-dir',
+            type=str,
+            help='Cache serializations in the given directory (implies --cache)',
+            )
+
+    parser.add_argument('--cache-size',
+            type=int,
+            default=default_cache_size,
+            help=f'Maximum cache size in MB, after which least-recently-used entries are evicted (defaults to {default_cache_size})',
+            )
+
+    parser.add_argument('--lazy',
+            action='store_true',
+            help='Only parse the exports which can contain bytecode, rather than every export in the object (much quicker on large maps)',
+            )
+
+    parser.add_argument('--mmap',
+            action='store_true',
+            help='Memory-map objects rather than reading them into memory (helpful for very large maps)',
+            )
+
+    parser.add_argument('-f', '--format',
+            choices=['json', 'binary'],
+            default='json',
+            help='Format to write serializations in.  `binary` is a compact format which bytecode-to-dot.py can read much faster (see kismetbin.py)',
+            )
+
+    parser.add_argument('--profile',
+            action='store_true',
+            help='Report how long each phase of reading each object took (and how many bytes it covered), along with a breakdown by export type.  Objects served from the cache are not read, so are not reported.',
+            )
+
+    parser.add_argument('--intern',
+            action='store_true',
+            help='Share a single pool of name map strings between all the objects loaded by each process, and report how much memory that saved',
+            )
+
+    server_group = parser.add_mutually_exclusive_group()
+
+    server_group.add_argument('--serve',
+            action='store_true',
+            help='Run as a server, reading JSON-lines requests on stdin and writing responses to stdout',
+            )
+
+    server_group.add_argument('--socket',
+            type=str,
+            metavar='PATH',
+            help='Run as a server, listening for JSON-lines requests on the given Unix socket',
+            )
+
     parser.add_argument('filename',
             type=str,
-            nargs=1,
-            help='Filename to process',
+            nargs='*',
+            help='Filename to process.  Directories (searched recursively) and glob patterns will be processed in batch mode.',
             )
 
     args = parser.parse_args()
-    args.filename = args.filename[0]
+
+    global lazy_loading, memory_mapped_input, output_format, profile_reads, intern_names
+    lazy_loading = args.lazy
+    memory_mapped_input = args.mmap
+    output_format = args.format
+    profile_reads = args.profile
+    intern_names = args.intern
 
     if args.runtime:
-        print(pythonnet.get_runtime_info())
+        # stdout is reserved for responses when serving over stdin/stdout
+        with contextlib.redirect_stdout(sys.stderr if args.serve else sys.stdout):
+            load_uassetapi()
+            import pythonnet
+            print(pythonnet.get_runtime_info())
 
-    obj_exts = {'uasset', 'umap'}
-    _, filename_alone = os.path.split(args.filename)
-    if '.' in filename_alone:
-        filename_base, ext = args.filename.rsplit('.', 1)
+    if args.serve or args.socket:
+        if args.filename:
+            parser.error('filenames cannot be given in server mode')
+        if args.profile:
+            parser.error('--profile cannot be used in server mode')
+    elif not args.filename:
+        parser.error('at least one filename is required')
+
+    if args.cache or args.cache_dir:
+        cache_dir = args.cache_dir or default_cache_dir
+        with contextlib.redirect_stdout(sys.stderr if args.serve else sys.stdout):
+            library_version = get_library_version(cache_dir)
+        cache = SerializationCache(cache_dir, args.cache_size*1048576, library_version)
     else:
-        filename_base = args.filename
-        ext = ''
-    if ext not in obj_exts:
-        for ext in obj_exts:
-            if os.path.exists(f'{filename_base}.{ext}'):
-                args.filename = f'{filename_base}.{ext}'
-                break
-    if not os.path.exists(args.filename):
-        raise RuntimeError(f'Not found: {args.filename}')
+        cache = None
 
-    for index, name, serialization, raw in get_serializations(args.filename):
-        to_filename = f'{filename_base}-ubergraph-{index:03d}-{name}.json'
-        with open(to_filename, 'w') as odf:
-            odf.write(str(serialization))
-        print(f'Wrote to: {to_filename}')
+    if args.serve or args.socket:
+        warm_up()
+        if args.socket:
+            serve_socket(args.socket, args.engine_version, cache)
+        else:
+            print('Ready for requests on stdin', file=sys.stderr)
+            serve_stream(sys.stdin, sys.stdout, args.engine_version, cache)
+        if cache is not None:
+            cache.report(file=sys.stderr)
+        report_interning([get_intern_stats()], file=sys.stderr)
+        return
 
-        if args.raw:
-            raw_filename = f'{filename_base}-ubergraph-{index:03d}-{name}.raw'
-            with open(raw_filename, 'wb') as odf:
-                odf.write(bytes(raw))
-            print(f'Wrote raw to: {raw_filename}')
+    # A single object gets processed in-process, as it always has been.
+    # Anything more than that gets handed off to a pool of workers.
+    if len(args.filename) == 1 \
+            and not os.path.isdir(args.filename[0]) \
+            and not glob.has_magic(args.filename[0]):
+        serialize_file(args.filename[0],
+                raw=args.raw,
+                engine_version=args.engine_version,
+                cache=cache,
+                )
+        report_interning([get_intern_stats()])
+        failed = 0
+    else:
+        filenames = find_objects(args.filename)
+        if not filenames:
+            raise RuntimeError('No objects found to process')
+        failed = run_batch(filenames,
+                raw=args.raw,
+                jobs=args.jobs,
+                engine_version=args.engine_version,
+                cache=cache,
+                threads=args.threads,
+                )
+    if cache is not None:
+        cache.report()
+    if failed > 0:
+        sys.exit(1)
 
 if __name__ == '__main__':
     main()
-
@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+# vim: set expandtab tabstop=4 shiftwidth=4:
+
+# Copyright 2022 Christopher J Kucera
+# <cj@apocalyptech.com>
+# <https://apocalyptech.com/contact.php>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import os
+import re
+import sys
+import json
+import time
+import sqlite3
+import argparse
+import importlib.util
+
+# Our sibling scripts have dashes in their names, so they need to be
+# imported by hand.
+def _load_sibling(name, filename):
+    my_dir = os.path.dirname(os.path.realpath(__file__))
+    spec = importlib.util.spec_from_file_location(name, os.path.join(my_dir, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+serialize_ubergraph = _load_sibling('serialize_ubergraph', 'serialize-ubergraph.py')
+bytecode_to_dot = _load_sibling('bytecode_to_dot', 'bytecode-to-dot.py')
+
+# Bump this whenever the database layout (or what gets indexed) changes, to
+# start from scratch
+schema_version = 1
+
+# The kinds of reference we index
+kinds = ['call', 'read', 'write', 'cast', 'object']
+
+# Statement types which cast to another class, and the attribute holding
+# the class they cast to
+cast_types = [
+        (bytecode_to_dot.DynamicCast, 'to_class'),
+        (bytecode_to_dot.MetaCast, 'class_name'),
+        (bytecode_to_dot.ObjToInterfaceCast, 'to_class'),
+        (bytecode_to_dot.CrossInterfaceCast, 'to_class'),
+        (bytecode_to_dot.InterfaceToObjCast, 'to_class'),
+        ]
+
+# Characters which make a query a glob pattern rather than an exact match
+glob_chars = re.compile(r'[*?\[]')
+
+schema = """
+    create table meta (
+        key text primary key,
+        value text
+    );
+    create table objects (
+        id integer primary key,
+        path text unique not null,
+        hash text not null
+    );
+    create table refs (
+        object_id integer not null references objects(id) on delete cascade,
+        export_index integer not null,
+        export text not null,
+        statement integer,
+        kind text not null,
+        opcode text not null,
+        target text not null,
+        name text not null,
+        outer text
+    );
+    create index refs_name on refs (name, kind);
+    create index refs_target on refs (target, kind);
+    create index refs_object on refs (object_id);
+    """
+
+def short_name(target):
+    """
+    Returns the last component of the given object path or member name, so
+    that `/Game/Foo/Bar.Bar_C` and `SomeClass.SomeVar` can be found by just
+    `Bar_C` or `SomeVar`.
+    """
+    return re.split(r'[./:]', target)[-1]
+
+def find_references(statement, writing=False):
+    """
+    Yields a `(kind, opcode, target, outer)` tuple for every reference we
+    index within the given statement (including any nested expressions).
+    `writing` should be `True` if the statement is the destination of an
+    assignment.
+    """
+    if isinstance(statement, bytecode_to_dot.Function):
+        outer = getattr(statement, 'contextclass', None)
+        yield ('call', statement.type, statement.function, outer)
+    elif isinstance(statement, bytecode_to_dot._Variable):
+        # Local variables defined by FProperties have their pin type here
+        # instead of an outer
+        outer = statement.outer if isinstance(statement.outer, str) else None
+        yield ('write' if writing else 'read', statement.type, statement.full_name, outer)
+    elif isinstance(statement, bytecode_to_dot.LetValueOnPersistentFrame):
+        yield ('write', statement.type, statement.full_name, statement.outer)
+    elif isinstance(statement, bytecode_to_dot.ObjectConst):
+        yield ('object', statement.type, statement.object, None)
+    else:
+        for cast_type, attr in cast_types:
+            if isinstance(statement, cast_type):
+                yield ('cast', statement.type, getattr(statement, attr), None)
+                break
+
+    # Work out which of our children (if any) are being written to.  For
+    # something like `Foo.Bar = x`, it's the `Bar` inside the context that's
+    # written, while `Foo` is just read.
+    if isinstance(statement, bytecode_to_dot.Let):
+        written = statement.var
+    elif isinstance(statement, bytecode_to_dot.SetArray):
+        written = statement.left
+    elif writing and isinstance(statement, (bytecode_to_dot.Context, bytecode_to_dot.InterfaceContext)):
+        written = statement.expression
+    else:
+        written = None
+    for child in statement.children():
+        yield from find_references(child, child is written)
+
+class Index:
+    """
+    A SQLite database of every call, variable read/write, cast, and object
+    reference in the bytecode of a set of objects.  Objects are keyed on a
+    hash of their contents, so re-indexing only has to load the ones which
+    have changed.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.db = sqlite3.connect(filename)
+        self.db.execute('pragma foreign_keys = on')
+
+    def close(self):
+        self.db.close()
+
+    def get_meta(self, key):
+        try:
+            row = self.db.execute('select value from meta where key=?', (key,)).fetchone()
+        except sqlite3.OperationalError:
+            return None
+        return row[0] if row is not None else None
+
+    def prepare(self, engine_version):
+        """
+        Makes sure the database is ready for indexing, starting from scratch
+        if it's empty, was made by an older version of this script, or was
+        indexed with a different UAssetAPI or engine version.
+        """
+        settings = {
+                'schema_version': str(schema_version),
+                'library_hash': serialize_ubergraph.get_library_hash(),
+                'engine_version': engine_version,
+                }
+        current = {key: self.get_meta(key) for key in settings}
+        if current != settings:
+            if current['schema_version'] is not None:
+                print('NOTICE: UAssetAPI or settings have changed; rebuilding the index from scratch')
+            with self.db:
+                self.db.executescript("""
+                    drop table if exists refs;
+                    drop table if exists objects;
+                    drop table if exists meta;
+                    """)
+                self.db.executescript(schema)
+                self.db.executemany('insert into meta (key, value) values (?, ?)', settings.items())
+
+    def index_object(self, filename, engine_version):
+        """
+        Indexes a single object, if it has changed since it was last indexed.
+        Returns the number of references found, or `None` if the object was
+        unchanged.
+        """
+        path = os.path.abspath(filename)
+        object_hash = serialize_ubergraph.hash_object(filename).hexdigest()
+        row = self.db.execute('select id, hash from objects where path=?', (path,)).fetchone()
+        if row is not None and row[1] == object_hash:
+            return None
+
+        # Gather everything up before touching the database, so that an
+        # object which fails to serialize keeps its old entries.
+        refs = []
+        for export_index, export_name, serialized, _ in serialize_ubergraph.get_serializations(filename, engine_version):
+            export_name = str(export_name)
+            for data in json.loads(str(serialized)):
+                statement = bytecode_to_dot.Statement.from_data(data)
+                for kind, opcode, target, outer in find_references(statement):
+                    refs.append((export_index, export_name, statement.index,
+                        kind, opcode, target, short_name(target), outer))
+
+        with self.db:
+            if row is not None:
+                self.db.execute('delete from objects where id=?', (row[0],))
+            object_id = self.db.execute('insert into objects (path, hash) values (?, ?)',
+                    (path, object_hash)).lastrowid
+            self.db.executemany("""
+                insert into refs
+                (object_id, export_index, export, statement, kind, opcode, target, name, outer)
+                values (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, [(object_id,) + ref for ref in refs])
+        return len(refs)
+
+    def prune(self):
+        """
+        Removes any objects which no longer exist on disk.  Returns the number
+        removed.
+        """
+        missing = [(object_id,) for object_id, path
+                in self.db.execute('select id, path from objects')
+                if not os.path.exists(path)]
+        with self.db:
+            self.db.executemany('delete from objects where id=?', missing)
+        return len(missing)
+
+    def query(self, target=None, kind=None, opcode=None, path=None):
+        """
+        Yields `(path, export_index, export, statement, kind, opcode, target,
+        outer)` tuples for every reference matching the given criteria.
+        `target` matches either the full target or just its last component
+        (see `short_name()`), and along with `path` may contain glob-style
+        wildcards.
+        """
+        clauses = []
+        params = []
+        if target is not None:
+            op = 'glob' if glob_chars.search(target) else '='
+            clauses.append(f'(refs.name {op} ? or refs.target {op} ?)')
+            params.extend([target, target])
+        if kind is not None:
+            clauses.append('refs.kind=?')
+            params.append(kind)
+        if opcode is not None:
+            clauses.append('refs.opcode=?')
+            params.append(opcode)
+        if path is not None:
+            clauses.append('objects.path glob ?')
+            params.append(path)
+        sql = """
+            select objects.path, refs.export_index, refs.export, refs.statement,
+                refs.kind, refs.opcode, refs.target, refs.outer
+            from refs join objects on objects.id = refs.object_id
+            """
+        if clauses:
+            sql += ' where ' + ' and '.join(clauses)
+        sql += ' order by objects.path, refs.export_index, refs.statement'
+        yield from self.db.execute(sql, params)
+
+def do_index(args):
+    serialize_ubergraph.lazy_loading = not args.no_lazy
+    filenames = serialize_ubergraph.find_objects(args.filename)
+    if not filenames:
+        raise RuntimeError('No objects found to index')
+
+    start = time.perf_counter()
+    indexed = 0
+    unchanged = 0
+    failed = 0
+    refs = 0
+    index = Index(args.database)
+    try:
+        index.prepare(args.engine_version)
+        for filename in filenames:
+            try:
+                found = index.index_object(filename, args.engine_version)
+            except Exception as e:
+                print(f'ERROR: Could not index {filename}: {e}')
+                failed += 1
+                continue
+            if found is None:
+                unchanged += 1
+            else:
+                print(f'Indexed: {filename} ({found} reference{"s" if found != 1 else ""})')
+                indexed += 1
+                refs += found
+        pruned = index.prune()
+    finally:
+        index.close()
+
+    print('')
+    print(f'Objects: {indexed} indexed, {unchanged} unchanged, {failed} failed, {pruned} removed')
+    print(f'References found: {refs}')
+    print(f'Total time: {time.perf_counter() - start:0.2f}s')
+    if failed > 0:
+        sys.exit(1)
+
+def do_query(args):
+    if not os.path.exists(args.database):
+        raise RuntimeError(f'Index not found: {args.database}')
+    index = Index(args.database)
+    try:
+        count = 0
+        for path, export_index, export, statement, kind, opcode, target, outer in index.query(
+                target=args.target,
+                kind=args.kind,
+                opcode=args.opcode,
+                path=args.path,
+                ):
+            if args.count:
+                count += 1
+                continue
+            where = f'{path} [{export_index}] {export}'
+            if statement is not None:
+                where += f' @{statement}'
+            what = f'{kind} {opcode} {target}'
+            if outer:
+                what += f' ({outer})'
+            print(f'{where}: {what}')
+        if args.count:
+            print(count)
+    finally:
+        index.close()
+
+def main():
+
+    parser = argparse.ArgumentParser(
+            description='Index the calls, variable reads/writes, casts, and object references in Ubergraph bytecode, and query them',
+            )
+
+    parser.add_argument('-d', '--database',
+            type=str,
+            default='ubergraph-index.sqlite3',
+            help='SQLite database to store the index in (default: %(default)s)',
+            )
+
+    subparsers = parser.add_subparsers(
+            dest='command',
+            metavar='command',
+            required=True,
+            )
+
+    index_parser = subparsers.add_parser('index',
+            help='Add objects to the index, or update them if they have changed',
+            description='Add objects to the index, or update them if they have changed.  Objects which no longer exist are removed from the index.',
+            )
+
+    index_parser.add_argument('-e', '--engine-version',
+            type=str,
+            default=serialize_ubergraph.default_engine_version,
+            help=f'UAssetAPI EngineVersion to use when reading objects (defaults to {serialize_ubergraph.default_engine_version})',
+            )
+
+    index_parser.add_argument('--no-lazy',
+            action='store_true',
+            help='Parse every export in each object, rather than just the ones which can contain bytecode',
+            )
+
+    index_parser.add_argument('filename',
+            nargs='+',
+            help='Objects to index.  Directories (searched recursively) and glob patterns may also be given.',
+            )
+
+    index_parser.set_defaults(func=do_index)
+
+    query_parser = subparsers.add_parser('query',
+            help='Search the index',
+            description='Search the index.  Each match is printed as the object, export, and statement offset it was found at, followed by what was found.',
+            )
+
+    query_parser.add_argument('-k', '--kind',
+            choices=kinds,
+            help='Only show references of this kind',
+            )
+
+    query_parser.add_argument('-o', '--opcode',
+            type=str,
+            help='Only show references from this opcode (such as FinalFunction or InstanceVariable)',
+            )
+
+    query_parser.add_argument('-p', '--path',
+            type=str,
+            help='Only show references from objects whose full path matches this glob pattern',
+            )
+
+    query_parser.add_argument('-c', '--count',
+            action='store_true',
+            help='Only print the number of matches',
+            )
+
+    query_parser.add_argument('target',
+            nargs='?',
+            help='Function, variable, class, or object to look for.  Matches either the full name or just its last component, and may contain glob-style wildcards.',
+            )
+
+    query_parser.set_defaults(func=do_query)
+
+    args = parser.parse_args()
+    args.func(args)
+
+if __name__ == '__main__':
+    main()
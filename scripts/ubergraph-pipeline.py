@@ -0,0 +1,439 @@
+#!/usr/bin/env python3
+# vim: set expandtab tabstop=4 shiftwidth=4:
+
+# Copyright 2022 Christopher J Kucera
+# <cj@apocalyptech.com>
+# <https://apocalyptech.com/contact.php>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import importlib.util
+import concurrent.futures
+
+# Our sibling scripts have dashes in their names, so they need to be
+# imported by hand.
+def _load_sibling(name, filename):
+    my_dir = os.path.dirname(os.path.realpath(__file__))
+    spec = importlib.util.spec_from_file_location(name, os.path.join(my_dir, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+serialize_ubergraph = _load_sibling('serialize_ubergraph', 'serialize-ubergraph.py')
+bytecode_to_dot = _load_sibling('bytecode_to_dot', 'bytecode-to-dot.py')
+
+# Bump this whenever the manifest format changes, to start from scratch
+manifest_version = 1
+
+def context_fingerprint(ass):
+    """
+    Returns a hash of everything outside of an export's bytecode which can
+    change what its serialization looks like: the name map, and the names,
+    classes and outers of every import and export.  If none of this changes,
+    an export whose raw bytecode is unchanged will serialize identically.
+    """
+    hasher = hashlib.sha256()
+    for name in ass.GetNameMapIndexList():
+        hasher.update(f'n{name}\0'.encode('utf-8'))
+    for imp in ass.Imports:
+        hasher.update('i{}\0{}\0{}\0{}\0'.format(
+            imp.ClassPackage,
+            imp.ClassName,
+            imp.ObjectName,
+            imp.OuterIndex.Index,
+            ).encode('utf-8'))
+    for export in ass.Exports:
+        hasher.update('e{}\0{}\0{}\0{}\0'.format(
+            export.ObjectName,
+            export.ClassIndex.Index,
+            export.SuperIndex.Index,
+            export.OuterIndex.Index,
+            ).encode('utf-8'))
+    return hasher.hexdigest()
+
+class Stats:
+    """
+    Counts of what happened in each stage of the pipeline
+    """
+
+    def __init__(self):
+        self.assets_unchanged = 0
+        self.assets_processed = 0
+        self.assets_failed = 0
+        self.exports_serialized = 0
+        self.exports_skipped = 0
+        self.graphs_generated = 0
+        self.graphs_skipped = 0
+        self.renders_done = 0
+        self.renders_skipped = 0
+        self.renders_failed = 0
+
+    def report(self, elapsed):
+        print('')
+        print(f'Objects: {self.assets_processed} processed, {self.assets_unchanged} unchanged, {self.assets_failed} failed')
+        print(f'Serializations: {self.exports_serialized} written, {self.exports_skipped} unchanged')
+        print(f'Dotfiles: {self.graphs_generated} generated, {self.graphs_skipped} unchanged')
+        print(f'Renders: {self.renders_done} rendered, {self.renders_skipped} unchanged, {self.renders_failed} failed')
+        print(f'Total time: {elapsed:0.2f}s')
+
+class Pipeline:
+    """
+    Takes objects all the way from `.uasset`/`.umap` to rendered graphs,
+    remembering what it did in a manifest so that re-runs only redo the
+    work whose inputs have changed:
+
+     1. Objects whose contents haven't changed (and whose outputs all still
+        exist) are skipped without loading them at all.
+     2. Otherwise, the object is loaded and each export with bytecode is
+        keyed on a hash of its raw bytecode plus a fingerprint of the
+        object's name map and import/export tables (see
+        `context_fingerprint()`).  Only exports whose key changed get
+        re-serialized.
+     3. Dotfiles are only regenerated when the JSON they come from changed,
+        or when the graph options did.
+     4. Graphs are only re-rendered when their dotfile changed.
+    """
+
+    def __init__(self, manifest_filename, args):
+        self.manifest_filename = manifest_filename
+        self.args = args
+        self.stats = Stats()
+        self.library_hash = serialize_ubergraph.get_library_hash()
+        self.graph_settings = {
+                'render': args.render,
+                'large': args.large,
+                'split_events': args.split_events,
+                'max_label_lines': args.max_label_lines,
+                }
+        # Arguments to hand to bytecode-to-dot's `generate()`.  We do our own
+        # up-to-date checks, so it should always generate.
+        self.dot_args = argparse.Namespace(force=True, **self.graph_settings)
+        self.manifest = self.load_manifest()
+        self.dirty = False
+
+    def load_manifest(self):
+        """
+        Loads our manifest, starting fresh if it doesn't exist or was made
+        with incompatible settings.
+        """
+        fresh = {
+                'version': manifest_version,
+                'library_hash': self.library_hash,
+                'engine_version': self.args.engine_version,
+                'format': self.args.format,
+                'graph_settings': self.graph_settings,
+                'objects': {},
+                }
+        try:
+            with open(self.manifest_filename) as df:
+                manifest = json.load(df)
+        except (OSError, ValueError):
+            return fresh
+        if manifest.get('version') != manifest_version \
+                or manifest.get('library_hash') != self.library_hash \
+                or manifest.get('engine_version') != self.args.engine_version \
+                or manifest.get('format') != self.args.format:
+            print('NOTICE: UAssetAPI or settings have changed; starting with a fresh manifest')
+            return fresh
+        if manifest.get('graph_settings') != self.graph_settings:
+            # Serializations are still good, but all graphs need redoing
+            for obj in manifest['objects'].values():
+                for export in obj['exports'].values():
+                    export['json_hash'] = None
+            manifest['graph_settings'] = self.graph_settings
+        return manifest
+
+    def save_manifest(self):
+        """
+        Writes out our manifest, if anything has changed.
+        """
+        if not self.dirty:
+            return
+        tmp_filename = f'{self.manifest_filename}.tmp'
+        with open(tmp_filename, 'w') as odf:
+            json.dump(self.manifest, odf, indent=2)
+        os.replace(tmp_filename, self.manifest_filename)
+        self.dirty = False
+
+    def outputs_exist(self, entry):
+        """
+        Returns `True` if all the outputs recorded for the given manifest entry
+        (an object or a single export) still exist on disk.
+        """
+        if 'exports' in entry:
+            return all(self.outputs_exist(export) for export in entry['exports'].values())
+        filenames = [entry['json']] + entry['dots']
+        if self.args.render != 'none':
+            filenames.extend(entry['renders'])
+        return all(os.path.exists(filename) for filename in filenames)
+
+    def serialize_object(self, filename, filename_base, previous_exports):
+        """
+        Loads the given object and serializes any of its exports whose
+        bytecode (or surrounding context) has changed since the entries in
+        `previous_exports`.  Returns the new set of export entries.
+        """
+        serialize_ubergraph.load_uassetapi()
+        UAssetAPI = serialize_ubergraph.UAssetAPI
+        ass = serialize_ubergraph.load_asset(filename, self.args.engine_version)
+        serializer = UAssetAPI.Kismet.KismetSerializerContext(ass)
+        context = context_fingerprint(ass)
+        exports = {}
+        for idx, export in enumerate(ass.Exports):
+            if not hasattr(export, 'ScriptBytecode') or not export.ScriptBytecode:
+                continue
+            index = str(idx+1)
+            name = str(export.ObjectName)
+            bytecode_hash = hashlib.sha256(serialize_ubergraph.net_bytes(export.ScriptBytecodeRaw)).hexdigest()
+            json_filename = f'{filename_base}-ubergraph-{idx+1:03d}-{name}.{serialize_ubergraph.format_exts[self.args.format]}'
+            entry = previous_exports.get(index)
+            if entry is not None \
+                    and entry['name'] == name \
+                    and entry['bytecode_hash'] == bytecode_hash \
+                    and entry['context'] == context \
+                    and os.path.exists(json_filename):
+                self.stats.exports_skipped += 1
+            else:
+                if self.args.format == 'binary':
+                    serializer.SerializeScriptToBinaryFile(export.ScriptBytecode, json_filename)
+                else:
+                    serializer.SerializeScriptToFile(export.ScriptBytecode, json_filename)
+                print(f'Wrote to: {json_filename}')
+                self.stats.exports_serialized += 1
+                entry = {
+                        'name': name,
+                        'bytecode_hash': bytecode_hash,
+                        'context': context,
+                        'json': json_filename,
+                        'json_hash': None,
+                        'dots': [],
+                        'dot_hashes': [],
+                        'renders': [],
+                        }
+            exports[index] = entry
+        return exports
+
+    def process_object(self, filename):
+        """
+        Runs a single object through the pipeline.  Returns a list of
+        `(filename_dot, filename_render)` tuples which need rendering.
+        """
+        filename, filename_base = serialize_ubergraph.resolve_filename(filename)
+        key = os.path.abspath(filename)
+        object_hash = serialize_ubergraph.hash_object(filename).hexdigest()
+        previous = self.manifest['objects'].get(key)
+        if previous is not None \
+                and previous['hash'] == object_hash \
+                and self.outputs_exist(previous) \
+                and all(e['json_hash'] is not None for e in previous['exports'].values()):
+            self.stats.assets_unchanged += 1
+            self.stats.exports_skipped += len(previous['exports'])
+            self.stats.graphs_skipped += sum(len(e['dots']) for e in previous['exports'].values())
+            if self.args.render != 'none':
+                self.stats.renders_skipped += sum(len(e['renders']) for e in previous['exports'].values())
+            return []
+
+        # Stage 1: Serialization.  If the object itself hasn't changed, we
+        # don't even need to load it.
+        if previous is not None \
+                and previous['hash'] == object_hash \
+                and all(os.path.exists(e['json']) for e in previous['exports'].values()):
+            exports = previous['exports']
+            self.stats.exports_skipped += len(exports)
+        else:
+            previous_exports = previous['exports'] if previous is not None else {}
+            exports = self.serialize_object(filename, filename_base, previous_exports)
+
+        # Stage 2: Dotfiles
+        to_render = []
+        for entry in exports.values():
+            json_hash = serialize_ubergraph.hash_file(entry['json']).hexdigest()
+            if json_hash == entry['json_hash'] and all(os.path.exists(dot) for dot in entry['dots']):
+                self.stats.graphs_skipped += len(entry['dots'])
+                pairs = list(zip(entry['dots'], entry['renders']))
+                previous_dot_hashes = entry['dot_hashes']
+            else:
+                pairs, _ = bytecode_to_dot.generate(entry['json'], self.dot_args)
+                self.stats.graphs_generated += len(pairs)
+                entry['json_hash'] = json_hash
+                previous_dot_hashes = []
+                if entry['dots']:
+                    previous_dot_hashes = dict(zip(entry['dots'], entry['dot_hashes']))
+                    previous_dot_hashes = [previous_dot_hashes.get(dot) for dot, _ in pairs]
+            dot_hashes = [serialize_ubergraph.hash_file(dot).hexdigest() for dot, _ in pairs]
+
+            # Stage 3: Renders (queued up, to be done in parallel)
+            for (dot, render), dot_hash, previous_hash in zip(pairs, dot_hashes,
+                    previous_dot_hashes + [None]*(len(pairs)-len(previous_dot_hashes))):
+                if self.args.render == 'none':
+                    continue
+                if dot_hash == previous_hash and os.path.exists(render):
+                    self.stats.renders_skipped += 1
+                else:
+                    to_render.append((dot, render))
+            entry['dots'] = [dot for dot, _ in pairs]
+            entry['renders'] = [render for _, render in pairs]
+            entry['dot_hashes'] = dot_hashes
+
+        self.manifest['objects'][key] = {
+                'hash': object_hash,
+                'exports': exports,
+                }
+        self.dirty = True
+        self.stats.assets_processed += 1
+        return to_render
+
+    def forget_render(self, filename_render):
+        """
+        Clears the dot hash for a failed render, so that it's retried next
+        time.
+        """
+        for obj in self.manifest['objects'].values():
+            for entry in obj['exports'].values():
+                if filename_render in entry['renders']:
+                    entry['dot_hashes'][entry['renders'].index(filename_render)] = None
+                    self.dirty = True
+                    return
+
+    def run(self, filenames):
+        start = time.perf_counter()
+        executor = None
+        futures = {}
+        if self.args.render != 'none':
+            executor = concurrent.futures.ThreadPoolExecutor(max_workers=max(1, self.args.jobs))
+        try:
+            for filename in filenames:
+                try:
+                    to_render = self.process_object(filename)
+                except Exception as e:
+                    print(f'ERROR: Could not process {filename}: {e}')
+                    self.stats.assets_failed += 1
+                    continue
+                for filename_dot, filename_render in to_render:
+                    future = executor.submit(bytecode_to_dot.render,
+                            filename_dot,
+                            filename_render,
+                            self.args.render,
+                            self.args.timeout,
+                            )
+                    futures[future] = filename_render
+                # Save periodically, so an interrupted run doesn't lose
+                # everything
+                if self.stats.assets_processed % 25 == 0:
+                    self.save_manifest()
+            for future in concurrent.futures.as_completed(futures):
+                filename_render = futures[future]
+                status, elapsed = future.result()
+                if status == 'ok':
+                    print(f'Rendered to: {filename_render}')
+                    self.stats.renders_done += 1
+                else:
+                    print(f'WARNING: Could not render to ({status}): {filename_render}')
+                    self.stats.renders_failed += 1
+                    self.forget_render(filename_render)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+            self.save_manifest()
+        self.stats.report(time.perf_counter() - start)
+
+def main():
+
+    parser = argparse.ArgumentParser(
+            description='Incrementally serialize and graph Ubergraph bytecode, from objects to rendered graphs',
+            )
+
+    parser.add_argument('-M', '--manifest',
+            type=str,
+            default='ubergraph-manifest.json',
+            help='Manifest file used to keep track of what has already been done (default: %(default)s)',
+            )
+
+    parser.add_argument('-e', '--engine-version',
+            type=str,
+            default=serialize_ubergraph.default_engine_version,
+            help=f'UAssetAPI EngineVersion to use when reading objects (defaults to {serialize_ubergraph.default_engine_version})',
+            )
+
+    parser.add_argument('-f', '--format',
+            choices=['json', 'binary'],
+            default='json',
+            help='Format to write serializations in (see serialize-ubergraph.py)',
+            )
+
+    parser.add_argument('--no-lazy',
+            action='store_true',
+            help='Parse every export in each object, rather than just the ones which can contain bytecode',
+            )
+
+    parser.add_argument('-r', '--render',
+            choices=['png', 'svg', 'none'],
+            default='svg',
+            help='Render type',
+            )
+
+    parser.add_argument('-l', '--large',
+            action='store_true',
+            help='Large-graph mode: group statements into clustered basic blocks',
+            )
+
+    parser.add_argument('-m', '--max-label-lines',
+            type=int,
+            help='Truncate statement labels to this many lines',
+            )
+
+    parser.add_argument('-s', '--split-events',
+            action='store_true',
+            help='Write out a separate graph for each entry point (event) in each script',
+            )
+
+    parser.add_argument('-j', '--jobs',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Number of renders to run at once (defaults to the number of CPUs)',
+            )
+
+    parser.add_argument('-t', '--timeout',
+            type=float,
+            help='Give up on any individual render which takes longer than this many seconds',
+            )
+
+    parser.add_argument('filename',
+            nargs='+',
+            help='Objects to process.  Directories (searched recursively) and glob patterns may also be given.',
+            )
+
+    args = parser.parse_args()
+    serialize_ubergraph.lazy_loading = not args.no_lazy
+
+    filenames = serialize_ubergraph.find_objects(args.filename)
+    if not filenames:
+        raise RuntimeError('No objects found to process')
+    pipeline = Pipeline(args.manifest, args)
+    pipeline.run(filenames)
+    if pipeline.stats.assets_failed > 0 or pipeline.stats.renders_failed > 0:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()